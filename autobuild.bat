@@ -16,6 +16,12 @@ if exist dist (
     echo dist folder not found, skipping delete.
 )
 
+echo === Compiling data file ===
+python "src\cli.py" compile-data
+if errorlevel 1 (
+    echo [WARNING] Data file could not be compiled, the build will parse res\data.json at startup.
+)
+
 pyinstaller --noconfirm --onefile --windowed ^
 --icon "res\icons\app_icons\matchlock.ico" ^
 --name "Hunting Calculator" ^
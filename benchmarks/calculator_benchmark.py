@@ -0,0 +1,294 @@
+"""
+Calculator benchmark of the Hunting Calculator.
+
+Measures the calculations run on every keystroke of a session, offline and without Qt, on synthetic sessions:
+    - CalculateResultsSession.calculate_results_session, in manual and auto mode.
+    - CalculateMaxProfit.calculate_max_profit, calculate_stones_best_profit and calculate_heads_best_profit.
+    - exchange_results.
+
+The sessions are generated for every spot of the data file with seeded random prices, and amounts of several profiles:
+    - realistic: amounts of a few hours of hunting.
+    - extreme: empty items mixed with huge amounts (up to 10^12).
+
+For every calculation it reports the calls per second, the latency of a call (median and 99th percentile) and the memory
+allocated by a call (peak traced by tracemalloc, measured in a separate pass so it does not slow down the timings).
+
+Run it from the project folder:
+    python ./benchmarks/calculator_benchmark.py --cases 20 --rounds 5
+"""
+import argparse, json, os, random, statistics, sys, time, tracemalloc
+from typing import Any, Callable
+
+root_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+src_folder = os.path.join(root_folder, "src")
+sys.path.insert(0, src_folder)
+os.chdir(root_folder) # Resources are resolved from the project folder
+
+from logic.startup import setup_all
+from logic.exchange_calculator import exchange_results
+from logic.manage_resources.access_resources import get_spot_names, get_spot_loot, get_no_market_items, get_data_value
+from logic.headless_calculator import build_session_results
+from logic.session_results.calculate_results_session import CalculateResultsSession
+from logic.session_results.calculate_max_profit import CalculateMaxProfit
+from logic.data_classes.session_input import SessionInput, category_hours, category_stone, category_head, category_head_product
+from logic.data_classes.session_request import SessionRequest
+from logic.data_classes.session_results import SessionResultsData
+from logic.data_classes.price_context import PriceContext
+from config.config import market_tax, reduced_item_names, value_pack_multiplier, extra_profit_multiplier, FlatDict
+
+profiles = ("realistic", "extreme")
+Call = Callable[[], Any]
+
+def get_random_prices(data_items: dict[str, str], rng: random.Random, low: int, high: int) -> FlatDict:
+    """
+    Get random prices for some items.
+        :param data_items: Dictionary of item IDs and their names.
+        :param rng: The random generator.
+        :param low: The lowest price.
+        :param high: The highest price.
+        :return: A dictionary of item IDs and their names and prices.
+    """
+    return {item_id: (name, rng.randint(low, high)) for item_id, name in data_items.items()}
+
+def build_price_context(rng: random.Random) -> PriceContext:
+    """
+    Build a price context with random prices for every spot, so the benchmark does not need the price cache.
+        :param rng: The random generator.
+        :return: The price context.
+    """
+    context = PriceContext(
+        "eu",
+        f"{rng.randint(0, 2_000_000):,}",
+        get_random_prices(dict(get_data_value("lighstone_items")), rng, 1_000_000, 30_000_000),
+        get_random_prices(dict(get_data_value("imperfect_lighstone_items")), rng, 50_000, 500_000),
+        get_random_prices(dict(get_data_value("black_stone_cost")), rng, 100_000, 300_000)
+    )
+    for spot in get_spot_names():
+        loot_prices = get_random_prices(get_spot_loot(spot), rng, 1_000, 50_000_000)
+        context.spots[spot] = ({item_id: (reduced_item_names.get(name, name), price) for item_id, (name, price) in loot_prices.items()}, get_no_market_items(spot))
+    return context
+
+def get_random_amount(profile: str, rng: random.Random) -> int:
+    """
+    Get a random amount of an item.
+        :param profile: The amounts profile ('realistic' or 'extreme').
+        :param rng: The random generator.
+        :return: The amount.
+    """
+    if profile == "realistic":
+        return 0 if rng.random() < 0.3 else rng.randint(1, 1_500)
+    return rng.choice((0, 0, 1, 10 ** 6, 10 ** 9, rng.randint(0, 10 ** 12)))
+
+def generate_sessions(context: PriceContext, profile: str, n_cases: int, auto_calculate_best_profit: bool, rng: random.Random) -> list[SessionResultsData]:
+    """
+    Generate synthetic sessions for every spot.
+        :param context: The price context of the sessions.
+        :param profile: The amounts profile ('realistic' or 'extreme').
+        :param n_cases: The number of sessions of every spot.
+        :param auto_calculate_best_profit: Whether the sessions calculate the best exchanges.
+        :param rng: The random generator.
+        :return: The sessions that can be calculated (the sessions of spots missing items of the calculations are skipped).
+    """
+    sessions: list[SessionResultsData] = []
+    for spot, (loot_prices, no_market_items) in context.spots.items():
+        names = [name for name, _ in loot_prices.values()] + no_market_items
+        for _ in range(n_cases):
+            hours = rng.randint(1, 4) if profile == "realistic" else rng.choice((0, 1, 10 ** 4))
+            request = SessionRequest(
+                spot,
+                str(hours),
+                {name: str(get_random_amount(profile, rng)) for name in names},
+                value_pack=rng.random() < 0.5,
+                extra_profit=rng.random() < 0.5,
+                auto_calculate_best_profit=auto_calculate_best_profit
+            )
+            session, _ = build_session_results(request, context)
+            if session is None:
+                continue
+            try:
+                CalculateResultsSession(copy_session(session)).calculate_results_session()
+            except Exception: # Spots whose loot does not have every item of the calculations (e.g. no green head)
+                continue
+            sessions.append(session)
+    return sessions
+
+def copy_session(session: SessionResultsData) -> SessionResultsData:
+    """
+    Copy a session so the amounts updated by a calculation do not change the next calls.
+        :param session: The session to copy.
+        :return: A copy of the session with its own input data.
+    """
+    return SessionResultsData(**{**session.__dict__, 'data_input': dict(session.data_input)})
+
+def build_max_profit(session: SessionResultsData) -> CalculateMaxProfit:
+    """
+    Build the profit optimizer of a session, as CalculateResultsSession does in auto mode.
+        :param session: The session.
+        :return: The profit optimizer, with an empty group cache so every call calculates everything.
+    """
+    session_input = SessionInput.from_data_input(session.data_input)
+    hours = int(session.data_input["Hours"][1])
+    elixirs_cost_h = int(session.elixirs_cost.replace(',', '')) if hours > 0 else 0
+    black_stone_price = [price for name, price in session.black_stone_cost.values() if name == 'Black Stone'][0]
+    return CalculateMaxProfit(
+        session_input,
+        session.lightstone_costs,
+        session.imperfect_lightstone_costs,
+        black_stone_price,
+        hours,
+        (value_pack_multiplier if session.value_pack else 0) + (extra_profit_multiplier if session.extra_profit else 0),
+        market_tax,
+        elixirs_cost_h * hours,
+        elixirs_cost_h,
+        order_books=session.order_books
+    )
+
+def get_groups(session: SessionResultsData) -> tuple[dict[str, tuple[int, int]], dict[str, tuple[int, int]]]:
+    """
+    Get the stones and heads of a session, as CalculateMaxProfit.calculate_max_profit splits them.
+        :param session: The session.
+        :return: A tuple containing the stones and the heads (name: (price, amount)).
+    """
+    session_input = SessionInput.from_data_input(session.data_input)
+    gems: dict[str, tuple[int, int]] = {}
+    heads: dict[str, tuple[int, int]] = {}
+    for name, price, amount, category in zip(session_input.names, session_input.prices, session_input.amounts, session_input.categories):
+        if category & category_hours:
+            continue
+        if category & category_stone:
+            gems[name] = (price, amount)
+        elif category & category_head:
+            heads[name] = (price, amount)
+        elif category & category_head_product:
+            heads[name] = (price, 0)
+    return gems, heads
+
+def build_calls(sessions_manual: list[SessionResultsData], sessions_auto: list[SessionResultsData], rng: random.Random, profile: str) -> dict[str, list[Call]]:
+    """
+    Build the calls of every benchmarked calculation, the inputs are copied before the timings so only the calculation is measured.
+        :param sessions_manual: The sessions in manual mode.
+        :param sessions_auto: The sessions in auto mode.
+        :param rng: The random generator.
+        :param profile: The amounts profile ('realistic' or 'extreme').
+        :return: A dictionary of the calculation names and their calls.
+    """
+    calls: dict[str, list[Call]] = {
+        "calculate_results_session (manual)": [CalculateResultsSession(copy_session(session)).calculate_results_session for session in sessions_manual],
+        "calculate_results_session (auto)": [CalculateResultsSession(copy_session(session)).calculate_results_session for session in sessions_auto],
+        "calculate_max_profit": [],
+        "calculate_stones_best_profit": [],
+        "calculate_heads_best_profit": [],
+        "exchange_results": []
+    }
+    for session in sessions_auto:
+        gems, heads = get_groups(session)
+        max_profit = build_max_profit(session)
+        calls["calculate_max_profit"].append(lambda max_profit=build_max_profit(session): (max_profit.group_cache.clear(), max_profit.calculate_max_profit())) # Nothing reused from the previous round
+        calls["calculate_stones_best_profit"].append(lambda max_profit=max_profit, gems=gems: max_profit.calculate_stones_best_profit(dict(gems), {}))
+        calls["calculate_heads_best_profit"].append(lambda max_profit=max_profit, heads=heads: max_profit.calculate_heads_best_profit(dict(heads), {}))
+
+    high = 5_000 if profile == "realistic" else 10 ** 12
+    for _ in range(max(len(sessions_auto), 1) * 10):
+        green, blue = rng.randint(0, high), rng.randint(0, high)
+        calls["exchange_results"].append(lambda green=green, blue=blue: exchange_results(green, blue))
+    return calls
+
+def time_calls(calls: list[Call], rounds: int) -> dict[str, float]:
+    """
+    Time every call, calling each one once per round.
+    The calls update their inputs in place in some cases (e.g. exchanged amounts), so every call must return the same work when repeated.
+        :param calls: The calls to time.
+        :param rounds: The number of rounds.
+        :return: A dictionary with the calls per second and the median and 99th percentile latency (µs).
+    """
+    latencies: list[float] = []
+    for _ in range(rounds):
+        for call in calls:
+            start = time.perf_counter_ns()
+            call()
+            latencies.append((time.perf_counter_ns() - start) / 1000)
+    latencies.sort()
+    return {
+        "ops_per_sec": len(latencies) / (sum(latencies) / 1_000_000),
+        "p50_us": statistics.median(latencies),
+        "p99_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    }
+
+def measure_allocations(calls: list[Call]) -> dict[str, float]:
+    """
+    Measure the memory allocated by every call with tracemalloc.
+        :param calls: The calls to measure.
+        :return: A dictionary with the mean peak memory traced during a call (KiB) and the mean memory kept after it (bytes).
+    """
+    peaks: list[int] = []
+    kept: list[int] = []
+    tracemalloc.start()
+    for call in calls:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = call()
+        after, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+        kept.append(after - before)
+        del result
+    tracemalloc.stop()
+    return {"alloc_kib_per_call": statistics.mean(peaks) / 1024, "kept_bytes_per_call": statistics.mean(kept)}
+
+def run_benchmark(n_cases: int, rounds: int, seed: int, only: str) -> list[dict[str, Any]]:
+    """
+    Run the benchmark of every calculation and profile.
+        :param n_cases: The number of sessions of every spot and profile.
+        :param rounds: The number of timing rounds.
+        :param seed: The seed of the random generator.
+        :param only: Only the calculations whose name contains this text are measured (empty for all).
+        :return: A list with the results of every calculation and profile.
+    """
+    rng = random.Random(seed)
+    context = build_price_context(rng)
+    all_results: list[dict[str, Any]] = []
+    for profile in profiles:
+        sessions_manual = generate_sessions(context, profile, n_cases, False, rng)
+        sessions_auto = generate_sessions(context, profile, n_cases, True, rng)
+        for name, calls in build_calls(sessions_manual, sessions_auto, rng, profile).items():
+            if only not in name or not calls:
+                continue
+            calls[0]() # Warm up (lazy imports and caches of the first call)
+            all_results.append({"calculation": name, "profile": profile, "calls": len(calls), **time_calls(calls, rounds), **measure_allocations(calls)})
+    return all_results
+
+def print_summary(all_results: list[dict[str, Any]]):
+    """
+    Print the results of every calculation and profile.
+        :param all_results: The results of the benchmark.
+    """
+    print(f"{'calculation':<38}{'profile':<11}{'calls':>7}{'ops/s':>11}{'p50 µs':>10}{'p99 µs':>10}{'KiB/call':>10}")
+    for result in all_results:
+        print(
+            f"{result['calculation']:<38}{result['profile']:<11}{result['calls']:>7}{result['ops_per_sec']:>11,.0f}"
+            f"{result['p50_us']:>10.1f}{result['p99_us']:>10.1f}{result['alloc_kib_per_call']:>10.1f}"
+        )
+    qt_loaded = [module for module in sys.modules if module.startswith("PySide6")]
+    print(f"Qt modules loaded: {qt_loaded or 'none'}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the calculations of the Hunting Calculator on synthetic sessions.")
+    parser.add_argument("--cases", type=int, default=10, help="Number of sessions of every spot and profile.")
+    parser.add_argument("--rounds", type=int, default=3, help="Number of timing rounds of every call.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random prices and amounts.")
+    parser.add_argument("--only", default="", help="Only measure the calculations whose name contains this text.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    if not setup_all():
+        print("Application setup failed.", file=sys.stderr)
+        return 1
+
+    all_results = run_benchmark(args.cases, args.rounds, args.seed, args.only)
+    if args.json:
+        print(json.dumps(all_results))
+    else:
+        print_summary(all_results)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Startup benchmark of the Hunting Calculator.
+
+Every run starts a fresh Python process (so nothing is cached in sys.modules) that measures:
+    - The import time of the application modules needed to show the main window.
+    - The time until the main window is painted for the first time.
+    - The heavy modules (lazy_modules in the config) already imported at that moment.
+
+Run it from the project folder:
+    python ./benchmarks/startup_benchmark.py --runs 10
+"""
+import argparse, json, os, statistics, subprocess, sys, time
+
+root_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+src_folder = os.path.join(root_folder, "src")
+
+def probe() -> dict[str, object]:
+    """
+    Start the application in this process and measure its startup until the first paint of the main window.
+        :return: A dictionary with the measured times (ms) and the heavy modules imported before the first paint.
+    """
+    start = time.perf_counter()
+    sys.path.insert(0, src_folder)
+
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QObject, QEvent, QTimer
+    from gui.gui_entry_point import GuiEntryPoint
+    from logic.startup import setup_all
+    from config.config import lazy_modules
+    imports_done = time.perf_counter()
+
+    if not setup_all():
+        raise RuntimeError("Application setup failed")
+    setup_done = time.perf_counter()
+
+    app = QApplication(sys.argv)
+    window = GuiEntryPoint()
+    results: dict[str, object] = {}
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+            if event.type() == QEvent.Type.Paint and 'first_paint_ms' not in results:
+                results['first_paint_ms'] = (time.perf_counter() - start) * 1000
+                results['lazy_modules_loaded'] = [module for module in lazy_modules if module in sys.modules]
+                QTimer.singleShot(0, app.quit)
+            return False
+
+    paint_filter = FirstPaintFilter()
+    window.installEventFilter(paint_filter)
+    window.show()
+    QTimer.singleShot(5000, app.quit) # Platforms that never paint (e.g. minimal) must not block the benchmark
+    app.exec()
+
+    results['import_ms'] = (imports_done - start) * 1000
+    results['setup_ms'] = (setup_done - imports_done) * 1000
+    results.setdefault('first_paint_ms', None)
+    results.setdefault('lazy_modules_loaded', [module for module in lazy_modules if module in sys.modules])
+    return results
+
+def run_benchmark(runs: int) -> list[dict[str, object]]:
+    """
+    Run the startup probe in fresh processes.
+        :param runs: The number of processes to start.
+        :return: A list with the results of every run.
+    """
+    all_results: list[dict[str, object]] = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--probe"],
+            cwd=root_folder, # Resources are resolved from the project folder
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        all_results.append(json.loads(output.strip().splitlines()[-1]))
+    return all_results
+
+def print_summary(all_results: list[dict[str, object]]):
+    """
+    Print the median, minimum and maximum of every measure.
+        :param all_results: The results of every run.
+    """
+    print(f"{'measure':<18}{'median':>10}{'min':>10}{'max':>10}")
+    for measure in ('import_ms', 'setup_ms', 'first_paint_ms'):
+        values = [float(result[measure]) for result in all_results if result[measure] is not None] # type: ignore
+        if not values:
+            print(f"{measure:<18}{'n/a':>10}")
+            continue
+        print(f"{measure:<18}{statistics.median(values):>10.1f}{min(values):>10.1f}{max(values):>10.1f}")
+    print(f"Lazy modules loaded before the first paint: {all_results[-1]['lazy_modules_loaded'] or 'none'}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the startup time of the Hunting Calculator.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh processes to measure.")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(probe()))
+        return 0
+
+    print_summary(run_benchmark(args.runs))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+import argparse, sys, csv, json, os
+
+from logic.startup import setup_all
+from logic.sql_items_data.sql_db_connection import export_cached_snapshot, import_cached_snapshot
+from logic.manage_resources.compiled_data import compile_data
+from logic.manage_resources.access_resources import get_app_resource
+from config.config import res_list, compiled_data_file, available_regions
+
+def export_cache_command(args: argparse.Namespace) -> int:
+    """
+    Export the cached prices database to a compressed snapshot file.
+        :param args: The parsed command line arguments.
+        :return: The exit code of the command.
+    """
+    n_rows = export_cached_snapshot(args.snapshot)
+    if n_rows < 0:
+        print(f"Error exporting cached data to '{args.snapshot}', check the logs.", file=sys.stderr)
+        return 1
+    print(f"Exported {n_rows} rows to '{args.snapshot}'.")
+    return 0
+
+def import_cache_command(args: argparse.Namespace) -> int:
+    """
+    Import a compressed snapshot file into the cached prices database.
+        :param args: The parsed command line arguments.
+        :return: The exit code of the command.
+    """
+    n_rows = import_cached_snapshot(args.snapshot)
+    if n_rows < 0:
+        print(f"Error importing cached data from '{args.snapshot}', check the logs.", file=sys.stderr)
+        return 1
+    print(f"Imported {n_rows} rows from '{args.snapshot}'.")
+    return 0
+
+def compile_data_command(args: argparse.Namespace) -> int:
+    """
+    Compile the JSON data file into its binary form, loaded at startup while it matches the JSON content.
+        :param args: The parsed command line arguments.
+        :return: The exit code of the command.
+    """
+    json_path = get_app_resource(res_list['data'])
+    compiled_path = args.output or get_app_resource(compiled_data_file)
+    if not compile_data(json_path, compiled_path):
+        print(f"Error compiling '{json_path}', check the logs.", file=sys.stderr)
+        return 1
+    print(f"Compiled '{json_path}' into '{compiled_path}'.")
+    return 0
+
+def batch_command(args: argparse.Namespace) -> int:
+    """
+    Calculate the results of the sessions of a batch file with the cached prices, writing every result as soon as it is calculated.
+        :param args: The parsed command line arguments.
+        :return: The exit code of the command.
+    """
+    from logic.headless_calculator import load_price_context, read_session_records, result_fields
+    from logic.parallel_batch import calculate_session_records
+
+    context = load_price_context(args.region, args.fetch)
+    if context is None:
+        print("Error loading the cached prices, check the logs.", file=sys.stderr)
+        return 1
+
+    output_format = args.format or ("csv" if args.output and args.output.lower().endswith(".csv") else "jsonl")
+    output = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    writer = csv.DictWriter(output, fieldnames=result_fields, extrasaction="ignore") if output_format == "csv" else None
+    if writer:
+        writer.writeheader()
+
+    workers = args.workers or os.cpu_count() or 1
+    n_sessions = n_errors = 0
+    try:
+        for result in calculate_session_records(read_session_records(args.input), context, workers):
+            if writer:
+                writer.writerow(result)
+            else:
+                output.write(json.dumps(result) + "\n")
+            n_sessions += 1
+            n_errors += bool(result.get("error"))
+    except (OSError, ValueError, csv.Error) as e: # json.JSONDecodeError is a ValueError
+        print(f"Error reading '{args.input}': {e}", file=sys.stderr)
+        return 1
+    except RuntimeError as e: # A worker process could not start or stopped (BrokenProcessPool)
+        print(f"Error in the batch worker processes: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"Calculated {n_sessions} sessions ({n_errors} with errors).", file=sys.stderr)
+    return 0
+
+def compare_regions_command(args: argparse.Namespace) -> int:
+    """
+    Print the prices of the loot of a hunting spot in several regions, a JSON object per item with the region that pays the most.
+    The cached prices are used when they are up to date, the outdated ones of every region are fetched in one batch.
+        :param args: The parsed command line arguments.
+        :return: The exit code of the command.
+    """
+    from logic.region_prices import get_regions_price_matrix
+
+    all_fetched, matrix = get_regions_price_matrix(args.spot, args.regions or available_regions)
+    if not matrix.prices:
+        print(f"Error getting the prices of spot '{args.spot}', check the spot name and the logs.", file=sys.stderr)
+        return 1
+
+    for item_id, name in matrix.item_names.items():
+        print(json.dumps({"id": item_id, "name": name, **{region: matrix.get_price(item_id, region) for region in matrix.regions}, "best_region": matrix.get_best_region(item_id)}))
+    if not all_fetched:
+        print("Some prices could not be fetched, they are missing or the last cached ones.", file=sys.stderr)
+        return 1
+    return 0
+
+def sessions_command(args: argparse.Namespace) -> int:
+    """
+    Print the saved sessions stored in the sessions database, a JSON object per line, or the totals of every spot.
+        :param args: The parsed command line arguments.
+        :return: The exit code of the command.
+    """
+    from dataclasses import asdict
+    from logic.sql_items_data.sql_sessions_db import SessionsDatabase
+    from logic.manage_excels import import_excel_sessions
+
+    if import_excel_sessions() < 0: # Only the first time, the sessions saved before the sessions database
+        print("Error importing the sessions of the Excel files, check the logs.", file=sys.stderr)
+    sessions_db = SessionsDatabase.get_instance()
+    if args.totals:
+        for spot, (n_sessions, hours, money) in sorted(sessions_db.get_spot_totals().items()):
+            print(json.dumps({"spot": spot, "sessions": n_sessions, "hours": hours, "taxed": money, "taxed_h": money // hours if hours else 0}))
+        return 0
+
+    for session in sessions_db.get_sessions(args.spot, with_items=args.items):
+        session_fields = asdict(session)
+        if not args.items:
+            del session_fields["items"]
+        print(json.dumps(session_fields))
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the parser of the command line interface.
+        :return: The argument parser with all the available commands.
+    """
+    parser = argparse.ArgumentParser(prog="hunting-calculator", description="Hunting Calculator command line tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_cache = commands.add_parser("export-cache", help="Export the cached prices (and history when present) to a compressed snapshot file.")
+    export_cache.add_argument("snapshot", help="Path of the snapshot file to create (e.g. prices.json.gz).")
+    export_cache.set_defaults(func=export_cache_command)
+
+    import_cache = commands.add_parser("import-cache", help="Import a compressed snapshot file into the cached prices.")
+    import_cache.add_argument("snapshot", help="Path of the snapshot file to import.")
+    import_cache.set_defaults(func=import_cache_command)
+
+    compile_data_parser = commands.add_parser("compile-data", help="Compile the data file into a binary file that loads faster at startup.")
+    compile_data_parser.add_argument("-o", "--output", default=None, help=f"Path of the compiled file (default: {compiled_data_file}).")
+    compile_data_parser.set_defaults(func=compile_data_command)
+
+    batch = commands.add_parser("batch", help="Calculate the results of the sessions of a CSV, JSON or JSONL file with the cached prices.")
+    batch.add_argument("input", help="Path of the sessions file (spot, hours, item amounts and optional settings of every session).")
+    batch.add_argument("-o", "--output", default=None, help="Path of the results file (default: standard output).")
+    batch.add_argument("-f", "--format", choices=["jsonl", "csv"], default=None, help="Format of the results (default: from the output extension, jsonl otherwise).")
+    batch.add_argument("-r", "--region", choices=available_regions, default=None, help="Region of the prices (default: region of the settings).")
+    batch.add_argument("--fetch", action="store_true", help="Fetch the outdated prices from the API instead of using the last cached ones.")
+    batch.add_argument("-w", "--workers", type=int, default=1, help="Number of processes calculating the sessions, 0 for one per CPU core (default: 1).")
+    batch.set_defaults(func=batch_command)
+
+    compare_regions = commands.add_parser("compare-regions", help="Compare the loot prices of a hunting spot between regions, fetching the outdated ones of every region in one batch.")
+    compare_regions.add_argument("spot", help="Name of the hunting spot.")
+    compare_regions.add_argument("-r", "--regions", nargs="+", choices=available_regions, default=None, help="Regions to compare (default: all the available regions).")
+    compare_regions.set_defaults(func=compare_regions_command)
+
+    sessions = commands.add_parser("sessions", help="List the saved sessions, the newest first, from the sessions database.")
+    sessions.add_argument("-s", "--spot", default=None, help="Only list the sessions of a hunting spot.")
+    sessions.add_argument("--items", action="store_true", help="Include the item amounts of every session.")
+    sessions.add_argument("--totals", action="store_true", help="Print the number of sessions, hours and taxed money of every spot instead.")
+    sessions.set_defaults(func=sessions_command)
+
+    return parser
+
+def main() -> int:
+    """
+    Main function of the command line interface.
+        :return: The exit code of the executed command.
+    """
+    args = build_parser().parse_args()
+    if not setup_all():
+        return 1
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
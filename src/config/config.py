@@ -10,6 +10,13 @@ user_settings_folder = 'settings' # Folder where user settings are stored
 sql_db_folder = 'db' # Folder where the SQLite database files are stored
 saved_sessions_folder = "Hunting Sessions"  # Folder where hunting sessions are saved
 sql_file = f'{sql_db_folder}/cached_data.db' # Path to the SQLite database file for cached data
+sessions_sql_file = f'{sql_db_folder}/sessions.db' # Path to the SQLite database file of the saved sessions
+sessions_excel_import_version = 1 # Stored in the user_version of the sessions database once the sessions of the Excel files saved before it existed are imported
+available_regions = ['eu', 'na'] # Regions supported by the Black Desert Market API
+startup_profile_env = 'HUNTING_CALCULATOR_PROFILE_STARTUP' # Environment variable to profile the startup (1, or cprofile to also dump cProfile statistics)
+startup_profile_report = 'logs/startup_profile.txt' # Report of the startup phases when the startup is profiled
+startup_profile_dump = 'logs/startup_profile.prof' # cProfile statistics of the startup when profiled with cprofile
+lazy_modules = ['pycurl', 'openpyxl', 'pandas', 'numpy'] # Heavy modules imported on first use or in background after the main window is shown
 
 res_list = {
     'data': 'res/data.json',
@@ -82,7 +89,10 @@ res_list = {
 }
 
 res_abs_paths: dict[str, str] = {}
+required_resources = ['data'] # Resources checked before starting, the rest (icons) are checked in background and replaced by 'not_found_ico' if missing
 settings_json = 'settings/settings.json'  # Path to the settings JSON file
+settings_check_interval = 2.0 # Seconds between checks of the modification time of the settings file, reads in between are only dict lookups
+data_check_interval = 2.0 # Seconds between checks of the modification time of the data file, reads in between only use the loaded catalog
 default_settings: dict[str, Any] = {
     "region": "eu",
     "show_confirm_clean_message": True,
@@ -100,6 +110,12 @@ timeout_connection = 1 # Timeout in seconds to establish a connection to the API
 timeout_fetch = 5 # Timeout in seconds to fetch data from the API
 backoff_time = 0.5 # Time in seconds to wait before retrying a request
 time_cached = 60 * 10  # Time in seconds for cache data (10 minutes)
+snapshot_version = 1 # Version of the format of the cached data snapshot files
+compiled_data_file = 'res/data.bin' # Compiled form of 'res/data.json' (optional, created with "python ./src/cli.py compile-data")
+compiled_data_version = 2 # Version of the format of the compiled data file
+elixir_search_min_similarity = 0.6 # Minimum similarity (0 to 1) of the names to show them as fuzzy matches in the elixirs search
+search_debounce_ms = 200 # Time in milliseconds to wait after the last keystroke before searching
+recalculation_debounce_ms = 150 # Time in milliseconds to wait after the last keystroke before recalculating the results of a session
 user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
 
 scroll_bar_style = f"""
@@ -151,14 +167,64 @@ n_magical_lightstone_exchange = 6 # Number of Magical Lightstones obtained via e
 n_magical_lightstones_scroll = 35 # Number of Magical Lightstones needed to craft one scroll
 n_remnants_of_mystic_beasts_exchange = 70 # Remnants of Mystic Beasts obtained via exchange with "Breath of Narcion/Omua"
 n_supreme_hide_scroll = 10 # Number of Supreme Hides needed to craft one scroll
+n_wildspark_exchange = 10 # Wildsparks needed for one exchange to Black Gem Fragments
+n_fragment_wildspark_exchange = 5 # Black Gem Fragments obtained via exchange of Wildsparks
+n_usable_hide_damaged_exchange = 30 # Usable Hides needed for one exchange to Damaged Hides
+n_damaged_hide_usable_exchange = 60 # Damaged Hides obtained via exchange of Usable Hides
 value_pack_multiplier = 0.315 # Value pack multiplier for the results calculation
 extra_profit_multiplier = 0.05 # Extra profit multiplier for the results calculation
 market_tax = 0.35 # Market tax percentage for the results calculation
 
+# Exchanges between items, used by the exchange optimizer (adding a new exchange only needs a new entry here)
+# Inputs and outputs are item name: amount, '{green_head}', '{yellow_head}' and '{special_yellow_head}' are replaced by the heads of the spot
+# Items that can be bought ('Black Stone', 'Imperfect Lightstone' and the lightstones) are bought at their cost when needed
+scroll_lightstone_ids = { # Scroll: ID of the lightstone needed to craft it
+    'BMB: All AP': '758001',
+    'BMB: Accuracy': '758002',
+    'BMB: Evasion': '760002',
+    'BMB: Damage Reduction': '760001',
+    'BMB: Max HP': '762001'
+}
+scroll_lightstones = {
+    'BMB: All AP': 'Lightstone of Fire: Rage',
+    'BMB: Accuracy': 'Lightstone of Fire: Marked',
+    'BMB: Evasion': 'Lightstone of Earth: Waves',
+    'BMB: Damage Reduction': 'Lightstone of Earth: Iron Wall',
+    'BMB: Max HP': 'Lightstone of Wind: Heart'
+}
+recipes: list[dict[str, Any]] = [
+    {'name': 'Wildspark exchange', 'inputs': {'Wildspark': n_wildspark_exchange}, 'outputs': {'Black Gem Frag.': n_fragment_wildspark_exchange}},
+    {'name': 'Black Gem', 'inputs': {'Black Gem Frag.': n_fragment_exchange, 'Black Stone': n_black_stone_exchange}, 'outputs': {'Black Gem': 1}},
+    {'name': 'Conc. Mag. Black Gem', 'inputs': {'Black Gem': n_black_gem_concentrate_gem_exchange, 'S. Black Crystal Shard': n_sharp_exchange_concentrate_gem}, 'outputs': {'Conc. Mag. Black Gem': 1}},
+    {'name': 'Conc. Mag. Black Stone', 'inputs': {'S. Black Crystal Shard': n_sharp_exchange_concentrate, 'Black Stone': n_black_stone_exchange}, 'outputs': {'Conc. Mag. Black Stone': 1}},
+    {'name': 'Supreme Hide exchange', 'inputs': {'Supreme Hide': 1}, 'outputs': {'Usable Hide': n_supreme_exchange}},
+    {'name': 'Usable Hide exchange', 'inputs': {'Usable Hide': n_usable_hide_damaged_exchange}, 'outputs': {'Damaged Hide': n_damaged_hide_usable_exchange}},
+    {'name': 'Master head', 'inputs': {'Damaged Hide': n_damaged_hide_exchange, 'Usable Hide': n_usable_hide_exchange, '{green_head}': 1}, 'outputs': {'{yellow_head}': 1}},
+    {'name': 'Master special head', 'inputs': {'{yellow_head}': 1, 'Breath of Narcion': n_breath_of_narcion_exchange}, 'outputs': {'{special_yellow_head}': 1}},
+    {'name': 'Remnants of Mystic Beasts', 'inputs': {'Breath of Narcion': 1}, 'outputs': {'Remnants of Mystic Beasts': n_remnants_of_mystic_beasts_exchange}},
+    {'name': 'Magical Lightstone', 'inputs': {'Imperfect Lightstone': 1}, 'outputs': {'Magical Lightstone': n_magical_lightstone_exchange}},
+    *({
+        'name': scroll,
+        'inputs': {'Supreme Hide': n_supreme_hide_scroll, 'Remnants of Mystic Beasts': 1, 'Magical Lightstone': n_magical_lightstones_scroll, lightstone: 1 / n_scrolls_lighstone},
+        'outputs': {scroll: 1}
+    } for scroll, lightstone in scroll_lightstones.items())
+]
+recipe_solver_max_nodes = 200 # Maximum branches explored by the exchange optimizer, the best plan found so far is used when reached
+session_results_cache_size = 256 # Results of session calculations kept in memory, identical inputs return the stored results
+monte_carlo_samples = 20000 # Price samples of the price uncertainty analysis of a session
+monte_carlo_default_volatility = 0.1 # Volatility (standard deviation of the log price) of the items without enough price history
+monte_carlo_percentiles = (5, 25, 50, 75, 95) # Percentiles of the profit reported by the price uncertainty analysis
+price_history_window = 60 * 60 * 24 * 14 # Time in seconds of the price history used to estimate the volatility of the items (14 days)
+price_history_min_points = 5 # Minimum prices in the history window to estimate the volatility of an item
+batch_chunk_size = 32 # Sessions sent at once to a worker process by the parallel batch, in file order
+batch_max_pending_chunks = 4 # Chunks per worker process waiting for their results, bounds the memory used by large batches
+
 NestedDict: TypeAlias = dict[str, dict[str, tuple[str, int]]]
 FlatDict: TypeAlias = dict[str, tuple[str, int]]
 FlatDictInt: TypeAlias = dict[str, tuple[int, int]]
 FlatDictStr: TypeAlias = dict[str, tuple[str, str]]
+OrderBook: TypeAlias = list[tuple[int, int]]  # (price, amount) of the sell listings of an item, cheapest first
+OrderBooks: TypeAlias = dict[str, OrderBook]  # Item ID: order book
 TupleContributions: TypeAlias = tuple[int, bool, int, dict[str, int]]  # (profit, is_concentrated_profit_greater, black_stone_cost, contribution_to_total)
 
 reduced_item_names = {
@@ -7,10 +7,11 @@ from logic.exchange_calculator import exchange_results
 from logic.manage_resources.access_resources import (
     update_confirm_dialog, 
     get_show_confirm_exit, 
-    get_data_value
+    get_spot_names
 )
 from logic.data_classes.save_session_data import SaveSessionData
 from logic.data_classes.session_results import SessionResultsData
+from logic.data_classes.price_uncertainty import PriceUncertaintyReport
 from gui.dialogs.dialogs_user import (
     show_dialog_confirmation, 
     show_dialog_type, 
@@ -123,7 +124,7 @@ class AppController:
         Get the list of spots from the data file.
             :return: A list of spots.
         """
-        return get_data_value('spots')
+        return get_spot_names()
 
     def create_settings_widget_controller(self):
         """
@@ -171,7 +172,7 @@ class AppController:
 
     def save_session_controller(self, session_data: SaveSessionData) -> bool:
         """
-        Save the results of a hunting session to an Excel file.
+        Save the results of a hunting session in the sessions database, its Excel file is exported in background.
             :param session_data: An instance of SaveSessionData containing the session details.
             :return: True if successful, False if an error occurs.
         """
@@ -184,6 +185,15 @@ class AppController:
             :return: A dictionary containing the results of the session or -1 if an error occurs.
         """
         return self.session_controller.handle_get_results_session(session_results)
+
+    def get_price_uncertainty_controller(self, session_results: SessionResultsData, item_ids: dict[str, str]) -> PriceUncertaintyReport | int:
+        """
+        Get the price uncertainty analysis of a hunting session.
+            :param session_results: An instance of SessionResultsData containing the results of the session.
+            :param item_ids: A dictionary of the item names and their IDs.
+            :return: The report of the analysis, or -1 if an error occurs.
+        """
+        return self.session_controller.handle_get_price_uncertainty(session_results, item_ids)
     
     def get_all_settings_data_controller(self) -> Optional[dict[str, Any]]:
         """
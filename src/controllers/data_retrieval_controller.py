@@ -8,13 +8,13 @@ from logic.data_fetcher import DataFetcher
 from logic.data_classes.new_session_data import NewSessionData
 from logic.manage_resources.access_resources import (
     get_spot_loot,
-    get_user_setting,
+    get_user_setting_typed,
     get_data_value,
     get_spot_id_icon,
     get_no_market_items,
     get_match_elixirs
 )
-from logic.sql_items_data.sql_db_connection import check_cached_data, update_cached_data
+from logic.sql_items_data.sql_db_connection import check_cached_data, update_cached_data, get_order_books
 from logic.sql_items_data.merge_fetched_data import merge_cached_fetched_data
 from logic.data_classes.merge_results_data import MergeResultsData
 from config.config import (
@@ -75,14 +75,14 @@ class DataRetrievalController(QObject): # Inherits from QObject to use signals a
             return
 
         # Collect required data
-        self.region = get_user_setting("region")
-        language = get_user_setting("language")
-        extra_profit = get_user_setting("extra_profit")
-        value_pack = get_user_setting("value_pack")
-        elixirs = get_user_setting("elixirs")
+        self.region = get_user_setting_typed("region", str)
+        language = get_user_setting_typed("language", str)
+        extra_profit = get_user_setting_typed("extra_profit", bool)
+        value_pack = get_user_setting_typed("value_pack", bool)
+        elixirs = get_user_setting_typed("elixirs", dict)
         lightstones = get_data_value("lighstone_items")
         imperfect_lightstones = get_data_value("imperfect_lighstone_items")
-        auto_profit = get_user_setting("auto_calculate_best_profit")
+        auto_profit = get_user_setting_typed("auto_calculate_best_profit", bool)
         black_stone_cost = get_data_value("black_stone_cost")
 
         # Validate all
@@ -248,6 +248,7 @@ class DataRetrievalController(QObject): # Inherits from QObject to use signals a
             data_fetched["imperfect_lightstones"],
             data_fetched["black_stone_cost"]
         )
+        self.new_session.order_books = get_order_books([*data_fetched["lightstones"], *data_fetched["imperfect_lightstones"]], self.region)
 
         self.create_new_session_widget(self.new_session)
 
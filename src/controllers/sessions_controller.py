@@ -1,13 +1,22 @@
+from PySide6.QtCore import QObject, Signal
+
+from concurrent.futures import Future
 from typing import Callable, Optional, Any
 
 from logic.session_results.calculate_results_session import CalculateResultsSession
+from logic.session_results.results_cache import SessionResultsCache, get_cache_key
+from logic.session_results.incremental_results import SessionGroupCache
+from logic.sql_items_data.sql_db_connection import get_price_volatilities
 from logic.data_classes.save_session_data import SaveSessionData
 from logic.data_classes.session_results import SessionResultsData
+from logic.data_classes.price_uncertainty import PriceUncertaintyReport
 from logic.manage_excels import SaveSession, clean_sessions, delete_saved_session
 from logic.manage_resources.access_resources import (
     get_show_confirm_clean, 
     update_confirm_dialog, 
-    sessions_root_folder_exists
+    sessions_root_folder_exists,
+    get_user_setting,
+    add_settings_listener
 )
 from logic.logs import add_log
 from gui.dialogs.dialogs_user import (
@@ -15,7 +24,13 @@ from gui.dialogs.dialogs_user import (
     show_dialog_confirmation, 
     show_dialog_view_session
 )
-from config.config import settings_json, saved_sessions_folder
+from config.config import settings_json, saved_sessions_folder, session_results_cache_size
+
+class ExcelExportSignals(QObject):
+    """
+    Signals of the Excel exports of the saved sessions, emitted in the Excel exports thread and received in the GUI thread.
+    """
+    export_failed = Signal(str) # Signal to emit when the Excel export of a saved session fails (name of the spot)
 
 class SessionController:
     """
@@ -40,7 +55,13 @@ class SessionController:
 
         self.get_current_page_name = get_current_page_name
         self.change_page = change_page
+        self.results_cache = SessionResultsCache(session_results_cache_size) # Results of the last calculations, repeated inputs are not calculated again
+        self.group_cache = SessionGroupCache() # Last evaluation of the stones and heads, only the groups edited are calculated again
+        self.caches_outdated = False # Set when the region changes, the caches are cleared by the next calculation (in the results thread)
+        add_settings_listener(self.on_settings_changed)
         self.process_view_session = process_view_session
+        self.excel_export_signals = ExcelExportSignals()
+        self.excel_export_signals.export_failed.connect(self.show_export_failed)
 
     def handle_clean_sessions(self):
         """
@@ -197,21 +218,87 @@ class SessionController:
 
     def handle_save_session(self, session_data: SaveSessionData) -> bool:
         """
-        Save the results of a hunting session to an Excel file.
+        Save the results of a hunting session in the sessions database, its Excel file is exported in background.
             :param session_data: An instance of SaveSessionData containing the session details.
             :return: True if successful, False if an error occurs.
         """
         save_session = SaveSession(session_data)  # Call the SaveSession function to save the session data
-        return save_session.save()  # Return the result of the save operation
+        if not save_session.save():
+            return False
+        if save_session.export is not None: # The result of the export is reported when it finishes
+            save_session.export.add_done_callback(lambda export: self.on_export_done(session_data.name_spot, export))
+        return True
+
+    def on_export_done(self, name_spot: str, export: "Future[bool]"):
+        """
+        Report a failed Excel export of a saved session to the GUI, called in the Excel exports thread.
+            :param name_spot: The name of the hunting spot of the session.
+            :param export: The finished export.
+        """
+        if not export.cancelled() and not export.result():
+            self.excel_export_signals.export_failed.emit(name_spot) # Received in the GUI thread
+
+    def show_export_failed(self, name_spot: str):
+        """
+        Show that the Excel file of a saved session could not be written, the session is kept in the sessions database.
+            :param name_spot: The name of the hunting spot of the session.
+        """
+        show_dialog_type(
+            f"The session of '{name_spot}' was saved, but its Excel file or the average results of the spot could not be written. Check the logs for details.",
+            "Error exporting session",
+            "error",
+            "no_action"
+        )
         
+    def on_settings_changed(self, changed: dict[str, Any]):
+        """
+        Discard the cached results of the sessions when the region changes, their prices belong to the previous region.
+            :param changed: A dictionary of the changed settings and their new values.
+        """
+        if "region" in changed:
+            add_log(f"Region changed to '{changed['region']}', the cached session results are discarded.", "info")
+            self.caches_outdated = True
+
     def handle_get_results_session(self, session_results: SessionResultsData) -> dict[str, Any] | int:
         """
         Get the results of a hunting session.
             :param session_results: An instance of SessionResultsData containing the results of the session.
             :return: A dictionary containing the results of the session or -1 if an error occurs.
         """
-        calculate_results = CalculateResultsSession(session_results)  # Create an instance of CalculateResultsSession with the session results
-        return calculate_results.calculate_results_session()
+        if self.caches_outdated:
+            self.caches_outdated = False
+            self.results_cache.clear()
+            self.group_cache.clear()
+
+        key = get_cache_key(session_results)
+        cached_results = self.results_cache.get(key, session_results.data_input)
+        if cached_results is not None:
+            return cached_results
+
+        original_input = dict(session_results.data_input)
+        calculate_results = CalculateResultsSession(session_results, self.group_cache)  # Create an instance of CalculateResultsSession with the session results
+        results = calculate_results.calculate_results_session()
+        if isinstance(results, dict):
+            self.results_cache.put(key, results, original_input, session_results.data_input)
+        return results
+
+    def handle_get_price_uncertainty(self, session_results: SessionResultsData, item_ids: dict[str, str]) -> PriceUncertaintyReport | int:
+        """
+        Analyze how the results of a hunting session change with the uncertainty of the prices.
+        The volatility of the items is estimated from their price history in the current region when it is stored.
+            :param session_results: An instance of SessionResultsData containing the results of the session.
+            :param item_ids: A dictionary of the item names and their IDs.
+            :return: The report of the analysis, or -1 if an error occurs.
+        """
+        from logic.session_results.price_uncertainty import analyze_price_uncertainty # Imported on first use, NumPy is slow to import
+
+        try:
+            volatilities_ids = get_price_volatilities(list(item_ids.values()), get_user_setting("region"))
+            volatilities = {name: volatilities_ids[item_id] for name, item_id in item_ids.items() if item_id in volatilities_ids}
+            return analyze_price_uncertainty(session_results, volatilities)
+        except Exception as e:
+            add_log(f"Error analyzing the price uncertainty of the session: {e}", "error")
+            return -1
     
     @staticmethod
     def get_instance() -> "SessionController":
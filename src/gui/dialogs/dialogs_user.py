@@ -1,9 +1,9 @@
 from typing import Callable
 
 from PySide6.QtWidgets import QMessageBox, QCheckBox, QFileDialog
-from PySide6.QtGui import QIcon
 
-from config.config import saved_sessions_folder, res_abs_paths
+from gui.icon_cache import get_icon
+from config.config import saved_sessions_folder
 
 def show_dialog_confirm_delete_session(file_path: str) -> bool:
     """
@@ -11,7 +11,7 @@ def show_dialog_confirm_delete_session(file_path: str) -> bool:
         :param file_path: The path of the session file to be deleted.
     """
     msg_box = QMessageBox()
-    msg_box.setWindowIcon(QIcon(res_abs_paths["clean_sessions_ico"]))
+    msg_box.setWindowIcon(get_icon("clean_sessions_ico"))
     msg_box.setWindowTitle("Confirm Deletion")
     msg_box.setIcon(QMessageBox.Icon.Warning)
     msg_box.setText(f"Are you sure you want to delete the session file:\n{file_path}")
@@ -39,11 +39,11 @@ def show_dialog_confirmation(message: str, confirm_action: str = "exit") -> tupl
     """
     msg_box = QMessageBox()
     if confirm_action == "exit":
-        msg_box.setWindowIcon(QIcon(res_abs_paths["exit_ico"]))
+        msg_box.setWindowIcon(get_icon("exit_ico"))
     elif confirm_action == "clean_sessions":
-        msg_box.setWindowIcon(QIcon(res_abs_paths["clean_sessions_ico"]))
+        msg_box.setWindowIcon(get_icon("clean_sessions_ico"))
     else:
-        msg_box.setWindowIcon(QIcon(res_abs_paths["not_found_ico"]))
+        msg_box.setWindowIcon(get_icon("not_found_ico"))
 
     msg_box.setWindowTitle("Confirm Action")
     msg_box.setText(message)
@@ -95,13 +95,13 @@ def show_dialog_type(msg: str, title: str, type: str = "info", action: str = "no
     else:
         dialog.setIcon(QMessageBox.Icon.Information)
 
-    dialog.setWindowIcon(QIcon(res_abs_paths["matchlock_ico"]))
+    dialog.setWindowIcon(get_icon("matchlock_ico"))
 
     actions: dict[str, Callable [[], None]] = {
-        "clean_sessions": lambda: dialog.setWindowIcon(QIcon(res_abs_paths["clean_sessions_ico"])),
-        "no_action": lambda: dialog.setWindowIcon(QIcon(res_abs_paths["matchlock_ico"]))
+        "clean_sessions": lambda: dialog.setWindowIcon(get_icon("clean_sessions_ico")),
+        "no_action": lambda: dialog.setWindowIcon(get_icon("matchlock_ico"))
     }
-    actions[action]() if action in actions else dialog.setWindowIcon(QIcon(res_abs_paths["not_found_ico"]))
+    actions[action]() if action in actions else dialog.setWindowIcon(get_icon("not_found_ico"))
 
     dialog.setText(msg)
     dialog.setStyleSheet("""
@@ -1,18 +1,16 @@
 from typing import Optional
 
 from PySide6.QtWidgets import QMainWindow, QWidget, QHBoxLayout
-from PySide6.QtGui import QIcon, QGuiApplication, QShortcut, QCloseEvent, QKeySequence
+from PySide6.QtGui import QGuiApplication, QShortcut, QCloseEvent, QKeySequence
 from PySide6.QtCore import QSize
 
 from gui.manage_widgets import ManagerWidgets
 from gui.side_bar_widget import SideBarWidget
-from gui.stack_compo.settings.settings_widget import SettingsWidget
 from gui.stack_compo.home_widget import HomeWidget
-from gui.stack_compo.new_session_widgets.new_session import NewSession
-from gui.stack_compo.view_sessions_widget import ViewSessionsWidget
 from controllers.app_controller import AppController
-from config.config import res_abs_paths
+from gui.icon_cache import get_icon
 from logic.data_classes.new_session_data import NewSessionData
+from logic.startup_profiler import profile_phase
 
 class GuiEntryPoint(QMainWindow):
     def __init__(self):
@@ -21,7 +19,7 @@ class GuiEntryPoint(QMainWindow):
         """
         super().__init__()
 
-        self.setWindowIcon(QIcon(res_abs_paths["matchlock_ico"]))
+        self.setWindowIcon(get_icon("matchlock_ico"))
         self.setWindowTitle("Hunting Calculator")
         self.resize(QSize(1800, 1020))
         self.setMinimumSize(QSize(400, 300))
@@ -41,12 +39,15 @@ class GuiEntryPoint(QMainWindow):
         self.setCentralWidget(main_widget)
 
         # Create the ManagerWidgets instance to manage different widgets in the application
-        self.manager = ManagerWidgets()
+        with profile_phase("ManagerWidgets"):
+            self.manager = ManagerWidgets()
         # Create the AppController instance to manage the application logic
         # This controller will handle interactions between the view and the model
-        self.controller = AppController(self)
+        with profile_phase("AppController"):
+            self.controller = AppController(self)
         # Create the left-side menu and add it to the main layout
-        self.side_bar_widget = SideBarWidget(self)
+        with profile_phase("SideBarWidget"):
+            self.side_bar_widget = SideBarWidget(self)
 
         stack = self.manager.get_stack()
 
@@ -54,9 +55,11 @@ class GuiEntryPoint(QMainWindow):
         main_layout.addWidget(self.side_bar_widget)
         main_layout.addWidget(stack, stretch=1)
 
-        self.manager.add_page("home", HomeWidget()) # Add the home widget to the manager
-        self.manager.set_page("home")  # Set the home page as the current page
-        self.create_shortcuts()
+        with profile_phase("HomeWidget"):
+            self.manager.add_page("home", HomeWidget()) # Add the home widget to the manager
+            self.manager.set_page("home")  # Set the home page as the current page
+        with profile_phase("Shortcuts"):
+            self.create_shortcuts()
 
     def create_shortcuts(self):
         """
@@ -92,6 +95,7 @@ class GuiEntryPoint(QMainWindow):
         Create a new session widget for the specified hunting spot.
             :param new_session: An instance of NewSessionData containing the details of the new session.
         """
+        from gui.stack_compo.new_session_widgets.new_session import NewSession # Pages are imported when they are first opened
         self.actual_session = NewSession(new_session)
 
     def create_settings_widget(self):
@@ -99,6 +103,7 @@ class GuiEntryPoint(QMainWindow):
         Create and display the settings widget in the application.
         This method initializes the settings widget and adds it to the manager.
         """
+        from gui.stack_compo.settings.settings_widget import SettingsWidget
         self.manager.add_page("settings", SettingsWidget())  # Add the settings widget to the manager
         self.manager.set_page("settings")  # Switch to the settings page
        
@@ -156,6 +161,7 @@ class GuiEntryPoint(QMainWindow):
         to display the selected session.
             :param session_file_selected: The path to the session file selected by the user.
         """
+        from gui.stack_compo.view_sessions_widget import ViewSessionsWidget
         self.manager.add_page("view_sessions", ViewSessionsWidget(session_file_selected)) # Add the view_sessions widget to the manager
         self.manager.set_page("view_sessions") # Switch to the view sessions page
 
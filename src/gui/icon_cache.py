@@ -0,0 +1,76 @@
+from PySide6.QtGui import QIcon, QPixmap
+
+from logic.manage_resources.access_resources import resource_exists
+from config.config import res_abs_paths
+
+class IconCache:
+    """
+    A singleton class that decodes every icon and image resource once and hands out shared QIcon and QPixmap instances.
+    Missing resources are replaced by the 'not_found_ico' icon.
+    """
+    instance = None
+
+    def __init__(self):
+        """
+        Initialize the IconCache with empty caches, images are decoded on first use.
+        """
+        if IconCache.instance is not None:
+            raise Exception("IconCache is a singleton!")
+        IconCache.instance = self
+
+        self.pixmaps: dict[str, QPixmap] = {} # Resource key: decoded image
+        self.icons: dict[str, QIcon] = {} # Resource key: icon
+
+    def get_pixmap(self, res_key: str) -> QPixmap:
+        """
+        Get the decoded image of a resource.
+            :param res_key: The key of the resource in res_list.
+            :return: The shared QPixmap of the resource, or the 'not_found_ico' one if the resource does not exist.
+        """
+        if res_key in self.pixmaps:
+            return self.pixmaps[res_key]
+
+        if resource_exists(res_key):
+            pixmap = QPixmap(res_abs_paths[res_key])
+        elif res_key != "not_found_ico":
+            pixmap = self.get_pixmap("not_found_ico")
+        else:
+            pixmap = QPixmap() # Not even the not found icon exists, use an empty image
+        self.pixmaps[res_key] = pixmap
+        return pixmap
+
+    def get_icon(self, res_key: str) -> QIcon:
+        """
+        Get the icon of a resource.
+            :param res_key: The key of the resource in res_list.
+            :return: The shared QIcon of the resource, or the 'not_found_ico' one if the resource does not exist.
+        """
+        if res_key not in self.icons:
+            self.icons[res_key] = QIcon(self.get_pixmap(res_key)) if resource_exists(res_key) or res_key == "not_found_ico" else self.get_icon("not_found_ico")
+        return self.icons[res_key]
+
+    @staticmethod
+    def get_instance() -> "IconCache":
+        """
+        Get the singleton instance of the IconCache class, creating it on first use.
+            :return: The singleton instance of IconCache.
+        """
+        if IconCache.instance is None:
+            return IconCache() # Dialogs can be shown before the main window creates it
+        return IconCache.instance
+
+def get_icon(res_key: str) -> QIcon:
+    """
+    Get the shared icon of a resource.
+        :param res_key: The key of the resource in res_list.
+        :return: The QIcon of the resource, or the not found icon if it does not exist.
+    """
+    return IconCache.get_instance().get_icon(res_key)
+
+def get_pixmap(res_key: str) -> QPixmap:
+    """
+    Get the shared decoded image of a resource.
+        :param res_key: The key of the resource in res_list.
+        :return: The QPixmap of the resource, or the not found image if it does not exist.
+    """
+    return IconCache.get_instance().get_pixmap(res_key)
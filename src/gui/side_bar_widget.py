@@ -1,14 +1,13 @@
-import os
 from typing import Callable, Optional
 
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QDialog, QMainWindow
-from PySide6.QtGui import QFont, QIcon, QShortcut, QKeySequence
+from PySide6.QtGui import QFont, QShortcut, QKeySequence
 from PySide6.QtCore import QSize, Qt
 
 from gui.manage_widgets import ManagerWidgets
 from gui.aux_components import QHLine
 from controllers.app_controller import AppController
-from config.config import res_abs_paths
+from gui.icon_cache import get_icon
 
 class SideBarWidget(QWidget):
     """
@@ -58,10 +57,7 @@ class SideBarWidget(QWidget):
             text_low = text.lower().replace(' ', '_')
             self.left_widget_buttons[text_low] = button_side_bar
             
-            if not os.path.exists(res_abs_paths[f"{text_low}_ico"]):
-                button_side_bar.setIcon(QIcon(res_abs_paths["not_found_ico"]))
-            else:
-                button_side_bar.setIcon(QIcon(res_abs_paths[f"{text_low}_ico"])) # Set an icon based on the side bar button text
+            button_side_bar.setIcon(get_icon(f"{text_low}_ico")) # Set an icon based on the side bar button text
 
             button_side_bar.setIconSize(self.button_icon_size) # Set a default icon size
             button_side_bar.setStyleSheet("""
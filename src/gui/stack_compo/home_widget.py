@@ -1,9 +1,8 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap
 
 from gui.aux_components import NoClickLineEdit
-from config.config import res_abs_paths
+from gui.icon_cache import get_pixmap
 
 class HomeWidget(QWidget):
     """Widget that displays the home page with a background image and command shortcuts."""
@@ -17,7 +16,7 @@ class HomeWidget(QWidget):
         """)
 
         label = QLabel()
-        label.setPixmap(QPixmap(res_abs_paths['home_background']))
+        label.setPixmap(get_pixmap('home_background'))
         label.setScaledContents(True)
         label.setContentsMargins(0, 50, 0, 50)
 
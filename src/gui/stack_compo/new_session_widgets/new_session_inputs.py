@@ -1,4 +1,3 @@
-import os
 from typing import Optional, Any
 
 from PySide6.QtWidgets import (
@@ -9,18 +8,24 @@ from PySide6.QtWidgets import (
     QHBoxLayout
 )
 from PySide6.QtGui import QIcon, QFont
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer, QThreadPool, Slot
 
 from gui.aux_components import SmartLabel
 from controllers.app_controller import AppController
 from gui.dialogs.dialogs_user import show_dialog_type
-from config.config import res_abs_paths
+from gui.icon_cache import get_icon
+from gui.view_updates import ViewUpdates
 from logic.data_classes.new_session_data import NewSessionData
 from logic.data_classes.session_input_callbacks import SessionInputCallbacks
+from logic.data_classes.session_input_row import SessionInputRow
 from logic.data_classes.session_results import SessionResultsData
+from logic.data_classes.strategy_result import StrategyResult
+from logic.data_classes.price_uncertainty import PriceUncertaintyReport
+from logic.session_results_worker import SessionResultsWorker
 from config.config import (
     settings_json, 
     breath_of_narcion_id, 
+    recalculation_debounce_ms,
     FlatDictStr
 )
 
@@ -37,6 +42,7 @@ class SessionInputs(QWidget):
         super().__init__()
 
         self.labels_icons_input: list[tuple[Optional[QIcon], QLabel, Optional[QLabel]]] = []
+        row_keys: list[tuple[str, str, Optional[int]]] = [] # Item ID, name and price of every input, in the order of labels_icons_input
         self.controller = AppController.get_instance()  # Get the instance of the AppController
         self.new_session = new_session  # Store the new session data
         self.session_input_callbacks = session_input_callbacks  # Store the callbacks for getting labels and inputs
@@ -48,7 +54,7 @@ class SessionInputs(QWidget):
 
         assert self.new_session.items is not None, "Items must be provided in the new session data."
         for i, (id, (item_name, price)) in enumerate(self.new_session.items.items()):
-            icon = QIcon(res_abs_paths[id]) if os.path.exists(res_abs_paths[id]) else QIcon(res_abs_paths["not_found_ico"])
+            icon = get_icon(id)
 
             label = SmartLabel(f"{item_name} (0.00%)")
             label.setFont(self.default_font)
@@ -62,6 +68,7 @@ class SessionInputs(QWidget):
             price_value.setAlignment(Qt.AlignmentFlag.AlignLeft)
 
             self.labels_icons_input.append((icon, label, price_value))
+            row_keys.append((id, item_name, price))
 
         assert self.new_session.no_market_items is not None, "No market items must be provided in the new session data."
         for no_market_item in self.new_session.no_market_items:
@@ -73,16 +80,17 @@ class SessionInputs(QWidget):
             """)
 
             if "breath of narcion" in no_market_item.lower():
-                icon = QIcon(res_abs_paths[breath_of_narcion_id]) if os.path.exists(res_abs_paths[breath_of_narcion_id]) else QIcon(res_abs_paths["not_found_ico"])
+                icon = get_icon(breath_of_narcion_id)
             else:
                 no_market_item_lower_replace = no_market_item.lower().replace(" ", "_")
-                icon = QIcon(res_abs_paths[no_market_item_lower_replace]) if os.path.exists(res_abs_paths[no_market_item_lower_replace]) else QIcon(res_abs_paths["not_found_ico"])
+                icon = get_icon(no_market_item_lower_replace)
 
             price_value = QLabel("0")
             price_value.setContentsMargins(15, 0, 0, 0)
             price_value.setFont(self.default_font)
             price_value.setAlignment(Qt.AlignmentFlag.AlignLeft)
             self.labels_icons_input.append((icon, label, price_value))
+            row_keys.append((no_market_item, no_market_item, 0))
 
         label = SmartLabel("Hours")
         label.setMinimumHeight(50)
@@ -92,15 +100,16 @@ class SessionInputs(QWidget):
         """)
 
         self.labels_icons_input.append((None, label, None))
+        row_keys.append(("Hours", "Hours", None))
 
         # Data input fields
         self.line_edit_inputs: dict[str, QLineEdit] = {}
+        self.input_rows: dict[str, SessionInputRow] = {} # Item ID: row of the input, in the order of the input data
         # Column where to place next element
         col = 0
 
-        for i, (icon, label, price) in enumerate(self.labels_icons_input):
+        for i, ((icon, label, price), (item_id, name_without_percent, item_price)) in enumerate(zip(self.labels_icons_input, row_keys)):
             new_data_input = QLineEdit()
-            name_without_percent = self.session_input_callbacks.get_no_name_percent(label.text()) # Get the name without the percentage
 
             if (self.new_session.auto_calculate_best_profit and 
                 (name_without_percent.startswith("M. Sp.") or 
@@ -128,6 +137,7 @@ class SessionInputs(QWidget):
             new_data_input.setFont(self.default_font)
 
             self.line_edit_inputs[name_without_percent] = new_data_input
+            self.input_rows[item_id] = SessionInputRow(item_id, name_without_percent, label, new_data_input, icon, price, item_price)
 
             row_offset = (i // 7) * 3  # Calculate the row offset based on the group of 7 (3 rows per group)
 
@@ -152,25 +162,44 @@ class SessionInputs(QWidget):
             if col == 7:
                 col = 0
 
+        self.results_generation = 0 # Increased on every calculation started, only the results of the last one are shown
+        self.latest_session_results: Optional[SessionResultsData] = None # Inputs of the last calculation started
+        self.latest_inputs_filled = False # Whether every input of the last calculation started was filled
+        self.results_pool = QThreadPool(self)
+        self.results_pool.setMaxThreadCount(1) # One calculation at a time, the session caches of the controller are not shared between threads
+        self.create_recalculation_timer()
+
+    def create_recalculation_timer(self):
+        """ Create a single shot timer to debounce the recalculation of the results.
+            A burst of keystrokes (e.g. typing a long amount) only starts one calculation, once the user stops typing for a while.
+        """
+        self.recalculation_timer = QTimer(self)
+        self.recalculation_timer.setSingleShot(True)
+        self.recalculation_timer.setInterval(recalculation_debounce_ms)
+        self.recalculation_timer.timeout.connect(self.start_session_results)
+
     def update_session_results(self):
         """
-        Update the results of the new session based on the input data.
-        This method collects the input data, calculates the results, and updates the labels and input fields accordingly.
+        Schedule the update of the results of the new session after a change of the input data.
+        The save button is disabled until the results of the new input data are shown.
+        """
+        self.session_input_callbacks.get_save_button().setEnabled(False)
+        self.recalculation_timer.start() # Restart the timer, the inputs are read when it times out
+
+    def start_session_results(self):
+        """
+        Collect the input data and start calculating the results of the new session outside the GUI thread.
         """
         data_input: FlatDictStr = {}
         # Calculate the results based on the input data
         all_inputs_filled: bool = True
-        save_button = self.session_input_callbacks.get_save_button()
 
-        for i, (_, label, price) in enumerate(self.labels_icons_input):
-            name_no_percent = self.session_input_callbacks.get_no_name_percent(label.text()) # Get the name without the percentage
-            amount = self.line_edit_inputs[name_no_percent].text()
-            data_input[name_no_percent] = (price.text() if price else "", amount)
+        for row in self.input_rows.values():
+            amount = row.line_edit.text()
+            data_input[row.name] = (str(row.price) if row.price is not None else "", amount)
 
             if amount == "":
-                all_inputs_filled = False
-                if save_button.isEnabled():
-                    save_button.setEnabled(False)
+                all_inputs_filled = False # The save button stays disabled
 
         assert self.new_session.lightstone_costs is not None, "Lightstone costs must be provided in the new session data."
         assert self.new_session.imperfect_lightstone_costs is not None, "Imperfect lightstone costs must be provided in the new session data."
@@ -186,10 +215,38 @@ class SessionInputs(QWidget):
             self.new_session.auto_calculate_best_profit,
             self.new_session.lightstone_costs,
             self.new_session.imperfect_lightstone_costs,
-            self.new_session.black_stone_cost
+            self.new_session.black_stone_cost,
+            self.new_session.order_books or {}
         )
 
-        res_data = self.controller.get_session_results_controller(session_results)
+        self.results_generation += 1
+        self.latest_session_results = session_results
+        self.latest_inputs_filled = all_inputs_filled
+        self.results_worker = SessionResultsWorker(
+            self.results_generation,
+            session_results,
+            self.controller.get_session_results_controller,
+            self.get_price_uncertainty if all_inputs_filled else None,
+            lambda generation: generation != self.results_generation
+        )
+        self.results_worker.signals.finished_calculating.connect(self.on_session_results)
+        self.results_pool.start(self.results_worker)
+
+    @Slot(int, object, object)
+    def on_session_results(self, generation: int, res_data: dict[str, Any] | int, report: Optional[PriceUncertaintyReport | int]):
+        """
+        Show the results of a calculation of the new session, the results of outdated inputs are dropped.
+            :param generation: The generation number of the calculation.
+            :param res_data: A dictionary containing the results of the session, or an error code.
+            :param report: The price uncertainty analysis of the session, None if it was not done or -1 if it failed.
+        """
+        if generation != self.results_generation or self.latest_session_results is None:
+            return # The inputs changed while calculating, the results of the new ones are coming
+        session_results = self.latest_session_results
+        data_input = session_results.data_input
+        all_inputs_filled = self.latest_inputs_filled
+        save_button = self.session_input_callbacks.get_save_button()
+
         if res_data == -1:
             show_dialog_type("Error calculating results, please ensure all fields contain digits", "Calculate results", "error", "no_action")
             return
@@ -201,7 +258,8 @@ class SessionInputs(QWidget):
             show_dialog_type("Error calculating results, please ensure that all input data is valid.", "Calculate results", "error", "no_action")
             return
         
-        self.reupdate_item_amounts(data_input) # Reupdate the item amounts in the input fields from modified data input
+        view_updates = ViewUpdates() # Only the texts that changed are set, in a single repaint
+        self.reupdate_item_amounts(data_input, view_updates) # Reupdate the item amounts in the input fields from modified data input
         
         results_tot = res_data["total"]
         results_tot_h = res_data["total_h"]
@@ -211,35 +269,87 @@ class SessionInputs(QWidget):
         new_elixirs_cost = res_data["elixirs_cost"]
         action_user = res_data["action_user"]
 
-        for i, (_, label, _) in enumerate(self.labels_icons_input):
-            label.setText(new_labels_input_text[i])
+        for row, label_text in zip(self.input_rows.values(), new_labels_input_text): # The labels keep the order of the input data
+            view_updates.set_text(row.label, label_text) # The SmartLabel resets its tooltip only if its text changes
 
         input_results = self.session_input_callbacks.get_input_results()
         
-        input_results[0].setText(str(f"{results_tot:,}"))
-        input_results[1].setText(str(f"{results_tot_h:,}"))
-        input_results[2].setText(str(f"{results_tax:,}"))
-        input_results[3].setText(str(f"{results_tax_h:,}"))
+        view_updates.set_text(input_results[0], str(f"{results_tot:,}"))
+        view_updates.set_text(input_results[1], str(f"{results_tot_h:,}"))
+        view_updates.set_text(input_results[2], str(f"{results_tax:,}"))
+        view_updates.set_text(input_results[3], str(f"{results_tax_h:,}"))
         
         # Update the elixirs cost input field with the new elixirs cost
         elixirs_cost_line_edit = self.session_input_callbacks.get_elixirs_cost_line_edit()
-        elixirs_cost_line_edit.setText(new_elixirs_cost)
+        view_updates.set_text(elixirs_cost_line_edit, new_elixirs_cost)
 
         # Update the user action input field with the new user action
         user_action_line_edit = self.session_input_callbacks.get_user_action_line_edit()
-        user_action_line_edit.setText(action_user)
+        view_updates.set_text(user_action_line_edit, action_user)
+        view_updates.set_tooltip(user_action_line_edit, self.get_next_best_strategies_text(res_data.get("strategies", {})))
 
+        if all_inputs_filled:
+            self.show_price_uncertainty(report, action_user, input_results[3], view_updates)
+
+        view_updates.apply(self.parentWidget() or self) # The page of the new session contains the inputs and the results
         if all_inputs_filled:
             save_button.setEnabled(True) # Enable the save button after updating the results
 
-    def reupdate_item_amounts(self, res_data: dict[str, Any]):
+    def get_next_best_strategies_text(self, strategies: dict[str, tuple[StrategyResult, ...]]) -> str:
+        """
+        Get the text that compares the strategy used for every group of items with the next best one.
+            :param strategies: A dictionary of the groups of items (stones, heads) and their ranked strategies.
+            :return: One line per group with the next best strategy and how much lower its profit is.
+        """
+        lines: list[str] = []
+        for group, ranked in strategies.items():
+            selected = next((strategy for strategy in ranked if strategy.selected), None)
+            next_best = next((strategy for strategy in ranked if not strategy.selected), None)
+            if selected is None or next_best is None:
+                continue
+            difference = selected.net - next_best.net
+            lines.append(f"{group.capitalize()}: next best is {next_best.name}, {abs(difference):,} silver {'lower' if difference >= 0 else 'higher'}")
+        return "\n".join(lines)
+
+    def get_price_uncertainty(self, session_results: SessionResultsData) -> PriceUncertaintyReport | int:
+        """
+        Get the price uncertainty analysis of the session, called by the results worker outside the GUI thread.
+            :param session_results: An instance of SessionResultsData containing the results of the session.
+            :return: The report of the analysis, or -1 if an error occurs.
+        """
+        item_ids = {name: item_id for item_id, (name, _) in (self.new_session.items or {}).items()}
+        return self.controller.get_price_uncertainty_controller(session_results, item_ids)
+
+    def show_price_uncertainty(self, report: Optional[PriceUncertaintyReport | int], action_user: str, taxed_h_line_edit: QLineEdit, view_updates: ViewUpdates):
+        """
+        Show the price uncertainty analysis of the session (expected profit, percentiles and best actions) in the tooltip of the taxed profit per hour.
+        The samples only compare the fixed exchange chains, so the best actions are hidden when the action shown comes from the exchange optimizer.
+            :param report: The report of the analysis, or an error code / None if it is not available.
+            :param action_user: The action for the user shown in the results.
+            :param taxed_h_line_edit: The input field of the taxed profit per hour.
+            :param view_updates: The pending changes of the view where the tooltip is set.
+        """
+        if report is None or isinstance(report, int):
+            view_updates.set_tooltip(taxed_h_line_edit, "")
+            return
+
+        lines = [f"Expected Total Taxed/h: {report.expected_taxed_h:,} ({report.n_samples:,} price samples)"]
+        lines += [f"P{percentile}: {value:,}" for percentile, value in report.percentiles_taxed_h.items()]
+        if report.action_frequencies and not action_user.startswith("Optimized:"):
+            lines.append("Best fixed exchange chain (without the optimizer):")
+            lines += [f"{action}: {frequency:.0%} of samples" for action, frequency in report.action_frequencies.items()]
+        view_updates.set_tooltip(taxed_h_line_edit, "\n".join(lines))
+
+    def reupdate_item_amounts(self, res_data: dict[str, Any], view_updates: ViewUpdates):
         """
         Reupdate the item amounts in the input fields based on the provided results data.
+        The amounts are written with the signals blocked, they are the result of the calculation and do not start a new one.
             :param res_data: A dictionary containing the results data, where keys are item names and values are their amounts.
+            :param view_updates: The pending changes of the view where the amounts are set.
         """
-        for name,( _, amount) in res_data.items():
-            if name in self.line_edit_inputs and self.line_edit_inputs[name].text() != amount:
-                self.line_edit_inputs[name].setText(amount)
+        for row in self.input_rows.values():
+            if row.name in res_data:
+                view_updates.set_text(row.line_edit, res_data[row.name][1])
 
     def get_labels_icons_input(self) -> list[tuple[Optional[QIcon], QLabel, Optional[QLabel]]]:
         """
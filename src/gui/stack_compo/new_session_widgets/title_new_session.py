@@ -1,10 +1,8 @@
-import os
-
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel
-from PySide6.QtGui import QIcon, QFont
+from PySide6.QtGui import QFont
 from PySide6.QtCore import Qt
 
-from config.config import res_abs_paths
+from gui.icon_cache import get_icon
 
 class TitleNewSession(QWidget):
     """
@@ -32,7 +30,7 @@ class TitleNewSession(QWidget):
         """)
 
         # Hunting zone title and icon
-        hunting_zone_icon = QIcon(res_abs_paths[spot_id_icon]) if os.path.exists(res_abs_paths[spot_id_icon]) else QIcon(res_abs_paths["not_found_ico"])
+        hunting_zone_icon = get_icon(spot_id_icon)
         hunting_zone_name = QLabel(name_spot)
         hunting_zone_name.setFont(QFont("Arial", 24))
         hunting_zone_name.setContentsMargins(0, 0, 50, 0) # Add right margin to title label so it stays in center of screen after adding icon and spacing it
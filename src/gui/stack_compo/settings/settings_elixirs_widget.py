@@ -1,4 +1,3 @@
-import os
 from typing import Any, Callable
 
 from PySide6.QtWidgets import (
@@ -17,19 +16,20 @@ from PySide6.QtCore import (
     QSize, 
     QPoint, 
     QEvent, 
-    QObject
+    QObject, 
+    QTimer
 )
 from PySide6.QtGui import (
-    QIcon, 
     QFont, 
     QShortcut, 
     QKeySequence, 
     QMouseEvent
 )
 
-from config.config import res_abs_paths, scroll_bar_style
+from config.config import res_abs_paths, scroll_bar_style, search_debounce_ms
 from controllers.app_controller import AppController
 from gui.dialogs.dialogs_user import show_dialog_type
+from gui.icon_cache import get_icon
 
 class SettingsElixirsWidget(QWidget):
     """
@@ -64,6 +64,7 @@ class SettingsElixirsWidget(QWidget):
             self.add_elixir_entry(id, name)
 
         self.create_search_elixir_line_edit() # Create the search line edit for elixirs
+        self.create_search_timer() # Create the timer to debounce the elixirs search
         self.create_esc_shortcut() # Create the ESC shortcut to close the dialog
 
     def eventFilter(self, obj: QObject, event: QEvent) -> bool:
@@ -101,6 +102,15 @@ class SettingsElixirsWidget(QWidget):
             }
         """)
 
+    def create_search_timer(self):
+        """ Create a single shot timer to debounce the elixirs search.
+            The search is only done once the user stops typing for a while, not on every keystroke.
+        """
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(search_debounce_ms)
+        self.search_timer.timeout.connect(lambda: self.search_elixir(self.search_elixir_line_edit.text())) # type: ignore
+
     def create_esc_shortcut(self):
         """ Create a shortcut for the Escape key to close the matches dialog.
             This allows users to quickly close the dialog without needing to click a close button.
@@ -132,7 +142,7 @@ class SettingsElixirsWidget(QWidget):
 
         button_delete_elixir = QPushButton()
         button_delete_elixir.setFont(elixirs_default_font)
-        button_delete_elixir.setIcon(QIcon(res_abs_paths["delete_elixir"]) if os.path.exists(res_abs_paths["delete_elixir"]) else QIcon(res_abs_paths["not_found_ico"]))
+        button_delete_elixir.setIcon(get_icon("delete_elixir"))
         button_delete_elixir.setStyleSheet("""
             QPushButton {
                 background-color: transparent;
@@ -159,6 +169,17 @@ class SettingsElixirsWidget(QWidget):
 
         self.elixirs_layout.addWidget(entry_elixir_widget, 0, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter) # Add the elixir entry widget to the parent widget
         
+    def schedule_search_elixir(self, text: str):
+        """
+        Schedule the search of elixirs after the debounce time, restarting it on every keystroke.
+            :param text: The text to search for in the elixirs.
+        """
+        if not text:
+            self.search_timer.stop()
+            self.search_elixir(text) # Close the matches dialog without waiting
+            return
+        self.search_timer.start() # Restart the timer, the text is read when it times out
+
     def search_elixir(self, text: str):
         """
         Search for elixirs by name or ID and update the elixir settings.
@@ -17,7 +17,7 @@ from controllers.app_controller import AppController
 from gui.dialogs.dialogs_user import show_dialog_type
 from gui.manage_widgets import ManagerWidgets
 from gui.stack_compo.settings.settings_elixirs_widget import SettingsElixirsWidget
-from config.config import res_abs_paths, scroll_bar_style
+from config.config import res_abs_paths, scroll_bar_style, available_regions
 
 class SettingsWidget(QWidget):
     """
@@ -139,7 +139,7 @@ class SettingsWidget(QWidget):
                 """)
 
                 if setting_name == 'Region':
-                    combo_box.addItems(['eu', 'na'])
+                    combo_box.addItems(available_regions)
                 elif setting_name == 'Language':
                     combo_box.addItems(['en-US'])
 
@@ -228,7 +228,7 @@ class SettingsWidget(QWidget):
                 search_layout = QHBoxLayout(search_widget)
 
                 search_elixir_line_edit = self.elixirs_widget.get_search_elixir_input()
-                search_elixir_line_edit.textChanged.connect(lambda text: self.elixirs_widget.search_elixir(text)) # type: ignore
+                search_elixir_line_edit.textChanged.connect(lambda text: self.elixirs_widget.schedule_search_elixir(text)) # type: ignore
 
                 search_layout.addWidget(search_elixir_line_edit, 0, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
                 layout_settings_inputs.addWidget(search_widget) # Add search widget to settings container widget
@@ -1,4 +1,4 @@
-import pandas as pd
+from typing import TYPE_CHECKING
 
 from PySide6.QtWidgets import (
     QWidget, 
@@ -14,6 +14,9 @@ from PySide6.QtCore import Qt
 from controllers.app_controller import AppController
 from config.config import scroll_bar_style, res_abs_paths
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 class ViewSessionsWidget(QWidget):
     """
     Widget to view sessions in a table format.
@@ -136,17 +139,19 @@ class ViewSessionsWidget(QWidget):
         session_layout.addWidget(table_view, 0)
         session_layout.addWidget(button_container, 0, Qt.AlignmentFlag.AlignBottom)
 
+        import pandas as pd # Imported on first use, it is slow to import and most launches never open this page
         df: pd.DataFrame = pd.read_excel(file_path)  # type: ignore
         self.show_dataframe(df, table_view)
 
         table_view.resizeColumnsToContents() # Automatically resize columns to fit content
 
-    def show_dataframe(self, df: pd.DataFrame, table_view: QTableView):
+    def show_dataframe(self, df: "pd.DataFrame", table_view: QTableView):
         """
         Convert a DataFrame to a QStandardItemModel and set it to the table view.
             :param df: The DataFrame to display.
             :param table_view: The QTableView to set the model on.
         """
+        import pandas as pd
         model = QStandardItemModel()
         model.setColumnCount(len(df.columns))
         model.setHorizontalHeaderLabels([str(column) for column in df.columns])
@@ -0,0 +1,61 @@
+from PySide6.QtWidgets import QWidget, QLabel, QLineEdit
+
+class ViewUpdates:
+    """
+    Collect the new texts and tooltips of some widgets and apply only the ones that differ from what is displayed.
+    The changes are applied in a single repaint, with the signals of the widgets blocked so programmatic writes do not trigger their callbacks (e.g. a recalculation on textChanged).
+    """
+    def __init__(self):
+        """
+        Initialize the ViewUpdates with no pending changes.
+        """
+        self.texts: dict[QLabel | QLineEdit, str] = {} # Widget: new text
+        self.tooltips: dict[QWidget, str] = {} # Widget: new tooltip
+
+    def set_text(self, widget: QLabel | QLineEdit, text: str):
+        """
+        Set the text of a widget when the changes are applied, if it is not the displayed one.
+            :param widget: The label or line edit to update.
+            :param text: The new text of the widget.
+        """
+        if widget.text() != text:
+            self.texts[widget] = text
+        else:
+            self.texts.pop(widget, None) # A previous change of the same widget is not needed anymore
+
+    def set_tooltip(self, widget: QWidget, text: str):
+        """
+        Set the tooltip of a widget when the changes are applied, if it is not the displayed one.
+            :param widget: The widget to update.
+            :param text: The new tooltip of the widget.
+        """
+        if widget.toolTip() != text:
+            self.tooltips[widget] = text
+        else:
+            self.tooltips.pop(widget, None)
+
+    def apply(self, container: QWidget) -> int:
+        """
+        Apply the pending changes with the updates of the container disabled, so it is repainted once.
+            :param container: The widget that contains every updated widget.
+            :return: The number of changes applied.
+        """
+        changes = len(self.texts) + len(self.tooltips)
+        if not changes:
+            return 0 # Nothing changed, nothing is repainted
+
+        updates_enabled = container.updatesEnabled()
+        container.setUpdatesEnabled(False)
+        try:
+            for widget, text in self.texts.items():
+                signals_blocked = widget.blockSignals(True)
+                widget.setText(text)
+                widget.blockSignals(signals_blocked)
+            for widget, text in self.tooltips.items():
+                widget.setToolTip(text)
+        finally:
+            container.setUpdatesEnabled(updates_enabled)
+
+        self.texts.clear()
+        self.tooltips.clear()
+        return changes
@@ -1,15 +1,19 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock, Event
+from typing import Optional
 
 from logic.logs import add_log
 from logic.api.get_data_api_requests import ApiRequest
 from config.config import (
     max_threads, 
     NestedDict, 
-    FlatDict
+    FlatDict,
+    OrderBooks
 )
 
-def connect_api(item_ids: dict[str, str], elixir_ids: dict[str, str], lightstone_ids: dict[str, str], imperfect_lightstone_ids: dict[str, str], black_stone_cost: dict[str, str], region: str = "eu") -> tuple[bool, NestedDict]:
+order_book_types = ("Lightstones", "Imp-Lightstones") # Types whose order books are kept for the scroll crafting sourcing
+
+def connect_api(item_ids: dict[str, str], elixir_ids: dict[str, str], lightstone_ids: dict[str, str], imperfect_lightstone_ids: dict[str, str], black_stone_cost: dict[str, str], region: str = "eu", order_books: Optional[OrderBooks] = None) -> tuple[bool, NestedDict]:
     """
     Search for the current prices of items and elixirs from the Black Desert Market API and save them in a JSON file.
         :param item_ids: Dictionary of item IDs and their names to fetch prices for.
@@ -18,6 +22,7 @@ def connect_api(item_ids: dict[str, str], elixir_ids: dict[str, str], lightstone
         :param imperfect_lightstone_ids: Dictionary of imperfect lightstone IDs to fetch costs for.
         :param black_stone_cost: Dictionary of black stone costs IDs to fetch costs for.
         :param region: The region for which to fetch the data.
+        :param order_books: Dictionary filled with the order books of the lightstones and imperfect lightstones fetched, if given.
         :return: A tuple containing a boolean indicating half requests done, and a nested dictionary with the fetched data until the moment it failed (if did).
     """
 
@@ -35,7 +40,7 @@ def connect_api(item_ids: dict[str, str], elixir_ids: dict[str, str], lightstone
             add_log(f"No {label} to fetch. Skipping...", "info")
             results[key] = {}
             continue
-        all_fetched, data_fetched = make_api_requests(ids, region, label)
+        all_fetched, data_fetched = make_api_requests(ids, region, label, order_books if label in order_book_types else None)
         results[key] = data_fetched
         if not all_fetched:
             add_log(f"Failed to fetch all data for {label}.", "error")
@@ -43,68 +48,86 @@ def connect_api(item_ids: dict[str, str], elixir_ids: dict[str, str], lightstone
 
     return (True, results)
 
-def make_api_requests(ids: dict[str, str], region: str, item_type: str = "Items") -> tuple[bool, FlatDict]:
+def make_api_requests(ids: dict[str, str], region: str, item_type: str = "Items", order_books: Optional[OrderBooks] = None) -> tuple[bool, FlatDict]:
     """
     Make API requests to fetch prices from the Black Desert Market API.
         :param ids: Dictionary of IDs and their names to fetch prices for.
         :param region: The region for which to fetch the data.
         :param item_type: Type of items to fetch prices for (e.g., "Items", "Elixirs").
-        :return: A tuple containing a boolean indicating if all requests were successful, and a flat dictionary with the fetched prices.
+        :param order_books: Dictionary filled with the sell listings of the items fetched, if given.
+        :return: A tuple containing a boolean indicating if all requests were successful, and a flat dictionary with the prices fetched.
+    """
+    all_fetched, prices_regions = make_api_requests_regions({region: ids}, item_type, {region: order_books} if order_books is not None else None)
+    return (all_fetched, prices_regions[region])
+
+def make_api_requests_regions(ids_by_region: dict[str, dict[str, str]], item_type: str = "Items", order_books: Optional[dict[str, OrderBooks]] = None) -> tuple[bool, dict[str, FlatDict]]:
+    """
+    Make API requests for one or several regions at once, scheduling every (ID, region) pair in a single batch.
+    The first request that fails cancels the remaining ones, the prices fetched until then are returned so they can be cached.
+        :param ids_by_region: Dictionary of regions and, for each one, the IDs and names to fetch prices for.
+        :param item_type: Type of items to fetch prices for (e.g., "Items", "Elixirs").
+        :param order_books: Dictionary of regions and, for each one, a dictionary filled with the sell listings of the items fetched, if given.
+        :return: A tuple containing a boolean indicating if all requests were successful, and a dictionary of regions with their fetched prices.
     """
-    prices_ids: dict[str, int] = {id: -1 for id in ids} # Initialize with None to handle cases where the item is not found
+    prices_regions: dict[str, dict[str, int]] = {region: {id: -1 for id in ids} for region, ids in ids_by_region.items()} # -1 until the price is fetched
     lock = Lock()  # Lock to ensure thread-safe access
 
-    add_log(f"Connecting to Black Desert Market API to get '{item_type}' prices...", "info")
+    add_log(f"Connecting to Black Desert Market API to get '{item_type}' prices for regions {list(ids_by_region)}...", "info")
 
     cancel_event = Event()
-    def process_item(id: str) -> int:
+    def process_item(id: str, region: str) -> int:
         """
-        Process a single item ID to fetch its price from the API.
+        Process a single item ID in a region to fetch its price from the API.
             :param id: The ID of the item to fetch.
+            :param region: The region for which to fetch the price.
             :return: 0 on success, -1 on failure.
         """
-        add_log(f"Processing {item_type} ID {id}...", "debug")
+        add_log(f"Processing {item_type} ID {id} ({region})...", "debug")
         if cancel_event.is_set(): # Check if the cancel event is set before proceeding
             return -1
-        
+
         api_request = ApiRequest(id, item_type, cancel_event, region)
         price = api_request.get_price() # Fetch the price using the ApiRequest class
 
         if not price: # Check if the cancel event is set or if the price is empty
-            add_log(f"Failed to fetch price for {item_type} ID {id}. Skipping...", "warning")
+            add_log(f"Failed to fetch price for {item_type} ID {id} ({region}). Skipping...", "warning")
             return -1
         if cancel_event.is_set():
-            add_log(f"Cancellation event set while fetching {item_type} ID {id}. Stopping further processing...", "warning")
+            add_log(f"Cancellation event set while fetching {item_type} ID {id} ({region}). Stopping further processing...", "warning")
             return -1
-            
-        # Ensure thread-safe access to the shared dictionary if the cancel event is not set
-        if not cancel_event.is_set():
-            with lock:
-                price_int = int(price) if price.isdigit() else -1 # Convert price to int, handle non-digit cases
-                prices_ids[id] = price_int # id, sell_price
-                add_log(f"Fetched {item_type} ID {id} with price {price_int:,}", "debug")
+
+        with lock: # Ensure thread-safe access to the shared dictionaries
+            price_int = int(price) if price.isdigit() else -1 # Convert price to int, handle non-digit cases
+            prices_regions[region][id] = price_int
+            if order_books is not None and order_books.get(region) is not None:
+                order_books[region][id] = api_request.depth
+            add_log(f"Fetched {item_type} ID {id} ({region}) with price {price_int:,}", "debug")
 
         return 0  # Return 0 on success, -1 on failure
 
     with ThreadPoolExecutor(max_workers=max_threads) as executor:
-        futures = {executor.submit(process_item, id): id for id in ids}
+        futures = {executor.submit(process_item, id, region): (id, region) for region, ids in ids_by_region.items() for id in ids}
         for future in as_completed(futures):
-            result = future.result()
-            if result == -1:
+            if future.result() == -1:
                 add_log("Cancelling remaining tasks...", "warning")
                 cancel_event.set() # Cancel remaining futures
                 break
 
-    prices_final: FlatDict = {}
-    items_log = f"{item_type}: {{\n"
-    for id, price in prices_ids.items():
-        if price == -1: # If the price is -1, it means that an error occurred while fetching data for this ID
-            add_log(f"Failed to fetch data for ID {id}. Returning...", "warning")
-            return (False, prices_final)
-        name = ids[id]
-        prices_final[id] = (name, price) # id, (name, price)
-        items_log += f"\tID {id} ({name}): Price {price:,}\n"
-    items_log += "}"
-    
-    add_log(items_log, "debug")
-    return (True, prices_final)
\ No newline at end of file
+    all_fetched = True
+    prices_final: dict[str, FlatDict] = {}
+    for region, prices_ids in prices_regions.items():
+        prices_final[region] = {}
+        items_log = f"{item_type} ({region}): {{\n"
+        for id, price in prices_ids.items():
+            if price == -1: # An error occurred while fetching this ID, keep only the prices fetched so they can be cached
+                all_fetched = False
+                continue
+            name = ids_by_region[region][id]
+            prices_final[region][id] = (name, price) # id, (name, price)
+            items_log += f"\tID {id} ({name}): Price {price:,}\n"
+        items_log += "}"
+        add_log(items_log, "debug")
+
+    if not all_fetched:
+        add_log(f"Failed to fetch all '{item_type}' prices for regions {list(ids_by_region)}.", "warning")
+    return (all_fetched, prices_final)
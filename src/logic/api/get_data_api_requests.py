@@ -1,4 +1,4 @@
-import time, pycurl, json
+import time, json
 from io import BytesIO
 from threading import Event
 from typing import cast
@@ -9,7 +9,8 @@ from config.config import (
     max_attempts, 
     backoff_time, 
     timeout_fetch, 
-    user_agent
+    user_agent,
+    OrderBook
 )
 
 class ApiRequest:
@@ -32,6 +33,7 @@ class ApiRequest:
         self.attempts = 0
         self.sell_or_buy = "sellCount" if item_type == "Items" else "buyCount"
         self.url = f"https://api.blackdesertmarket.com/item/{self.id_item}/0?region={self.region}"
+        self.depth: OrderBook = [] # Sell listings of the item (price, amount), cheapest first, filled by get_price
 
     def get_price(self) -> str:
         """
@@ -50,6 +52,7 @@ class ApiRequest:
             data = json.loads(item_data)
             availability = data["data"]["availability"]
             price = None
+            self.depth = sorted((int(entry["onePrice"]), int(entry["sellCount"])) for entry in availability if entry.get("sellCount"))
 
             if self.sell_or_buy == "buyCount":
                 availability = reversed(availability)  # Reverse the list for buyCount to get the highest price first
@@ -103,6 +106,7 @@ class ApiRequest:
         buffer = BytesIO()
         response_code: int = 0
 
+        import pycurl # Imported on first request (or by the warm up after startup)
         c = pycurl.Curl()
         headers = [
             'accept: */*',
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from config.config import FlatDict
+from config.config import FlatDict, OrderBooks
 from typing import Optional
 
 @dataclass
@@ -21,6 +21,7 @@ class NewSessionData:
     lightstone_costs: Optional[FlatDict] = None
     imperfect_lightstone_costs: Optional[FlatDict] = None
     black_stone_cost: Optional[FlatDict] = None
+    order_books: Optional[OrderBooks] = None # Sell listings of the lightstones and imperfect lightstones, if cached
 
     def set_extra_data(
         self, 
@@ -0,0 +1,18 @@
+from dataclasses import dataclass, field
+
+from config.config import FlatDict, OrderBooks
+
+@dataclass
+class PriceContext:
+    """
+    Data class to hold the prices shared by the sessions calculated without the GUI, loaded once from the price cache.
+    The loot prices of every spot are loaded the first time a session of the spot is calculated.
+    """
+    region: str
+    elixirs_cost: str # Elixirs cost per hour of the elixirs of the user settings
+    lightstone_costs: FlatDict
+    imperfect_lightstone_costs: FlatDict
+    black_stone_cost: FlatDict
+    order_books: OrderBooks = field(default_factory=dict)
+    fetch: bool = False # Fetch the outdated prices from the API instead of using the last cached ones
+    spots: dict[str, tuple[FlatDict, list[str]]] = field(default_factory=dict) # Spot name: (loot prices with reduced names, items not available on the market)
@@ -0,0 +1,14 @@
+from dataclasses import dataclass, field
+
+@dataclass
+class PriceUncertaintyReport:
+    """
+    Data class to hold the result of the price uncertainty analysis of a session.
+    It contains the expected profit per hour under the sampled prices, its percentiles and how often every action is the best one.
+    """
+    n_samples: int
+    expected_total_h: int = 0
+    expected_taxed_h: int = 0
+    percentiles_taxed_h: dict[int, int] = field(default_factory=dict) # Percentile: taxed profit per hour
+    action_frequencies: dict[str, float] = field(default_factory=dict) # Action: fraction of the samples where it is the best fixed exchange chain (most frequent first), the optimizer is not sampled
+    volatilities: dict[str, float] = field(default_factory=dict) # Item name: volatility used to sample its price
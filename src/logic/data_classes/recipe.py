@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+
+@dataclass
+class Recipe:
+    """
+    Data class to hold an exchange between items.
+    Crafting it once consumes the inputs and produces the outputs (item name: amount).
+    """
+    name: str
+    inputs: dict[str, float]
+    outputs: dict[str, int]
+
+@dataclass
+class RecipePlan:
+    """
+    Data class to hold the result of the exchange optimizer.
+    It contains how many times every recipe is crafted, the items bought and the amounts of the items left after the exchanges.
+    """
+    crafts: dict[str, int] = field(default_factory=dict)
+    bought: dict[str, float] = field(default_factory=dict)
+    final_amounts: dict[str, int] = field(default_factory=dict)
+    value: int = 0 # Value of the items left after the exchanges
+    cost: int = 0 # Cost of the items bought
+
+    @property
+    def profit(self) -> int:
+        """
+        Get the profit of the plan.
+            :return: The value of the items left minus the cost of the items bought.
+        """
+        return self.value - self.cost
@@ -0,0 +1,33 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+@dataclass
+class RegionPriceMatrix:
+    """
+    Data class to hold the prices of the items of a hunting spot in several regions.
+    This class is used to compare the prices of the same items between regions.
+    """
+    name_spot: str
+    regions: list[str]
+    item_names: dict[str, str] = field(default_factory=dict) # id: name
+    prices: dict[str, dict[str, int]] = field(default_factory=dict) # id: {region: price}
+
+    def get_price(self, item_id: str, region: str) -> Optional[int]:
+        """
+        Get the price of an item in a region.
+            :param item_id: The ID of the item.
+            :param region: The region to get the price for.
+            :return: The price of the item in the region, or None if it is not available.
+        """
+        return self.prices.get(item_id, {}).get(region)
+
+    def get_best_region(self, item_id: str) -> Optional[str]:
+        """
+        Get the region where an item is sold at the highest price.
+            :param item_id: The ID of the item.
+            :return: The region with the highest price for the item, or None if no price is available.
+        """
+        prices_item = self.prices.get(item_id, {})
+        if not prices_item:
+            return None
+        return max(prices_item, key=lambda region: prices_item[region])
@@ -0,0 +1,23 @@
+from dataclasses import dataclass, field
+
+@dataclass
+class ScrollSourcing:
+    """
+    Data class to hold the cheapest way of sourcing the inputs of the scrolls crafted in a session.
+    The costs are the total of all the scrolls crafted, the lightstone cost is amortized (one lightstone crafts several scrolls).
+    """
+    scroll: str
+    price: int # Price of the scroll crafted
+    n_scrolls: int
+    lightstones_cost: int = 0
+    magical_lightstones_cost: int = 0
+    remnants_cost: int = 0
+    imperfect_lightstones: dict[str, int] = field(default_factory=dict) # Imperfect lightstone name: amount bought to make the magical lightstones
+
+    @property
+    def cost(self) -> int:
+        """
+        Get the total cost of the scrolls crafted.
+            :return: The cost of the lightstones, magical lightstones and remnants of mystic beasts.
+        """
+        return self.lightstones_cost + self.magical_lightstones_cost + self.remnants_cost
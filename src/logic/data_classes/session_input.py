@@ -0,0 +1,129 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from config.config import FlatDictStr
+
+stone_names = ('Black Gem Frag.', 'Black Gem', 'Conc. Mag. Black Gem', 'S. Black Crystal Shard', 'Wildspark', 'Conc. Mag. Black Stone')
+hide_names = ('Damaged Hide', 'Usable Hide', 'Supreme Hide', 'Breath of Narcion')
+
+# Category flags of the items
+category_hours = 1 # 'Hours' input, it is not an item
+category_stone = 2 # Stones and gems, exchanged by the stones calculations
+category_head = 4 # Hides, Breath of Narcion and green heads, exchanged by the heads calculations
+category_head_product = 8 # Yellow heads and scrolls, their amounts are calculated from the heads
+category_green_head = 16 # Green head of the spot ('St. ...'), also a head
+category_yellow_head = 32 # Yellow head of the spot ('M. St. ...'), also a head product
+category_special_yellow_head = 64 # Special yellow head of the spot ('M. Sp. St. ...'), also a head product
+
+def parse_number(text: str) -> Optional[int]:
+    """
+    Parse a number of the session input (e.g. '1,234').
+        :param text: The text to parse, empty means 0.
+        :return: The number, or None if the text is not a number.
+    """
+    cleaned = text.replace(',', '').replace(' ', '') or '0'
+    return int(cleaned) if cleaned.isdecimal() else None
+
+def get_item_category(name: str) -> int:
+    """
+    Get the category flags of an item from its name.
+        :param name: The name of the item.
+        :return: The category flags of the item (0 for items that are only sold).
+    """
+    if name == 'Hours':
+        return category_hours
+    if name in stone_names:
+        return category_stone
+
+    category = 0
+    if name in hide_names or name.startswith('St.'):
+        category = category_head
+    elif 'St.' in name or 'BMB' in name:
+        category = category_head_product
+
+    if name.startswith('St.'):
+        category |= category_green_head
+    elif name.startswith('M. St.'):
+        category |= category_yellow_head
+    elif name.startswith('M. Sp. St.'):
+        category |= category_special_yellow_head
+    return category
+
+@dataclass(slots=True)
+class SessionInput:
+    """
+    Data class to hold the input of a session parsed once: integer prices and amounts indexed by the position of the item, and its category flags.
+    The items keep the order of the input data ('Hours' included, with price and amount 0), so the labels can be built in the same order.
+    """
+    names: list[str]
+    prices: list[int]
+    amounts: list[int]
+    categories: list[int]
+    index: dict[str, int] = field(default_factory=dict) # Item name: position
+    updated: set[str] = field(default_factory=set) # Items whose amount was set by the calculations
+
+    def __post_init__(self):
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+    @staticmethod
+    def from_data_input(data_input: FlatDictStr) -> "SessionInput":
+        """
+        Parse the input data of a session.
+            :param data_input: A dictionary containing the input data for the session. (name: (price, amount))
+            :return: The parsed input of the session.
+            :raise ValueError: If the price or the amount of an item is not a number.
+        """
+        names = list(data_input)
+        prices = [0] * len(names)
+        amounts = [0] * len(names)
+        categories = [get_item_category(name) for name in names]
+        for i, (name, (price_text, amount_text)) in enumerate(data_input.items()):
+            if categories[i] & category_hours:
+                continue # Hours are validated with the rest of the session settings
+            price, amount = parse_number(price_text), parse_number(amount_text)
+            if price is None or amount is None:
+                raise ValueError(f"Invalid input data for {name}: price '{price_text}' or amount '{amount_text}' is not a valid number.")
+            prices[i], amounts[i] = price, amount
+        return SessionInput(names, prices, amounts, categories)
+
+    def get_name(self, category: int) -> str:
+        """
+        Get the name of the first item of a category (e.g. the green head of the spot).
+            :param category: The category flags, the first item with any of them is returned.
+            :return: The name of the item, empty if no item of the session has the category.
+        """
+        return next((name for name, item_category in zip(self.names, self.categories) if item_category & category), "")
+
+    def price(self, name: str) -> int:
+        """
+        Get the price of an item.
+            :param name: The name of the item.
+            :return: The price of the item, 0 if it is not in the session.
+        """
+        i = self.index.get(name)
+        return self.prices[i] if i is not None else 0
+
+    def amount(self, name: str) -> int:
+        """
+        Get the amount of an item.
+            :param name: The name of the item.
+            :return: The amount of the item, 0 if it is not in the session.
+        """
+        i = self.index.get(name)
+        return self.amounts[i] if i is not None else 0
+
+    def set_amount(self, name: str, amount: int):
+        """
+        Set the amount of an item calculated by the exchanges.
+            :param name: The name of the item.
+            :param amount: The new amount of the item.
+        """
+        self.amounts[self.index[name]] = amount
+        self.updated.add(name)
+
+    def get_updated_input(self) -> FlatDictStr:
+        """
+        Get the input data of the items whose amount was set by the calculations.
+            :return: A dictionary of the updated items. (name: (price, amount))
+        """
+        return {name: (str(self.prices[self.index[name]]), str(self.amounts[self.index[name]])) for name in self.updated}
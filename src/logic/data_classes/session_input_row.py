@@ -0,0 +1,19 @@
+from PySide6.QtWidgets import QLabel, QLineEdit
+from PySide6.QtGui import QIcon
+
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class SessionInputRow:
+    """
+    Data class to hold the widgets and the price of an input of a new session, registered by a stable key of its item.
+    The results are shown through these references, so the text of the labels is never parsed to find the item.
+    """
+    item_id: str # Market ID of the item, its name for items not available on the market, 'Hours' for the hours input
+    name: str # Name of the item in the input data of the calculations
+    label: QLabel
+    line_edit: QLineEdit
+    icon: Optional[QIcon] = None
+    price_label: Optional[QLabel] = None
+    price: Optional[int] = None # None for the hours input, it has no price
@@ -0,0 +1,17 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+@dataclass
+class SessionRequest:
+    """
+    Data class to hold a session to calculate without the GUI (e.g. a row of a batch file).
+    The settings left as None use the user settings.
+    """
+    spot: str
+    hours: str
+    amounts: dict[str, str] = field(default_factory=dict) # Item name (full or reduced): amount
+    name: str = "" # Identifier of the session in the results (e.g. the player or the log file)
+    elixirs_cost: Optional[str] = None # Elixirs cost per hour, the cost of the elixirs of the user settings if None
+    value_pack: Optional[bool] = None
+    extra_profit: Optional[bool] = None
+    auto_calculate_best_profit: Optional[bool] = None
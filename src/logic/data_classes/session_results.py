@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from config.config import FlatDict, FlatDictStr
+from dataclasses import dataclass, field
+from config.config import FlatDict, FlatDictStr, OrderBooks
 
 @dataclass
 class SessionResultsData:
@@ -16,4 +16,5 @@ class SessionResultsData:
     auto_calculate_best_profit: bool
     lightstone_costs: FlatDict
     imperfect_lightstone_costs: FlatDict
-    black_stone_cost: FlatDict
\ No newline at end of file
+    black_stone_cost: FlatDict
+    order_books: OrderBooks = field(default_factory=dict) # Sell listings of the lightstones and imperfect lightstones, used to source the scrolls
@@ -0,0 +1,19 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+@dataclass
+class StoredSession:
+    """
+    Data class to hold a hunting session read from the sessions database.
+    """
+    session_id: int
+    spot: str
+    saved_at: float # Unix time when the session was saved
+    hours: int
+    total: int
+    total_h: int
+    taxed: int
+    taxed_h: int
+    action_user: str
+    excel_path: Optional[str] = None # Path of the Excel export of the session, None until it is exported
+    items: dict[str, int] = field(default_factory=dict) # Item name: amount, only filled when the items are requested
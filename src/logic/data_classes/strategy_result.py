@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class StrategyResult:
+    """
+    Data class to hold one of the strategies evaluated by the profit optimizer for a group of items (stones or heads).
+    The profit is the value of the items of the group after the exchanges, before subtracting the costs.
+    It is immutable, the ranked strategies are cached and shared by the results of every calculation.
+    """
+    name: str
+    profit: int
+    black_stone_cost: int = 0
+    scrolls_cost: int = 0
+    delta: int = 0 # Net profit lower than the best strategy of the group
+    selected: bool = False # True for the strategy used in the results
+
+    @property
+    def net(self) -> int:
+        """
+        Get the net profit of the strategy.
+            :return: The profit minus the cost of black stones and scrolls.
+        """
+        return self.profit - self.black_stone_cost - self.scrolls_cost
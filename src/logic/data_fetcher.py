@@ -1,6 +1,9 @@
 from PySide6.QtCore import QObject, Signal
 
 from logic.api.api_connection import connect_api
+from logic.sql_items_data.sql_db_connection import update_order_books
+from logic.logs import add_log
+from config.config import OrderBooks
 
 class DataFetcher(QObject):
     """
@@ -34,5 +37,10 @@ class DataFetcher(QObject):
         This method connects to the API and fetches the data for the specified hunting spot.
         It emits a signal with the results.
         """
-        self.data_fetched = connect_api(self.loot_items, self.elixirs, self.lightstones, self.imperfect_lightstones, self.black_stone_cost, self.region)
-        self.finished_retrieving_data.emit(self.data_fetched)  # Emit the fetched data and costs
\ No newline at end of file
+        order_books: OrderBooks = {}
+        self.data_fetched = connect_api(self.loot_items, self.elixirs, self.lightstones, self.imperfect_lightstones, self.black_stone_cost, self.region, order_books)
+        try:
+            update_order_books(order_books, self.region) # Stored before the signal so the new session reads them
+        except Exception as e:
+            add_log(f"Error updating the order books: {e}", "error")
+        self.finished_retrieving_data.emit(self.data_fetched)  # Emit the fetched data and costs
@@ -1,20 +1,40 @@
+from config.config import n_usable_hide_damaged_exchange, n_damaged_hide_usable_exchange
+
+max_ratio_numerator, max_ratio_denominator = 6, 5 # The exchanges stop when the ratio of green to blue resources reaches 1.2
+
+def get_n_exchanges(green: int, blue: int) -> tuple[int, bool]:
+    """
+    Calculate in constant time how many exchanges are done before the ratio (green + 60) / (blue - 30) leaves [0, 1.2).
+        :param green: The initial amount of green resources.
+        :param blue: The initial amount of blue resources.
+        :return: A tuple containing the number of exchanges and whether the exchanges stop on a blue amount of 30 (the ratio can not be calculated).
+    """
+    green_next, blue_next = green + n_damaged_hide_usable_exchange, blue - n_usable_hide_damaged_exchange
+    if blue_next > 0 and green_next >= 0:
+        # ratio < 1.2 while 5 * green_next < 6 * blue_next, which grows by 5 * 60 + 6 * 30 every exchange
+        step = max_ratio_denominator * n_damaged_hide_usable_exchange + max_ratio_numerator * n_usable_hide_damaged_exchange
+        n_exchanges = max(0, -((max_ratio_denominator * green_next - max_ratio_numerator * blue_next) // step))
+    elif blue_next < 0 and green_next <= 0 and max_ratio_denominator * green_next > max_ratio_numerator * blue_next:
+        # Both negative and ratio below 1.2 (it only decreases), the ratio stays in [0, 1.2) until green_next becomes positive
+        n_exchanges = -green_next // n_damaged_hide_usable_exchange + 1
+    else:
+        n_exchanges = 0
+
+    green_next += n_exchanges * n_damaged_hide_usable_exchange
+    blue_next -= n_exchanges * n_usable_hide_damaged_exchange
+    return (n_exchanges, blue_next == 0)
+
 def exchange_results(green: int, blue: int) -> tuple[int, int, int]:
     """
     Calculate the number of exchanges possible with given green and blue resources to obtain maximum profit.
+    Blue resources are exchanged to green ones while (green + 60) / (blue - 30) is in [0, 1.2).
         :param green: The initial amount of green resources.
         :param blue: The initial amount of blue resources.
         :return: A tuple containing the number of exchanges, the final amount of green resources, and the final amount of blue resources.
     """
-    try:
-        n_exchanges = 0
-        while True:
-            actual = (green+60)/(blue-30)
-            if actual >= 1.2 or actual < 0:
-                break
-            green += 60
-            blue -= 30
-            n_exchanges += 1
-
-        return (n_exchanges*30, green, blue)
-    except:
-        return (0, green, blue)
\ No newline at end of file
+    n_exchanges, stopped_on_zero = get_n_exchanges(green, blue)
+    green += n_exchanges * n_damaged_hide_usable_exchange
+    blue -= n_exchanges * n_usable_hide_damaged_exchange
+    if stopped_on_zero: # The ratio can not be calculated, the exchanges done are not counted
+        return (0, green, blue)
+    return (n_exchanges * n_usable_hide_damaged_exchange, green, blue)
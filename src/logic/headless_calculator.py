@@ -0,0 +1,266 @@
+import csv, json
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from logic.logs import add_log
+from logic.api.api_connection import make_api_requests, order_book_types
+from logic.manage_resources.access_resources import get_spot_loot, get_no_market_items, get_user_setting, get_data_value
+from logic.sql_items_data.sql_db_connection import check_cached_data, update_cached_data, get_cached_prices, get_order_books, update_order_books
+from logic.session_results.calculate_results_session import CalculateResultsSession, calculate_elixirs_cost_hour
+from logic.data_classes.session_results import SessionResultsData
+from logic.data_classes.session_request import SessionRequest
+from logic.data_classes.price_context import PriceContext
+from config.config import market_tax, reduced_item_names, FlatDict, FlatDictStr, OrderBooks
+
+price_types = { # Key of the cached data: type of the API requests
+    "items": "Items",
+    "elixirs": "Elixirs",
+    "lightstones": "Lightstones",
+    "imperfect_lightstones": "Imp-Lightstones",
+    "black_stone_cost": "Black-Stone-Cost"
+}
+request_fields = ("session", "spot", "hours", "elixirs_cost", "value_pack", "extra_profit", "auto_calculate_best_profit") # Fields of a session record that are not item amounts
+result_fields = ("session", "spot", "hours", "total", "total_h", "taxed", "taxed_h", "elixirs_cost", "action_user", "error") # Fields of the result of a session
+
+def load_prices(data_items: dict[str, str], data_type: str, region: str, fetch: bool) -> FlatDict:
+    """
+    Load the prices of some items from the price cache, fetching the outdated ones from the API first if requested.
+        :param data_items: Dictionary of item IDs and their names.
+        :param data_type: The key of the items in the cached data (e.g. "items", "lightstones").
+        :param region: The region of the prices.
+        :param fetch: Whether to fetch the outdated prices, otherwise the last cached prices are used whatever their age.
+        :return: A dictionary of item IDs and their names and prices, items without price are not included.
+    """
+    if fetch:
+        outdated_items, _ = check_cached_data(data_items, region)
+        if outdated_items:
+            order_books: OrderBooks = {}
+            item_type = price_types[data_type]
+            all_fetched, fetched = make_api_requests(outdated_items, region, item_type, order_books if item_type in order_book_types else None)
+            if not all_fetched:
+                add_log(f"Failed to fetch all '{item_type}' prices, using the last cached ones.", "warning")
+            data_fetched = {key: {} for key in price_types}
+            data_fetched[data_type] = fetched
+            update_cached_data(data_fetched, region)
+            update_order_books(order_books, region)
+    return get_cached_prices(data_items, region)
+
+def load_price_context(region: Optional[str] = None, fetch: bool = False) -> Optional[PriceContext]:
+    """
+    Load the prices shared by all the sessions (elixirs, lightstones and black stones) from the price cache.
+        :param region: The region of the prices, the region of the user settings if None.
+        :param fetch: Whether to fetch the outdated prices from the API, otherwise the last cached prices are used.
+        :return: The price context, or None if some setting or price is missing.
+    """
+    region = region or get_user_setting("region")
+    elixirs = get_user_setting("elixirs")
+    lightstones = get_data_value("lighstone_items")
+    imperfect_lightstones = get_data_value("imperfect_lighstone_items")
+    black_stone_cost = get_data_value("black_stone_cost")
+    if not region or elixirs is None:
+        add_log("'Region' or 'Elixirs' setting not found.", "error")
+        return None
+    if lightstones is None or imperfect_lightstones is None or black_stone_cost is None:
+        add_log("'lighstone_items', 'imperfect_lighstone_items' or 'black_stone_cost' missing in the data file.", "error")
+        return None
+
+    elixir_prices = load_prices(dict(elixirs), "elixirs", region, fetch)
+    if len(elixir_prices) < len(elixirs):
+        add_log(f"Prices of some elixirs are not cached in region '{region}', they are not included in the elixirs cost.", "warning")
+
+    costs: list[FlatDict] = []
+    for data_type, data_items in (("lightstones", lightstones), ("imperfect_lightstones", imperfect_lightstones), ("black_stone_cost", black_stone_cost)):
+        prices = load_prices(dict(data_items), data_type, region, fetch)
+        if len(prices) < len(data_items):
+            add_log(f"Prices of '{data_type}' are not cached in region '{region}', open a session of the app or fetch them first.", "error")
+            return None
+        costs.append(prices)
+    lightstone_costs, imperfect_lightstone_costs, black_stone_costs = costs
+
+    return PriceContext(
+        region,
+        calculate_elixirs_cost_hour(elixir_prices),
+        lightstone_costs,
+        imperfect_lightstone_costs,
+        black_stone_costs,
+        get_order_books([*lightstone_costs, *imperfect_lightstone_costs], region),
+        fetch
+    )
+
+def get_spot_prices(context: PriceContext, spot: str) -> Optional[tuple[FlatDict, list[str]]]:
+    """
+    Get the loot prices of a hunting spot, loaded once per spot.
+        :param context: The price context of the sessions.
+        :param spot: The name of the hunting spot.
+        :return: A tuple containing the loot prices (with reduced names) and the items not available on the market, or None if the spot or its prices are missing.
+    """
+    if spot in context.spots:
+        return context.spots[spot]
+
+    loot_items = get_spot_loot(spot)
+    if not loot_items:
+        add_log(f"Error fetching loot for spot '{spot}'.", "error")
+        return None
+    prices = load_prices(loot_items, "items", context.region, context.fetch)
+    if len(prices) < len(loot_items):
+        add_log(f"Prices of some items of spot '{spot}' are not cached in region '{context.region}'.", "error")
+        return None
+
+    loot_prices: FlatDict = {item_id: (reduced_item_names.get(name, name), price) for item_id, (name, price) in prices.items()}
+    context.spots[spot] = (loot_prices, get_no_market_items(spot))
+    return context.spots[spot]
+
+def parse_flag(value: Any, field: str) -> Optional[bool]:
+    """
+    Parse a setting flag of a session record.
+        :param value: The value of the flag (bool, or text like 'true', '1', 'no'), empty means the user setting.
+        :param field: The name of the flag, for the error message.
+        :return: The flag, or None to use the user setting.
+        :raise ValueError: If the value is not a flag.
+    """
+    if value is None or isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if not text:
+        return None
+    if text in ("true", "1", "yes", "y"):
+        return True
+    if text in ("false", "0", "no", "n"):
+        return False
+    raise ValueError(f"Invalid value '{value}' for '{field}', expected true or false.")
+
+def parse_session_request(record: dict[str, Any], index: int) -> SessionRequest:
+    """
+    Parse a session record of a batch file.
+    The item amounts are read from its 'items' object (JSON) or from every field that is not a setting (CSV columns).
+        :param record: The session record.
+        :param index: The position of the record in the file, used as its name if it has none.
+        :return: The session to calculate.
+        :raise ValueError: If the record is not valid.
+    """
+    if not isinstance(record, dict):
+        raise ValueError(f"Session {index} is not an object.")
+    items = record.get("items")
+    if items is None:
+        items = {name: value for name, value in record.items() if name not in request_fields}
+    if not isinstance(items, dict):
+        raise ValueError(f"Items of session {index} are not an object.")
+    elixirs_cost = record.get("elixirs_cost")
+
+    return SessionRequest(
+        str(record.get("spot") or "").strip(),
+        str(record.get("hours") or "0").strip(),
+        {str(name).strip(): str(amount if amount is not None else "").strip() for name, amount in items.items()},
+        str(record.get("session") or index),
+        str(elixirs_cost).strip() if elixirs_cost not in (None, "") else None,
+        parse_flag(record.get("value_pack"), "value_pack"),
+        parse_flag(record.get("extra_profit"), "extra_profit"),
+        parse_flag(record.get("auto_calculate_best_profit"), "auto_calculate_best_profit")
+    )
+
+def read_session_records(path: str) -> Iterator[dict[str, Any]]:
+    """
+    Read the session records of a batch file, one at a time.
+    CSV files have a row per session, JSON files a list of sessions (or an object with a 'sessions' list) and JSONL files a session per line.
+        :param path: The path of the batch file (.csv, .json or .jsonl).
+        :return: An iterator over the session records.
+        :raise ValueError: If the file format is not supported.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            yield from csv.DictReader(file)
+    elif suffix == ".jsonl":
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    elif suffix == ".json":
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        yield from (data.get("sessions", []) if isinstance(data, dict) else data)
+    else:
+        raise ValueError(f"Unsupported batch file '{path}', expected a .csv, .json or .jsonl file.")
+
+def build_session_results(request: SessionRequest, context: PriceContext) -> tuple[Optional[SessionResultsData], str]:
+    """
+    Build the input of the calculations of a session, as the session widgets do.
+        :param request: The session to calculate.
+        :param context: The price context of the sessions.
+        :return: A tuple containing the session data (None on error) and the error message.
+    """
+    spot_prices = get_spot_prices(context, request.spot)
+    if spot_prices is None:
+        return (None, f"Unknown spot '{request.spot}' or its prices are not cached.")
+    loot_prices, no_market_items = spot_prices
+
+    data_input: FlatDictStr = {name: (f"{price:,}", "0") for name, price in loot_prices.values()}
+    data_input.update({name: ("0", "0") for name in no_market_items})
+    for name, amount in request.amounts.items():
+        name = reduced_item_names.get(name, name)
+        if name not in data_input:
+            return (None, f"Item '{name}' is not a loot of spot '{request.spot}'.")
+        data_input[name] = (data_input[name][0], amount)
+    data_input["Hours"] = ("", request.hours)
+
+    settings = [
+        setting if setting is not None else get_user_setting(name)
+        for name, setting in (("value_pack", request.value_pack), ("extra_profit", request.extra_profit), ("auto_calculate_best_profit", request.auto_calculate_best_profit))
+    ]
+    if None in settings:
+        return (None, "'Value pack', 'Extra profit' or 'Auto profit' setting missing.")
+    value_pack, extra_profit, auto_calculate_best_profit = settings
+
+    return (SessionResultsData(
+        request.spot,
+        value_pack,
+        market_tax,
+        extra_profit,
+        data_input,
+        request.elixirs_cost if request.elixirs_cost is not None else context.elixirs_cost,
+        auto_calculate_best_profit,
+        context.lightstone_costs,
+        context.imperfect_lightstone_costs,
+        context.black_stone_cost,
+        context.order_books
+    ), "")
+
+def calculate_session_request(request: SessionRequest, context: PriceContext) -> dict[str, Any]:
+    """
+    Calculate the results of a session without the GUI.
+        :param request: The session to calculate.
+        :param context: The price context of the sessions.
+        :return: A dictionary with the result fields of the session, 'error' is not empty if it could not be calculated.
+    """
+    result: dict[str, Any] = {"session": request.name, "spot": request.spot, "hours": request.hours, "error": ""}
+    session_results, error = build_session_results(request, context)
+    if session_results is None:
+        result["error"] = error
+        return result
+
+    try:
+        res_data = CalculateResultsSession(session_results).calculate_results_session()
+    except Exception as e:
+        add_log(f"Error calculating session '{request.name}': {e}", "error")
+        res_data = -1
+    if isinstance(res_data, int):
+        result["error"] = "Invalid session, hours, elixirs cost and amounts must be numbers."
+        return result
+
+    result.update({name: res_data[name] for name in result_fields if name in res_data})
+    return result
+
+def calculate_session_record(record: dict[str, Any], index: int, context: PriceContext) -> dict[str, Any]:
+    """
+    Calculate the results of a session record of a batch file.
+        :param record: The session record.
+        :param index: The position of the record in the file.
+        :param context: The price context of the sessions.
+        :return: A dictionary with the result fields of the session, 'error' is not empty if it could not be calculated.
+    """
+    try:
+        request = parse_session_request(record, index)
+    except ValueError as e:
+        name = record.get("session") if isinstance(record, dict) else None
+        return {"session": str(name or index), "error": str(e)}
+    return calculate_session_request(request, context)
@@ -1,10 +1,25 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-import openpyxl, os, shutil
-from openpyxl.utils import get_column_letter
+from typing import Optional
+import os, shutil, glob, threading, time
 from logic.logs import add_log
 
-from config.config import saved_sessions_folder
+from config.config import saved_sessions_folder, reduced_item_names
 from logic.data_classes.save_session_data import SaveSessionData
+from logic.data_classes.stored_session import StoredSession
+from logic.manage_resources.access_resources import get_spot_names, get_spot_loot, get_no_market_items
+from logic.sql_items_data.sql_sessions_db import SessionsDatabase
+
+excel_exports = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ExcelExport") # One export at a time, the average files are read and written by every export
+excel_imports = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ExcelImport") # One-time import of the existing Excel files, apart from the exports so deleting sessions does not wait for it
+excel_files_lock = threading.Lock() # Held while the files of the sessions are deleted and while the import stores the sessions it read
+
+def wait_excel_exports():
+    """
+    Wait until the Excel exports already started are finished, before their files are deleted.
+    The import of the existing Excel files is not waited for, it runs in its own thread.
+    """
+    excel_exports.submit(lambda: None).result()
 
 def delete_saved_session(file_path: str) -> int:
     """
@@ -12,16 +27,19 @@ def delete_saved_session(file_path: str) -> int:
         :param file_path: The path to the session file to delete.
         :return: 0 if the deletion was successful, -1 if the file does not exist, -2 if an error occurred.
     """
-    try:
-        if not os.path.exists(file_path):
-            add_log(f"Session file '{file_path}' does not exist.", "error")
-            return -1
-        os.remove(file_path)
-        add_log(f"Session file '{file_path}' deleted successfully.", "info")
-        return 0
-    except Exception as e:
-        add_log(f"Error deleting session file '{file_path}': {e}", "error")
-        return -2
+    with excel_files_lock: # The import does not store the session while its file is deleted
+        try:
+            wait_excel_exports()
+            SessionsDatabase.get_instance().delete_session_by_excel(os.path.abspath(file_path))
+            if not os.path.exists(file_path):
+                add_log(f"Session file '{file_path}' does not exist.", "error")
+                return -1
+            os.remove(file_path)
+            add_log(f"Session file '{file_path}' deleted successfully.", "info")
+            return 0
+        except Exception as e:
+            add_log(f"Error deleting session file '{file_path}': {e}", "error")
+            return -2
 
 def clean_sessions() -> int:
     """
@@ -30,37 +48,134 @@ def clean_sessions() -> int:
     then recreates the directory to start fresh.
         :return: 1 if successful, 0 if folder not found or empty, -1 if folder not found, -2 if an unexpected error occurs.
     """
-    try:
-        if not os.path.exists(saved_sessions_folder):
-            add_log(f"Folder {saved_sessions_folder} not found, creating it. No sessions were deleted", "info")
-            os.mkdir(saved_sessions_folder)
-            return -1
-        elif os.path.isdir(saved_sessions_folder) and not os.listdir(saved_sessions_folder):
-            add_log(f"Folder {saved_sessions_folder} is empty, nothing to delete", "info")
-        elif os.path.isdir(saved_sessions_folder):
-            add_log(f"Deleting all saved sessions in '{saved_sessions_folder}'", "info")
-            shutil.rmtree(saved_sessions_folder)
-            os.mkdir(saved_sessions_folder)
-            add_log(f"Clean sessions dialog selection -> 1 (Success)", "info")
-            return 1
-        else:
-            add_log(f"Unexpected error. '{saved_sessions_folder}' is not a directory or does not exist", "error")
+    with excel_files_lock: # The import does not store sessions while their files are deleted
+        try:
+            wait_excel_exports()
+            SessionsDatabase.get_instance().delete_all_sessions()
+            if not os.path.exists(saved_sessions_folder):
+                add_log(f"Folder {saved_sessions_folder} not found, creating it. No sessions were deleted", "info")
+                os.mkdir(saved_sessions_folder)
+                return -1
+            elif os.path.isdir(saved_sessions_folder) and not os.listdir(saved_sessions_folder):
+                add_log(f"Folder {saved_sessions_folder} is empty, nothing to delete", "info")
+            elif os.path.isdir(saved_sessions_folder):
+                add_log(f"Deleting all saved sessions in '{saved_sessions_folder}'", "info")
+                shutil.rmtree(saved_sessions_folder)
+                os.mkdir(saved_sessions_folder)
+                add_log(f"Clean sessions dialog selection -> 1 (Success)", "info")
+                return 1
+            else:
+                add_log(f"Unexpected error. '{saved_sessions_folder}' is not a directory or does not exist", "error")
+                add_log(f"Clean sessions dialog selection -> -2 (Unexpected error)", "error")
+                return -2
+
+        except Exception as e:
+            add_log(f"Unexpected error. Error while cleaning sessions: {e}", "error")
             add_log(f"Clean sessions dialog selection -> -2 (Unexpected error)", "error")
             return -2
 
-    except Exception as e:
-        add_log(f"Unexpected error. Error while cleaning sessions: {e}", "error")
-        add_log(f"Clean sessions dialog selection -> -2 (Unexpected error)", "error")
-        return -2
+        add_log(f"Clean sessions dialog selection -> 0 (No elements found to delete)", "info")
+        return 0
 
-    add_log(f"Clean sessions dialog selection -> 0 (No elements found to delete)", "info")
-    return 0
+def get_session_spot(item_names: list[str], spots_items: dict[str, set[str]]) -> str:
+    """
+    Find the hunting spot of a session by the names of its items.
+        :param item_names: The names of the items of the session.
+        :param spots_items: A dictionary of the spot names and the names of their items.
+        :return: The spot with the most items of the session (the one with the fewest other items on a tie), or 'Unknown' if none has them.
+    """
+    best_spot, best_key = "Unknown", (0, 0) # Any spot with an item of the session is better than no spot
+    for spot, spot_items in spots_items.items():
+        matched = sum(name in spot_items for name in item_names)
+        key = (matched, matched - len(spot_items))
+        if key > best_key:
+            best_spot, best_key = spot, key
+    return best_spot
+
+def read_session_excel(path: str, spots_items: dict[str, set[str]]) -> Optional[StoredSession]:
+    """
+    Read a hunting session from the Excel file it was exported to.
+        :param path: The path to the Excel file of the session.
+        :param spots_items: A dictionary of the spot names and the names of their items, to find the spot of the session.
+        :return: The session read (its ID is 0), or None if the file is not a session exported by the application.
+    """
+    import openpyxl # Imported on first use to keep the startup fast
+    workbook = openpyxl.load_workbook(filename=path, read_only=True, data_only=True)
+    try:
+        if "Hunting Session Results" not in workbook.sheetnames:
+            return None
+        rows = list(workbook["Hunting Session Results"].iter_rows(min_row=2, max_col=8, values_only=True))
+    finally:
+        workbook.close()
+    if not rows:
+        return None
+
+    items: dict[str, int] = {}
+    for row in rows:
+        if row[0] is None:
+            break
+        label = str(row[0])
+        items[label[0:label.rfind(" ")]] = int(str(row[1]).replace(",", "")) # Label without percentage: amount
+    hours, total, total_h, taxed, taxed_h = (int(str(value).replace(",", "")) for value in rows[0][2:7])
+    action_user = str(rows[0][7]) if rows[0][7] is not None else ""
+
+    try:
+        saved_at = datetime.strptime(os.path.basename(path)[:19], "%d-%m-%Y_%H-%M-%S").timestamp() # Time of the save in the file name
+    except ValueError:
+        saved_at = os.path.getmtime(path)
+    spot = get_session_spot(list(items), spots_items)
+    return StoredSession(0, spot, saved_at, hours, total, total_h, taxed, taxed_h, action_user, os.path.abspath(path), items)
+
+def import_excel_sessions(before: Optional[float] = None) -> int:
+    """
+    Import once the sessions of the Excel files saved before the sessions database existed, the files already stored are skipped.
+    The files that cannot be read are logged and skipped, the averages files are not sessions.
+    The sessions are stored while holding excel_files_lock, without the files deleted while they were read.
+        :param before: Unix time, the files modified since then are skipped (exported while the import runs), None to read every file.
+        :return: The number of sessions imported, 0 if they were already imported, -1 if an error occurs.
+    """
+    sessions_db = SessionsDatabase.get_instance()
+    if not sessions_db.needs_excel_import():
+        return 0
+
+    spots_items: dict[str, set[str]] = {}
+    for spot in get_spot_names():
+        names = {reduced_item_names.get(name, name) for name in get_spot_loot(spot).values()}
+        spots_items[spot] = names | set(get_no_market_items(spot))
+
+    stored_paths = sessions_db.get_excel_paths()
+    sessions: list[StoredSession] = []
+    for path in sorted(glob.glob(os.path.join(saved_sessions_folder, "*.xlsx"))):
+        if os.path.basename(path).startswith("average_results_") or os.path.abspath(path) in stored_paths:
+            continue
+        try:
+            if before is not None and os.path.getmtime(path) >= before:
+                continue
+            session = read_session_excel(path, spots_items)
+        except Exception as e:
+            add_log(f"Session file '{path}' could not be imported: {e}", "warning")
+            continue
+        if session is not None:
+            sessions.append(session)
+
+    with excel_files_lock:
+        n_sessions = sessions_db.import_sessions([session for session in sessions if session.excel_path and os.path.exists(session.excel_path)])
+    if n_sessions >= 0:
+        add_log(f"{n_sessions} sessions imported from the Excel files of '{saved_sessions_folder}'.", "info")
+    return n_sessions
+
+def start_excel_sessions_import() -> Future[int]:
+    """
+    Start the one-time import of the sessions of the Excel files in background, the files exported from now on are not imported.
+        :return: The background import, its result is the one of import_excel_sessions.
+    """
+    return excel_imports.submit(import_excel_sessions, time.time())
 
 class SaveSession:
     """ 
-    Class to handle saving hunting session results to an Excel file.
-    This class provides methods to save session data, including results and metadata,
-    to an Excel file in a structured format.
+    Class to handle saving hunting session results.
+    The session is stored in the sessions database, then exported to an Excel file in background
+    with its results and metadata, and the average results of its spot are updated.
     """
     def __init__(self, session_data: SaveSessionData):
         """
@@ -81,18 +196,72 @@ class SaveSession:
         self.label_hours = self.res_labels[-1] # Last label in res_name is "Hours"
         self.hours_digit = 0  # Initialize hours_digit to 0, will be set later
         self.action_user = self.session_data.user_action  # User action string from the session data
+        self.export: Optional[Future[bool]] = None # Background Excel export, started when the session is stored
 
-    def save(self) -> bool:
+    def get_item_amounts(self) -> Optional[list[tuple[str, int]]]:
         """
-        Save the results of a hunting session to an Excel file.
-            :return: False if an error occurs, otherwise True.
+        Validate the session data and get the amounts of its items.
+            :return: A list of the item names (without percentage) and their amounts, or None if the data is not valid.
         """
         try:
             self.hours_digit = int(self.hours) # Ensure hours is an integer
-        except:
+            amounts = [int(amount) for amount in self.res_data[:-1]]
+        except ValueError:
+            return None
+        if self.hours_digit <= 0 or len(self.res_labels) != len(self.res_data):
+            return None
+        return [(label[0:label.rfind(" ")], amount) for label, amount in zip(self.res_labels[:-1], amounts)]
+
+    def save(self) -> bool:
+        """
+        Store the results of a hunting session in the sessions database and start its Excel export in background.
+            :return: False if the data is not valid or it could not be stored, otherwise True (the result of the export is in self.export).
+        """
+        items = self.get_item_amounts()
+        if items is None:
             return False
-        
+
         now = datetime.now()
+        session_id = SessionsDatabase.get_instance().insert_session(
+            self.session_data.name_spot,
+            now.timestamp(),
+            self.hours_digit,
+            (self.total_res, self.total_res_h, self.taxed_res, self.taxed_res_h),
+            self.action_user,
+            items
+        )
+        if session_id is None:
+            return False
+
+        add_log(f"Session {session_id} of spot '{self.session_data.name_spot}' stored, exporting it to Excel in background.", "info")
+        self.export = excel_exports.submit(self.export_excel, session_id, now)
+        return True
+
+    def export_excel(self, session_id: int, now: datetime) -> bool:
+        """
+        Export the results of a stored hunting session to an Excel file and update the average results of its spot.
+        Runs in the Excel exports thread, errors are logged and reported through the result.
+            :param session_id: The ID of the session in the sessions database.
+            :param now: The time when the session was saved.
+            :return: False if an error occurs, otherwise True.
+        """
+        try:
+            path = self.save_excel(now)
+            SessionsDatabase.get_instance().set_excel_path(session_id, os.path.abspath(path))
+            if not self.save_average():  # Update the average results
+                add_log(f"Error updating the average results of spot '{self.name_spot}'.", "error")
+                return False
+            return True
+        except Exception as e:
+            add_log(f"Error exporting session {session_id} to Excel: {e}", "error")
+            return False
+
+    def save_excel(self, now: datetime) -> str:
+        """
+        Save the results of a hunting session to an Excel file.
+            :param now: The time when the session was saved, used in the file name.
+            :return: The path of the Excel file.
+        """
         now_str = now.strftime("%d-%m-%Y_%H-%M-%S")
         
 
@@ -100,6 +269,8 @@ class SaveSession:
 
         path = f"{saved_sessions_folder}/{now_str}_({results_hour}b).xlsx"
 
+        import openpyxl # Imported on first use to keep the startup fast
+        from openpyxl.utils import get_column_letter
         workbook = openpyxl.Workbook()
         worksheet = workbook["Sheet"]
         worksheet.title = "Hunting Session Results"
@@ -108,11 +279,6 @@ class SaveSession:
 
         max_label_width = len("Item Name")  # Initialize with the width of the header
         for i, label in enumerate(self.res_labels[:-1]):
-            try:
-                int(self.res_data[i])
-            except:
-                return False
-            
             row = i + 2  # Start from row 2 for labels and data
             worksheet[f"A{row}"] = label
             cell_val = worksheet[f"B{row}"]
@@ -161,8 +327,7 @@ class SaveSession:
             f"\tAction user: {self.action_user}"
         )
         add_log(log_message, "info")
-
-        return self.save_average()  # Call the save_average method to update the average results
+        return path
 
     def save_average(self) -> bool:
         """
@@ -170,6 +335,7 @@ class SaveSession:
             :return: True if successful, False if an error occurs.
         """
         path = f"{saved_sessions_folder}/average_results_{self.name_spot}.xlsx"
+        import openpyxl # Imported on first use to keep the startup fast
 
         if not os.path.exists(path): # If the file does not exist, create it
             if self.hours_digit <= 0 or len(self.res_labels) != len(self.res_data):
@@ -1,9 +1,13 @@
-import json, os, sys
-from typing import Any
+import os, sys
+from typing import Any, Callable, Optional, TypeVar
 
 from logic.logs import add_log
+from logic.manage_resources.game_data_catalog import GameDataCatalog
+from logic.manage_resources.settings_store import SettingsStore
 from config.config import res_abs_paths, saved_sessions_folder, settings_json
 
+T = TypeVar("T")
+
 def check_field_exists(field: str, settings: dict[str, Any], file_name: str = settings_json) -> bool:
     """
     Check if a field exists in the settings dictionary.
@@ -24,82 +28,44 @@ def update_confirm_dialog(enable: bool, confirm_action: str) -> bool:
         :param confirm_action: The action for which the confirmation dialog is enabled or disabled.
         :return: True if the update was successful, False if it failed.
     """
-    try:
-        with open(settings_json, 'r', encoding='utf-8') as file:
-            settings: dict[str, Any] = json.load(file)
-    except FileNotFoundError:
-        add_log(f"Settings file not found: '{settings_json}'. Creating a new one.", "warning")
-        settings = {}
-    except json.JSONDecodeError:
-        add_log(f"Error decoding JSON in settings file: '{settings_json}'. Resetting to default.", "error")
-        settings = {}
+    fields = {"clean_sessions": "show_confirm_clean_message", "exit": "show_confirm_exit_message"}
+    if confirm_action not in fields:
+        return True # Nothing to update for unknown actions
 
-    if confirm_action == "clean_sessions":
-        if not check_field_exists("show_confirm_clean_message", settings, settings_json):
-            settings["show_confirm_clean_message"] = False  # Default value
-        elif settings["show_confirm_clean_message"] == enable:
-            return True  # No change needed if the value is already set
-        settings['show_confirm_clean_message'] = enable
-    elif confirm_action == "exit":
-        if not check_field_exists("show_confirm_exit_message", settings, settings_json):
-            settings["show_confirm_exit_message"] = False  # Default value
-        elif settings["show_confirm_exit_message"] == enable:
-            return True  # No change needed if the value is already set
-        settings['show_confirm_exit_message'] = enable
+    store = SettingsStore.get_instance()
+    if store.get(fields[confirm_action]) == enable:
+        return True  # No change needed if the value is already set
 
-    try:
-        with open(settings_json, 'w', encoding='utf-8') as file:
-            json.dump(settings, file, indent=4)
-        add_log(f"Confirmation dialog for {confirm_action} {'enabled' if enable else 'disabled'}.", "info")
-    except Exception as e:
-        add_log(f"Error saving settings: {e}", "error")
+    if not store.set(fields[confirm_action], enable):
         return False
-
+    add_log(f"Confirmation dialog for {confirm_action} {'enabled' if enable else 'disabled'}.", "info")
     return True
 
 def get_show_confirm_clean() -> tuple[bool, bool]:
     """
     Get the setting for showing the confirmation dialog before cleaning sessions.
-    This function reads the configuration file to determine whether to show
+    This function reads the user settings to determine whether to show
     the confirmation dialog when cleaning sessions.
         :return: A tuple containing:
             - True if the confirmation dialog should be shown, False otherwise.
             - False if there was an error checking the field.
     """
-    try:
-        with open(settings_json, 'r', encoding='utf-8') as file:
-            settings = json.load(file)
-            if not check_field_exists("show_confirm_clean_message", settings, settings_json):
-                return (False, False)  # Return False if the field does not exist
-            confirm_clean = settings['show_confirm_clean_message']
-            return (True, confirm_clean)  # Return True if the field exists and the value is fetched successfully
-    except FileNotFoundError:
-        add_log(f"Settings file not found: '{settings_json}'.", "error")
-        return (False, False)
-    except json.JSONDecodeError:
-        add_log(f"Error decoding JSON in settings file: '{settings_json}'.", "error")
-        return (False, False)
+    settings = SettingsStore.get_instance().get_all()
+    if not check_field_exists("show_confirm_clean_message", settings, settings_json):
+        return (False, False)  # Return False if the field does not exist
+    return (True, settings['show_confirm_clean_message'])  # Return True if the field exists and the value is fetched successfully
     
 def get_show_confirm_exit() -> tuple[bool, bool]:
     """
     Get the setting for showing the confirmation dialog before exiting the application.
-    This function reads the configuration file to determine whether to show
+    This function reads the user settings to determine whether to show
     the confirmation dialog when exiting the application.
         :return: True if the confirmation dialog should be shown, False otherwise.
     """
-    try:
-        with open(settings_json, 'r', encoding='utf-8') as file:
-            settings = json.load(file)
-            if not check_field_exists("show_confirm_exit_message", settings, settings_json):
-                return (False, False)  # Return False if the field does not exist
-            confirm_exit = settings['show_confirm_exit_message']
-            return (True, confirm_exit)  # Return True if the field exists and the value is fetched successfully
-    except FileNotFoundError:
-        add_log(f"Settings file not found: '{settings_json}'.", "error")
-        return (False, False)
-    except json.JSONDecodeError:
-        add_log(f"Error decoding JSON in settings file: '{settings_json}'.", "error")
-        return (False, False)
+    settings = SettingsStore.get_instance().get_all()
+    if not check_field_exists("show_confirm_exit_message", settings, settings_json):
+        return (False, False)  # Return False if the field does not exist
+    return (True, settings['show_confirm_exit_message'])  # Return True if the field exists and the value is fetched successfully
     
 def get_spot_id_icon(spot_name: str) -> str:
     """
@@ -107,16 +73,8 @@ def get_spot_id_icon(spot_name: str) -> str:
         :param spot_name: The name of the hunting spot.
         :return: The ID of the icon associated with the hunting spot, or an empty string if not found.
     """
-    try:
-        with open(res_abs_paths['data'], 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            return data.get('spots', {}).get(spot_name, {}).get('spot_id_icon', '')
-    except FileNotFoundError:
-        add_log(f"Data file not found: '{res_abs_paths['data']}'.", "error")
-        return ''
-    except json.JSONDecodeError:
-        add_log(f"Error decoding JSON in data file: '{res_abs_paths['data']}'.", "error")
-        return ''
+    spot = GameDataCatalog.get_instance().get_spot(spot_name)
+    return spot.spot_id_icon if spot else ''
     
 def get_spot_loot(spot_name: str) -> dict[str, str]:
     """
@@ -124,22 +82,11 @@ def get_spot_loot(spot_name: str) -> dict[str, str]:
         :param spot_name: The name of the hunting spot.
         :return: A dictionary containing item IDs and their names available at the specified hunting spot.
     """
-    common_items = get_data_value('common_items')
-    try:
-        with open(res_abs_paths['data'], 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            spot = data.get('spots', {}).get(spot_name, {})
-            spot_items = spot.get('loot', {})
-    except FileNotFoundError:
-        add_log(f"Data file not found: '{res_abs_paths['data']}'.", "error")
-        return {}
-    except json.JSONDecodeError:
-        add_log(f"Error decoding JSON in data file: '{res_abs_paths['data']}'.", "error")
+    snapshot = GameDataCatalog.get_instance().get_snapshot() # The spot and the common items of the same version of the data file
+    spot = snapshot.spots.get(spot_name)
+    if not spot or not spot.loot:
         return {}
-
-    if not spot_items:
-        return {}
-    return {**spot_items, **common_items}  # Merge spot items with common items
+    return {**spot.loot, **snapshot.category_items.get('common_items', {})}  # Merge spot items with common items
 
 def get_no_market_items(spot_name: str) -> list[str]:
     """
@@ -147,66 +94,59 @@ def get_no_market_items(spot_name: str) -> list[str]:
         :param spot_name: The name of the hunting spot.
         :return: A list of item IDs that are not available on the market.
     """
-    try:
-        with open(res_abs_paths['data'], 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            return data.get('spots', {}).get(spot_name, {}).get('no_market_items', [])
-    except FileNotFoundError:
-        add_log(f"Data file not found: '{res_abs_paths['data']}'.", "error")
-        return []
-    except json.JSONDecodeError:
-        add_log(f"Error decoding JSON in data file: '{res_abs_paths['data']}'.", "error")
-        return []
+    spot = GameDataCatalog.get_instance().get_spot(spot_name)
+    return list(spot.no_market_items) if spot else []
+
+def get_spot_names() -> list[str]:
+    """
+    Get the names of all the hunting spots.
+        :return: A list with the names of the hunting spots.
+    """
+    return GameDataCatalog.get_instance().get_spot_names()
     
 def get_user_setting(setting: str) -> Any:
     """
-    Get a specific user setting from the settings file.
+    Get a specific user setting from the settings store.
         :param setting: The name of the setting to fetch.
-        :return: The value of the specified setting, or an empty string if not found.
-    """
-    try:
-        with open(settings_json, 'r', encoding='utf-8') as file:
-            settings = json.load(file)
-            return settings.get(setting, None)
-    except FileNotFoundError:
-        add_log(f"Settings file not found: '{settings_json}'.", "error")
-        return None
-    except json.JSONDecodeError:
-        add_log(f"Error decoding JSON in settings file: '{settings_json}'.", "error")
-        return None
+        :return: The value of the specified setting, or None if not found.
+    """
+    return SettingsStore.get_instance().get(setting, None)
+    
+def get_user_setting_typed(setting: str, value_type: type[T]) -> Optional[T]:
+    """
+    Get a specific user setting from the settings store, checking its type.
+        :param setting: The name of the setting to fetch.
+        :param value_type: The expected type of the setting.
+        :return: The value of the specified setting, or None if not found or it has another type.
+    """
+    return SettingsStore.get_instance().get_typed(setting, value_type)
+    
+def add_settings_listener(callback: Callable[[dict[str, Any]], None]):
+    """
+    Register a function to call when user settings change (saved by the app or edited in the file).
+        :param callback: Function called with a dictionary of the changed settings and their new values.
+    """
+    SettingsStore.get_instance().add_listener(callback)
     
 def get_user_settings() -> dict[str, Any]:
     """
-    Get all user settings from the settings file.
+    Get all user settings from the settings store.
         :return: A dictionary containing all user settings.
     """
-    try:
-        with open(settings_json, 'r', encoding='utf-8') as file:
-            settings = json.load(file)
-            return settings
-    except FileNotFoundError:
-        add_log(f"Settings file not found: '{settings_json}'.", "error")
-        return {}
-    except json.JSONDecodeError:
-        add_log(f"Error decoding JSON in settings file: '{settings_json}'.", "error")
-        return {}
+    return SettingsStore.get_instance().get_all()
     
 def apply_user_settings(new_settings: dict[str, tuple[str, Any]]) -> int:
     """
     Save the new user settings to the settings file.
         :param new_settings: A dictionary containing the new settings to save.
     """
-    try:
-        new_settings_to_save = {}
-        for _, (id, val) in new_settings.items():
-            new_settings_to_save[id] = val  # Convert tuple to a simple value
+    new_settings_to_save = {}
+    for _, (id, val) in new_settings.items():
+        new_settings_to_save[id] = val  # Convert tuple to a simple value
 
-        with open(settings_json, 'w', encoding='utf-8') as file:
-            json.dump(new_settings_to_save, file, indent=4)
-        add_log("Settings saved successfully.", "info")
-    except Exception as e:
-        add_log(f"Error saving settings: {e}", "error")
+    if not SettingsStore.get_instance().replace_all(new_settings_to_save):
         return -1  # Return -1 to indicate an error in saving settings
+    add_log("Settings saved successfully.", "info")
     return 0  # Return 0 to indicate success
 
 def sessions_root_folder_exists() -> int:
@@ -229,44 +169,30 @@ def get_match_elixirs(elixir_name_id: str) -> dict[str, str]:
     """
     Get a dictionary of elixir IDs and names that match the provided elixir name or ID.
         :param elixir_name_id: The name or ID of the elixir to match.
-        :return: A dictionary where keys are elixir IDs and values are elixir names that match the provided name or ID.
+        :return: A dictionary where keys are elixir IDs and values are elixir names that match the provided name or ID, ranked from best to worst match.
     """
-    try:
-        with open(res_abs_paths['data'], 'r', encoding='utf-8') as file:
-            elixirs_perfumes = json.load(file).get('elixir_perfume_names_ids', {})
-    except FileNotFoundError:
-        add_log(f"Data file not found: '{res_abs_paths['data']}'.", "error")
-        return {}
-    except json.JSONDecodeError:
-        add_log(f"Error decoding JSON in data file: '{res_abs_paths['data']}'.", "error")
-        return {}
-    except Exception as e:
-        add_log(f"Unexpected error while reading data file: {e}", "error")
-        return {}
-    
-    matches: dict[str, str] = {}
-    for elixir_id, elixir_name in elixirs_perfumes.items():
-        if elixir_name_id in elixir_id[:len(elixir_name_id)] or elixir_name_id.lower() in elixir_name.lower():
-            matches[elixir_id] = elixir_name
-
-    return matches
+    return GameDataCatalog.get_instance().search_elixirs(elixir_name_id)
 
 def get_data_value(data_name: str) -> Any:
     """
-    Get a specific value from the data file.
+    Get a specific value from the data file (read-only, dictionaries are returned as mappings and lists as tuples).
         :param data_name: The name of the data to fetch.
         :return: The value of the specified data, or None if not found.
     """
-    try:
-        with open(res_abs_paths['data'], 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            return data.get(data_name, None)
-    except FileNotFoundError:
-        add_log(f"Data file not found: '{res_abs_paths['data']}'.", "error")
-        return None
-    except json.JSONDecodeError:
-        add_log(f"Error decoding JSON in data file: '{res_abs_paths['data']}'.", "error")
-        return None
+    return GameDataCatalog.get_instance().get_value(data_name)
+
+resources_exist: dict[str, bool] = {} # Resource key: whether its file exists, checked once
+
+def resource_exists(res_key: str) -> bool:
+    """
+    Check if the file of a resource exists, the result is cached so the file system is only checked once per resource.
+        :param res_key: The key of the resource in res_list.
+        :return: True if the resource file exists, False if it does not or the key is unknown.
+    """
+    if res_key not in resources_exist:
+        res_path = res_abs_paths.get(res_key)
+        resources_exist[res_key] = res_path is not None and os.path.exists(res_path)
+    return resources_exist[res_key]
 
 def get_app_resource(relative_path: str) -> str:
     """
@@ -0,0 +1,95 @@
+import hashlib, json, mmap, os, pickle, struct, tempfile
+from typing import Any, Optional
+
+from logic.logs import add_log
+from config.config import compiled_data_version
+
+compiled_data_magic = b"HCDATA" # Identifies the compiled data files
+compiled_data_header = struct.Struct(f"<{len(compiled_data_magic)}sHQq32s") # magic, version, size, mtime (ns) and sha256 of the JSON data file
+
+def hash_data_file(json_path: str) -> bytes:
+    """
+    Get the content hash of the JSON data file.
+        :param json_path: The path to the JSON data file.
+        :return: The sha256 digest of the file content.
+    """
+    with open(json_path, 'rb') as file:
+        return hashlib.sha256(file.read()).digest()
+
+def compile_data(json_path: str, compiled_path: str) -> bool:
+    """
+    Convert the JSON data file into a compiled file (header with the stamp and content hash of the JSON file + pickled data) that is faster to load.
+        :param json_path: The path to the JSON data file.
+        :param compiled_path: The path of the compiled file to create.
+        :return: True if the compiled file was created successfully, False otherwise.
+    """
+    try:
+        with open(json_path, 'rb') as file:
+            content = file.read()
+            stat_result = os.fstat(file.fileno())
+        data = json.loads(content)
+    except FileNotFoundError:
+        add_log(f"Data file not found: '{json_path}'.", "error")
+        return False
+    except json.JSONDecodeError:
+        add_log(f"Error decoding JSON in data file: '{json_path}'.", "error")
+        return False
+
+    header = compiled_data_header.pack(compiled_data_magic, compiled_data_version, stat_result.st_size, stat_result.st_mtime_ns, hashlib.sha256(content).digest())
+    folder = os.path.dirname(compiled_path) or '.'
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix='.data_', suffix='.tmp', dir=folder)
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(header)
+                pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.chmod(tmp_path, 0o644) # Temporary files are only readable by the owner
+            os.replace(tmp_path, compiled_path) # Replace atomically, the application could be reading the old one
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    except Exception as e:
+        add_log(f"Error writing compiled data file '{compiled_path}': {e}", "error")
+        return False
+
+    add_log(f"Compiled data file '{json_path}' into '{compiled_path}'.", "info")
+    return True
+
+def load_compiled_data(json_path: str, compiled_path: str) -> Optional[dict[str, Any]]:
+    """
+    Load the compiled data file (memory mapped) if it was compiled from the current content of the JSON data file.
+    The size and modification time of the JSON file are compared with the ones stored in the header, the file is only hashed when its size matches
+    but its modification time does not (e.g. both files were copied by an installer or bundled in the executable).
+        :param json_path: The path to the JSON data file.
+        :param compiled_path: The path to the compiled data file.
+        :return: The data of the compiled file, or None if it does not exist, is outdated or can not be read.
+    """
+    if not os.path.exists(compiled_path):
+        return None
+
+    try:
+        data_stat = os.stat(json_path)
+        with open(compiled_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if len(mapped) < compiled_data_header.size:
+                add_log(f"Compiled data file '{compiled_path}' is truncated, ignoring it.", "warning")
+                return None
+
+            magic, version, data_size, data_mtime_ns, data_hash = compiled_data_header.unpack_from(mapped, 0)
+            if magic != compiled_data_magic or version != compiled_data_version:
+                add_log(f"Compiled data file '{compiled_path}' has an unsupported format, ignoring it.", "warning")
+                return None
+            if data_stat.st_size != data_size or (data_stat.st_mtime_ns != data_mtime_ns and hash_data_file(json_path) != data_hash):
+                add_log(f"Compiled data file '{compiled_path}' is outdated, loading '{json_path}' instead.", "warning")
+                return None
+
+            with memoryview(mapped) as view, view[compiled_data_header.size:] as payload: # Unpickle without copying the file content
+                data = pickle.loads(payload)
+    except Exception as e:
+        add_log(f"Error reading compiled data file '{compiled_path}': {e}", "error")
+        return None
+
+    if not isinstance(data, dict):
+        add_log(f"Invalid content in compiled data file: '{compiled_path}'.", "error")
+        return None
+    return data # type: ignore
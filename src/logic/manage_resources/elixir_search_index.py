@@ -0,0 +1,188 @@
+import re
+from typing import Any, Mapping, Optional
+
+from config.config import elixir_search_min_similarity
+
+def normalize_words(text: str) -> tuple[str, ...]:
+    """
+    Split a text into lowercase words, ignoring punctuation.
+        :param text: The text to split.
+        :return: A tuple with the lowercase words of the text.
+    """
+    return tuple(re.findall(r"[a-z0-9]+", text.lower()))
+
+def word_trigrams(word: str) -> frozenset[str]:
+    """
+    Get the trigrams of a word padded with spaces, so short words and word boundaries also produce trigrams.
+        :param word: The lowercase word.
+        :return: A set with the trigrams of the word.
+    """
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+def typo_distance(word_a: str, word_b: str, max_distance: int) -> int:
+    """
+    Get the number of typos (insertions, deletions, substitutions or swaps of adjacent characters) between two words.
+        :param word_a: The first word.
+        :param word_b: The second word.
+        :param max_distance: The distance from which the calculation is stopped.
+        :return: The number of typos, or max_distance + 1 if it is greater than max_distance.
+    """
+    if abs(len(word_a) - len(word_b)) > max_distance:
+        return max_distance + 1
+
+    before_previous_row: list[int] = []
+    previous_row: list[int] = []
+    row = list(range(len(word_b) + 1))
+    for i in range(1, len(word_a) + 1):
+        previous_row, row = row, [i] + [0] * len(word_b)
+        for j in range(1, len(word_b) + 1):
+            cost = 0 if word_a[i - 1] == word_b[j - 1] else 1
+            row[j] = min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + cost)
+            if i > 1 and j > 1 and word_a[i - 1] == word_b[j - 2] and word_a[i - 2] == word_b[j - 1]:
+                row[j] = min(row[j], before_previous_row[j - 2] + 1)
+        before_previous_row = previous_row
+        if min(row) > max_distance:
+            return max_distance + 1
+    return min(row[-1], max_distance + 1)
+
+class ElixirSearchIndex:
+    """
+    Search index of elixirs and perfumes built once when the game data is loaded.
+    It keeps a prefix trie of the IDs, an n-gram index of the lowercase names (for substring matches)
+    and a trigram index of the name words (for fuzzy, typo tolerant matches).
+    """
+    def __init__(self, items: Mapping[str, str]):
+        """
+        Build the indexes for the provided items.
+            :param items: A mapping of item IDs and names.
+        """
+        self.names: dict[str, str] = dict(items)
+        self.lower_names: dict[str, str] = {item_id: name.lower() for item_id, name in items.items()}
+        self.name_words: dict[str, tuple[str, ...]] = {item_id: normalize_words(name) for item_id, name in items.items()}
+
+        self.id_trie: dict[str, Any] = {'ids': [], 'next': {}} # Every node keeps the IDs of its subtree
+        self.char_index: dict[str, set[str]] = {} # char: ids, used for queries shorter than 3 characters
+        self.ngram_index: dict[str, set[str]] = {} # trigram of the lowercase name: ids
+        self.word_index: dict[str, set[str]] = {} # padded trigram of a name word: words
+        self.word_ids: dict[str, set[str]] = {} # word: ids
+        self.trigrams_words: dict[str, frozenset[str]] = {}
+
+        for item_id in self.names:
+            node = self.id_trie
+            node['ids'].append(item_id)
+            for char in item_id:
+                node = node['next'].setdefault(char, {'ids': [], 'next': {}})
+                node['ids'].append(item_id)
+
+            lower_name = self.lower_names[item_id]
+            for char in set(lower_name):
+                self.char_index.setdefault(char, set()).add(item_id)
+            for i in range(len(lower_name) - 2):
+                self.ngram_index.setdefault(lower_name[i:i + 3], set()).add(item_id)
+
+            for word in self.name_words[item_id]:
+                self.word_ids.setdefault(word, set()).add(item_id)
+                if word in self.trigrams_words:
+                    continue
+                self.trigrams_words[word] = word_trigrams(word)
+                for trigram in self.trigrams_words[word]:
+                    self.word_index.setdefault(trigram, set()).add(word)
+
+    def match_id_prefix(self, prefix: str) -> list[str]:
+        """
+        Get the IDs that start with the provided prefix.
+            :param prefix: The prefix of the IDs.
+            :return: A list of the IDs starting with the prefix.
+        """
+        node = self.id_trie
+        for char in prefix:
+            node = node['next'].get(char)
+            if node is None:
+                return []
+        return node['ids']
+
+    def match_substring(self, query: str) -> set[str]:
+        """
+        Get the IDs whose lowercase name contains the provided lowercase query.
+            :param query: The lowercase text to search in the names.
+            :return: A set of the IDs whose name contains the query.
+        """
+        if len(query) < 3:
+            postings = [self.char_index.get(char, set()) for char in set(query)]
+        else:
+            postings = [self.ngram_index.get(query[i:i + 3], set()) for i in range(len(query) - 2)]
+        if not postings:
+            return set()
+
+        candidates = set.intersection(*sorted(postings, key=len))
+        return {item_id for item_id in candidates if query in self.lower_names[item_id]} # Verify the candidates sharing all the n-grams
+
+    def match_fuzzy(self, query: str) -> dict[str, float]:
+        """
+        Get the IDs whose name words are similar to the words of the query (typo tolerant).
+            :param query: The text to search in the names.
+            :return: A dictionary of IDs and their similarity with the query (0 to 1).
+        """
+        query_words = [word for word in normalize_words(query) if len(word) >= 3]
+        if not query_words:
+            return {}
+
+        scores: dict[str, float] = {}
+        for query_word in query_words:
+            query_trigrams = word_trigrams(query_word)
+            candidate_words = set[str]().union(*(self.word_index.get(trigram, set()) for trigram in query_trigrams))
+            best_word_scores: dict[str, float] = {}
+            for word in candidate_words:
+                word_trigrams_set = self.trigrams_words[word]
+                similarity = 2 * len(query_trigrams & word_trigrams_set) / (len(query_trigrams) + len(word_trigrams_set)) # Dice coefficient
+                if similarity < elixir_search_min_similarity: # Few shared trigrams, but it can still be a short typo (e.g. swapped letters)
+                    max_typos = 1 if len(query_word) <= 5 else 2
+                    typos = typo_distance(query_word, word, max_typos)
+                    if typos <= max_typos:
+                        similarity = max(similarity, 1 - typos / max(len(query_word), len(word)))
+                for item_id in self.word_ids[word]:
+                    best_word_scores[item_id] = max(best_word_scores.get(item_id, 0.0), similarity)
+            for item_id, similarity in best_word_scores.items():
+                scores[item_id] = scores.get(item_id, 0.0) + similarity / len(query_words)
+
+        return {item_id: score for item_id, score in scores.items() if score >= elixir_search_min_similarity}
+
+    def search(self, query: str, limit: Optional[int] = None) -> dict[str, str]:
+        """
+        Search items by ID or name, the results are ranked: exact matches, prefixes, word prefixes, substrings and then similar names.
+            :param query: The ID or (part of the) name to search.
+            :param limit: The maximum number of results, None to return all of them.
+            :return: A dictionary of the matching item IDs and names, in ranking order.
+        """
+        query = query.strip()
+        lower_query = query.lower()
+        if not query:
+            return {}
+
+        ranks: dict[str, tuple[int, float]] = {}
+        def rank(item_id: str, tier: int, similarity: float = 1.0):
+            if item_id not in ranks or (tier, -similarity) < ranks[item_id]:
+                ranks[item_id] = (tier, -similarity)
+
+        for item_id in self.match_id_prefix(query):
+            rank(item_id, 0 if item_id == query else 1)
+
+        for item_id in self.match_substring(lower_query):
+            lower_name = self.lower_names[item_id]
+            if lower_name == lower_query:
+                rank(item_id, 0)
+            elif lower_name.startswith(lower_query):
+                rank(item_id, 1)
+            elif any(word.startswith(lower_query) for word in self.name_words[item_id]):
+                rank(item_id, 2)
+            else:
+                rank(item_id, 3)
+
+        for item_id, similarity in self.match_fuzzy(query).items():
+            rank(item_id, 4, similarity)
+
+        ranked = sorted(ranks, key=lambda item_id: (ranks[item_id], len(self.names[item_id]), self.names[item_id]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return {item_id: self.names[item_id] for item_id in ranked}
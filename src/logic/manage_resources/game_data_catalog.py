@@ -0,0 +1,243 @@
+import json, os, threading, time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from logic.logs import add_log
+from logic.manage_resources.elixir_search_index import ElixirSearchIndex
+from logic.manage_resources.compiled_data import load_compiled_data
+from config.config import reduced_item_names, data_check_interval
+
+@dataclass(frozen=True)
+class SpotData:
+    """
+    Immutable data of a hunting spot loaded from the data file.
+    """
+    name: str
+    spot_id_icon: str
+    loot: Mapping[str, str] # id: name
+    no_market_items: tuple[str, ...]
+
+def freeze_data(value: Any) -> Any:
+    """
+    Convert a parsed JSON value into an immutable equivalent (dicts to read-only mappings and lists to tuples).
+        :param value: The value to convert.
+        :return: The immutable value.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze_data(val) for key, val in value.items()}) # type: ignore
+    if isinstance(value, list):
+        return tuple(freeze_data(val) for val in value) # type: ignore
+    return value
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Immutable indexes of a loaded data file, replaced as a whole when the file is reloaded so a reader never mixes two versions.
+    """
+    data: Mapping[str, Any]
+    spots: Mapping[str, SpotData]
+    item_names: Mapping[str, str] # id: name
+    reduced_names: Mapping[str, str] # id: reduced name (as shown in the sessions)
+    icon_ids: Mapping[str, str] # spot name: icon id
+    item_categories: Mapping[str, frozenset[str]] # id: categories
+    category_items: Mapping[str, Mapping[str, str]] # category: id: name
+    elixir_index: ElixirSearchIndex
+    mtime: Optional[float] = None # Modification time of the data file, None if it was not loaded
+
+def build_snapshot(data: dict[str, Any], mtime: Optional[float] = None) -> CatalogSnapshot:
+    """
+    Build the immutable indexes from the parsed data file.
+        :param data: The parsed content of the data file.
+        :param mtime: The modification time of the data file.
+        :return: The snapshot of the data file.
+    """
+    frozen_data: Mapping[str, Any] = freeze_data(data)
+
+    spots: dict[str, SpotData] = {}
+    item_names: dict[str, str] = {}
+    item_categories: dict[str, set[str]] = {}
+    category_items: dict[str, dict[str, str]] = {}
+
+    for spot_name, spot in frozen_data.get('spots', {}).items():
+        spots[spot_name] = SpotData(
+            spot_name,
+            spot.get('spot_id_icon', ''),
+            spot.get('loot', MappingProxyType({})),
+            spot.get('no_market_items', ())
+        )
+        for item_id, item_name in spots[spot_name].loot.items():
+            item_names[item_id] = item_name
+            item_categories.setdefault(item_id, set()).add('loot')
+            category_items.setdefault('loot', {})[item_id] = item_name
+
+    for category, items in frozen_data.items(): # Flat sections (id: name) are categories of items
+        if category == 'spots' or not isinstance(items, Mapping):
+            continue
+        category_items[category] = {}
+        for item_id, item_name in items.items():
+            if not isinstance(item_name, str):
+                continue
+            item_names.setdefault(item_id, item_name)
+            item_categories.setdefault(item_id, set()).add(category)
+            category_items[category][item_id] = item_name
+
+    frozen_category_items = MappingProxyType({category: MappingProxyType(items) for category, items in category_items.items()})
+    return CatalogSnapshot(
+        data=frozen_data,
+        spots=MappingProxyType(spots),
+        item_names=MappingProxyType(item_names),
+        reduced_names=MappingProxyType({item_id: reduced_item_names.get(name, name) for item_id, name in item_names.items()}),
+        icon_ids=MappingProxyType({spot_name: spot.spot_id_icon for spot_name, spot in spots.items()}),
+        item_categories=MappingProxyType({item_id: frozenset(categories) for item_id, categories in item_categories.items()}),
+        category_items=frozen_category_items,
+        elixir_index=ElixirSearchIndex(frozen_category_items.get('elixir_perfume_names_ids', MappingProxyType({}))),
+        mtime=mtime
+    )
+
+class GameDataCatalog:
+    """
+    A singleton class that parses the game data file once and keeps it in an immutable, indexed snapshot.
+    The modification time of the data file is checked at most every data_check_interval seconds and the file is only parsed
+    again when it changes. A reload builds a new snapshot and swaps it with a single assignment, so every getter reads one version.
+    """
+    instance = None
+
+    def __init__(self, data_path: str, compiled_path: Optional[str] = None):
+        """
+        Initialize the GameDataCatalog and load the data file.
+            :param data_path: The path to the game data JSON file.
+            :param compiled_path: The path to the compiled form of the data file, used instead of the JSON when it is up to date.
+        """
+        if GameDataCatalog.instance is not None:
+            raise Exception("GameDataCatalog is a singleton!")
+        GameDataCatalog.instance = self
+
+        self.data_path = data_path
+        self.compiled_path = compiled_path
+        self.snapshot = build_snapshot({})
+        self.next_check = 0.0 # Monotonic time of the next check of the modification time
+        self.lock = threading.Lock() # Only one reload at a time, readers use the current snapshot without locking
+        self.load()
+
+    @property
+    def mtime(self) -> Optional[float]:
+        """
+        Get the modification time of the loaded data file.
+            :return: The modification time, or None if the data file was not loaded.
+        """
+        return self.snapshot.mtime
+
+    def load(self) -> bool:
+        """
+        Load the data file (from its compiled form if it is up to date) and replace the snapshot with its indexes.
+        If the file can not be read, the previously loaded data is kept.
+            :return: True if the data file was loaded successfully, False otherwise.
+        """
+        with self.lock:
+            try:
+                mtime = os.path.getmtime(self.data_path)
+                data = load_compiled_data(self.data_path, self.compiled_path) if self.compiled_path else None
+                if data is None: # No compiled data or outdated, parse the JSON file
+                    with open(self.data_path, 'r', encoding='utf-8') as file:
+                        data = json.load(file)
+                else:
+                    add_log(f"Loaded compiled data file '{self.compiled_path}'.", "debug")
+            except FileNotFoundError:
+                add_log(f"Data file not found: '{self.data_path}'.", "error")
+                return False
+            except json.JSONDecodeError:
+                add_log(f"Error decoding JSON in data file: '{self.data_path}'.", "error")
+                return False
+
+            snapshot = build_snapshot(data, mtime)
+            self.snapshot = snapshot # Single assignment, readers see the old or the new snapshot
+        add_log(f"Game data catalog loaded from '{self.data_path}' ({len(snapshot.spots)} spots, {len(snapshot.item_names)} items).", "info")
+        return True
+
+    def get_snapshot(self) -> CatalogSnapshot:
+        """
+        Get the current snapshot, reloading the data file first if its modification time changed since it was loaded.
+        The modification time is checked at most every data_check_interval seconds.
+            :return: The snapshot of the loaded data file.
+        """
+        now = time.monotonic()
+        if now >= self.next_check:
+            self.next_check = now + data_check_interval
+            try:
+                mtime = os.path.getmtime(self.data_path)
+            except OSError:
+                return self.snapshot # Keep the loaded data if the file is not reachable
+            if mtime != self.snapshot.mtime:
+                add_log(f"Data file '{self.data_path}' modified, reloading game data catalog.", "info")
+                self.load()
+        return self.snapshot
+
+    def get_value(self, data_name: str) -> Any:
+        """
+        Get a top level value of the data file.
+            :param data_name: The name of the data to fetch.
+            :return: The immutable value of the specified data, or None if not found.
+        """
+        return self.get_snapshot().data.get(data_name, None)
+
+    def get_spot(self, spot_name: str) -> Optional[SpotData]:
+        """
+        Get the data of a hunting spot.
+            :param spot_name: The name of the hunting spot.
+            :return: The data of the hunting spot, or None if not found.
+        """
+        return self.get_snapshot().spots.get(spot_name)
+
+    def get_spot_names(self) -> list[str]:
+        """
+        Get the names of all the hunting spots in the order of the data file.
+            :return: A list with the names of the hunting spots.
+        """
+        return list(self.get_snapshot().spots)
+
+    def get_item_name(self, item_id: str, reduced: bool = False) -> Optional[str]:
+        """
+        Get the name of an item by its ID.
+            :param item_id: The ID of the item.
+            :param reduced: True to get the reduced name of the item (as shown in the sessions).
+            :return: The name of the item, or None if not found.
+        """
+        snapshot = self.get_snapshot()
+        return snapshot.reduced_names.get(item_id) if reduced else snapshot.item_names.get(item_id)
+
+    def get_category_items(self, category: str) -> Mapping[str, str]:
+        """
+        Get the items that belong to a category (a flat section of the data file or 'loot').
+            :param category: The name of the category.
+            :return: A read-only mapping of item IDs and names of the category.
+        """
+        return self.get_snapshot().category_items.get(category, MappingProxyType({}))
+
+    def search_elixirs(self, query: str, limit: Optional[int] = None) -> dict[str, str]:
+        """
+        Search elixirs and perfumes by ID or name using the search index built when the data was loaded.
+            :param query: The ID or (part of the) name to search.
+            :param limit: The maximum number of results, None to return all of them.
+            :return: A dictionary of the matching elixir IDs and names, ranked from best to worst match.
+        """
+        return self.get_snapshot().elixir_index.search(query, limit)
+
+    def is_item_in_category(self, item_id: str, category: str) -> bool:
+        """
+        Check if an item belongs to a category.
+            :param item_id: The ID of the item.
+            :param category: The name of the category.
+            :return: True if the item belongs to the category, False otherwise.
+        """
+        return category in self.get_snapshot().item_categories.get(item_id, frozenset())
+
+    @staticmethod
+    def get_instance() -> "GameDataCatalog":
+        """
+        Get the singleton instance of the GameDataCatalog class.
+            :return: The singleton instance of GameDataCatalog.
+        """
+        if GameDataCatalog.instance is None:
+            raise Exception("GameDataCatalog instance not created. Call GameDataCatalog first.")
+        return GameDataCatalog.instance
@@ -1,4 +1,5 @@
-import sys, os, json
+import sys, os, threading
+from typing import Any
 
 from logic.logs import add_log
 from config.config import (
@@ -8,9 +9,14 @@ from config.config import (
     res_abs_paths, 
     saved_sessions_folder,
     user_settings_folder,
-    sql_db_folder
+    sql_db_folder,
+    compiled_data_file,
+    required_resources
 )
-from logic.manage_resources.access_resources import get_app_resource
+from logic.manage_resources.access_resources import get_app_resource, resource_exists
+from logic.manage_resources.game_data_catalog import GameDataCatalog
+from logic.manage_resources.settings_store import SettingsStore
+from logic.startup_profiler import profile_phase
 
 def check_all_fields_exist_settings() -> bool:
     """
@@ -18,28 +24,42 @@ def check_all_fields_exist_settings() -> bool:
         :return: True if all fields exist or were added successfully, False otherwise.
     """
     f_name = os.path.basename(settings_json)
-    missing_fields = False
-    try:
-        with open(settings_json, 'r', encoding='utf-8') as file:
-            settings_data = json.load(file)
-
-        for field, val in default_settings.items():
-            if field not in settings_data:
-                missing_fields = True
-                add_log(f"Adding missing field '{field}' to '{f_name}'", "warning")
-                settings_data[field] = val
+    settings_store = SettingsStore.get_instance()
+    if not settings_store.load():
+        add_log(f"Error checking fields in '{f_name}', could not be loaded.", "error")
+        return False
 
-        if missing_fields:
-            with open(settings_json, 'w', encoding='utf-8') as outfile:
-                json.dump(settings_data, outfile, indent=4)
-                add_log(f"Added missing fields to '{f_name}'", "warning")
+    settings_data = settings_store.get_all()
+    missing_fields: dict[str, Any] = {}
+    for field, val in default_settings.items():
+        if field not in settings_data:
+            add_log(f"Adding missing field '{field}' to '{f_name}'", "warning")
+            missing_fields[field] = val
 
-    except Exception as e:
-        add_log(f"Error checking fields in '{f_name}': {e}", "error")
-        return False
+    if missing_fields:
+        if not settings_store.update(missing_fields):
+            return False
+        add_log(f"Added missing fields to '{f_name}'", "warning")
 
     return True
 
+def check_optional_resources():
+    """
+    Check the existence of the resources that are not required to start (icons and images), logging the missing ones.
+    """
+    for key, res_path in res_list.items():
+        if key not in required_resources and not resource_exists(key):
+            add_log(f"Resource {res_path} not found, it will be shown as not found.", "warning")
+
+def start_resources_check() -> threading.Thread:
+    """
+    Start a background thread to check the existence of the optional resources, so startup does not wait for it.
+        :return: The started daemon thread.
+    """
+    thread = threading.Thread(target=check_optional_resources, name="CheckResources", daemon=True)
+    thread.start()
+    return thread
+
 def startup_resources() -> bool:
     """
     Prepare the resources for the application by copying necessary files
@@ -49,29 +69,36 @@ def startup_resources() -> bool:
     """
     global res_abs_paths
 
-    os.makedirs(saved_sessions_folder, exist_ok=True)
-    os.makedirs(user_settings_folder, exist_ok=True)
-    os.makedirs(sql_db_folder, exist_ok=True)
+    with profile_phase("Directories creation"):
+        os.makedirs(saved_sessions_folder, exist_ok=True)
+        os.makedirs(user_settings_folder, exist_ok=True)
+        os.makedirs(sql_db_folder, exist_ok=True)
 
-    if not os.path.exists(settings_json): #  Check if the settings JSON file exists
-        add_log(f"Settings file {settings_json} not found, creating a new one.", "info")
-        try:
-            with open(settings_json, 'w', encoding='utf-8') as settings_file:
-                json.dump(default_settings, settings_file, indent=4)  # Create a default settings JSON file
-        except Exception as e:
-            add_log(f"Failed to create settings file: {e}", "error")
+    with profile_phase("Settings validation"):
+        settings_store = SettingsStore(settings_json)
+        if not os.path.exists(settings_json): #  Check if the settings JSON file exists
+            add_log(f"Settings file {settings_json} not found, creating a new one.", "info")
+            if not settings_store.replace_all(default_settings):  # Create a default settings JSON file
+                add_log(f"Failed to create settings file {settings_json}.", "error")
+                return False
+        elif not check_all_fields_exist_settings():
+            add_log(f"Missing fields in {os.path.basename(settings_json)}, could not be restored.", "error")
             return False
-    elif not check_all_fields_exist_settings():
-        add_log(f"Missing fields in {os.path.basename(settings_json)}, could not be restored.", "error")
-        return False
 
-    is_dev_mode = not hasattr(sys, '_MEIPASS') # Check if running in development mode
-    for key, res_path in res_list.items():
-        res_src = get_app_resource(res_path)
-        res_abs_paths[key] = res_src
+    with profile_phase(f"Resource existence checks ({len(required_resources)} required resources)"):
+        for key, res_path in res_list.items():
+            res_abs_paths[key] = get_app_resource(res_path)
+
+        is_dev_mode = not hasattr(sys, '_MEIPASS') # Check if running in development mode
+        for key in required_resources:
+            if not resource_exists(key):
+                add_log(f"Resource {res_list[key]} not found, exiting.", "error") if is_dev_mode else add_log(f"Resource {res_list[key]} not found in MEIPASS, exiting.", "error")
+                return False
+        start_resources_check()
 
-        if not os.path.exists(res_src):
-            add_log(f"Resource {res_path} not found, exiting.", "error") if is_dev_mode else add_log(f"Resource {res_path} not found in MEIPASS, exiting.", "error")
+    with profile_phase("Game data catalog load"):
+        if GameDataCatalog(res_abs_paths['data'], get_app_resource(compiled_data_file)).mtime is None: # Data file could not be loaded
+            add_log(f"Failed to load game data from {res_abs_paths['data']}, exiting.", "error")
             return False
 
     return True
@@ -0,0 +1,243 @@
+import copy, json, os, stat, tempfile, threading, time
+from typing import Any, Callable, Optional, TypeVar
+
+from logic.logs import add_log
+from config.config import settings_check_interval
+
+T = TypeVar("T")
+
+class SettingsStore:
+    """
+    A singleton class that keeps the user settings parsed in memory.
+    The modification time of the settings file is checked at most every settings_check_interval seconds and the file is only parsed
+    again when it changes, so reading a setting is a dict lookup. Writes are saved atomically (temporary file + os.replace).
+    The listeners are notified of the settings changed by every write and by every external edit of the file.
+    """
+    instance = None
+
+    def __init__(self, settings_path: str):
+        """
+        Initialize the SettingsStore, the settings file is loaded on first access.
+            :param settings_path: The path to the settings JSON file.
+        """
+        if SettingsStore.instance is not None:
+            raise Exception("SettingsStore is a singleton!")
+        SettingsStore.instance = self
+
+        self.settings_path = settings_path
+        self.settings: dict[str, Any] = {}
+        self.mtime: Optional[float] = None
+        self.changed: dict[str, Any] = {} # Settings changed since the last write
+        self.next_check = 0.0 # Monotonic time of the next check of the modification time
+        self.listeners: list[Callable[[dict[str, Any]], None]] = [] # Called with the changed settings (name: new value, None if removed)
+        self.lock = threading.RLock()
+
+    def load(self) -> bool:
+        """
+        Parse the settings file and keep its content in memory, notifying the listeners of the values changed by an external edit.
+        If the file can not be read, the previously loaded settings are kept.
+            :return: True if the settings file was loaded successfully, False otherwise.
+        """
+        with self.lock:
+            first_load = self.mtime is None
+            try:
+                mtime = os.path.getmtime(self.settings_path)
+                with open(self.settings_path, 'r', encoding='utf-8') as file:
+                    settings = json.load(file)
+            except FileNotFoundError:
+                add_log(f"Settings file not found: '{self.settings_path}'.", "error")
+                return False
+            except json.JSONDecodeError:
+                add_log(f"Error decoding JSON in settings file: '{self.settings_path}'.", "error")
+                return False
+
+            if not isinstance(settings, dict):
+                add_log(f"Invalid content in settings file: '{self.settings_path}'.", "error")
+                return False
+
+            changed = {} if first_load else {
+                setting: settings.get(setting) for setting in self.settings.keys() | settings.keys() if self.settings.get(setting) != settings.get(setting)
+            }
+            self.settings = settings
+            self.mtime = mtime
+
+        self.notify(changed)
+        return True
+
+    def refresh(self, force: bool = False):
+        """
+        Reload the settings file only if its modification time changed since it was loaded or written.
+            :param force: Whether to check the modification time even if it was checked less than settings_check_interval seconds ago.
+        """
+        now = time.monotonic()
+        if not force and now < self.next_check:
+            return # Checked recently, the settings in memory are used
+        with self.lock:
+            self.next_check = now + settings_check_interval
+            try:
+                mtime = os.path.getmtime(self.settings_path)
+            except OSError:
+                return # Keep the settings in memory if the file is not reachable
+            if mtime != self.mtime and not self.changed:
+                self.load()
+
+    def get(self, setting: str, default: Any = None) -> Any:
+        """
+        Get a specific setting.
+            :param setting: The name of the setting to fetch.
+            :param default: The value returned if the setting does not exist.
+            :return: The value of the setting, or the default value if not found.
+        """
+        self.refresh()
+        return self.settings.get(setting, default)
+
+    def get_typed(self, setting: str, value_type: type[T], default: Optional[T] = None) -> Optional[T]:
+        """
+        Get a specific setting checking its type.
+            :param setting: The name of the setting to fetch.
+            :param value_type: The expected type of the setting.
+            :param default: The value returned if the setting does not exist or has another type.
+            :return: The value of the setting, or the default value if not found or invalid.
+        """
+        value = self.get(setting, None)
+        if isinstance(value, bool) and value_type is not bool: # bool is a subclass of int, do not accept it as a number
+            return default
+        if not isinstance(value, value_type):
+            if value is not None:
+                add_log(f"Setting '{setting}' has an invalid type ({type(value).__name__}), expected {value_type.__name__}.", "warning")
+            return default
+        return value
+
+    def get_all(self) -> dict[str, Any]:
+        """
+        Get all the settings.
+            :return: A copy of the dictionary with all the settings.
+        """
+        self.refresh()
+        return copy.deepcopy(self.settings) # Nested settings (elixirs) must not be modified outside the store
+
+    def set(self, setting: str, value: Any) -> bool:
+        """
+        Change a setting, the settings file is written at once.
+            :param setting: The name of the setting to change.
+            :param value: The new value of the setting.
+            :return: True if the setting was saved successfully, False otherwise.
+        """
+        return self.update({setting: value})
+
+    def update(self, new_settings: dict[str, Any]) -> bool:
+        """
+        Change several settings at once, the settings file is written at once.
+            :param new_settings: A dictionary with the settings to change.
+            :return: True if the settings were saved successfully, False otherwise.
+        """
+        with self.lock:
+            self.refresh(force=True) # Do not overwrite the changes made to the file by other programs
+            for setting, value in new_settings.items():
+                if setting in self.settings and self.settings[setting] == value:
+                    continue # No change needed if the value is already set
+                self.settings[setting] = copy.deepcopy(value)
+                self.changed[setting] = value
+            return self.flush()
+
+    def replace_all(self, new_settings: dict[str, Any]) -> bool:
+        """
+        Replace all the settings, the settings file is written at once.
+            :param new_settings: A dictionary with all the new settings.
+            :return: True if the settings were saved successfully, False otherwise.
+        """
+        with self.lock:
+            for setting in self.settings:
+                if setting not in new_settings:
+                    self.changed[setting] = None # Removed setting
+            for setting, value in new_settings.items():
+                if setting not in self.settings or self.settings[setting] != value:
+                    self.changed[setting] = value
+            self.settings = copy.deepcopy(new_settings)
+            self.mtime = None # Force the write even if there are no changed values
+            return self.flush()
+
+    def get_file_mode(self) -> int:
+        """
+        Get the permissions the settings file must keep when it is replaced.
+            :return: The permissions of the current settings file, or the default ones of new files if it does not exist.
+        """
+        try:
+            return stat.S_IMODE(os.stat(self.settings_path).st_mode)
+        except OSError:
+            umask = os.umask(0) # The umask can only be read by setting it
+            os.umask(umask)
+            return 0o666 & ~umask
+
+    def flush(self) -> bool:
+        """
+        Write the settings to a temporary file and atomically replace the settings file with it.
+            :return: True if the settings file is up to date, False if there was an error writing it.
+        """
+        with self.lock:
+            if not self.changed and self.mtime is not None:
+                return True
+
+            folder = os.path.dirname(self.settings_path) or '.'
+            try:
+                fd, tmp_path = tempfile.mkstemp(prefix='.settings_', suffix='.tmp', dir=folder)
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                        json.dump(self.settings, file, indent=4)
+                    os.chmod(tmp_path, self.get_file_mode()) # Temporary files are created readable only by the owner, keep the mode of the settings file
+                    os.replace(tmp_path, self.settings_path)
+                except Exception:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+                self.mtime = os.path.getmtime(self.settings_path)
+            except Exception as e:
+                add_log(f"Error saving settings in '{self.settings_path}': {e}", "error")
+                return False
+
+            changed, self.changed = self.changed, {}
+
+        self.notify(changed)
+        return True
+
+    def add_listener(self, callback: Callable[[dict[str, Any]], None]):
+        """
+        Register a function to call when settings change, in the thread that writes or reloads them.
+            :param callback: Function called with a dictionary of the changed settings and their new values (None if removed).
+        """
+        with self.lock:
+            self.listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[dict[str, Any]], None]):
+        """
+        Unregister a function registered with add_listener.
+            :param callback: The function to unregister.
+        """
+        with self.lock:
+            if callback in self.listeners:
+                self.listeners.remove(callback)
+
+    def notify(self, changed: dict[str, Any]):
+        """
+        Call the listeners with the changed settings, an error of a listener is logged and does not stop the others.
+            :param changed: A dictionary of the changed settings and their new values.
+        """
+        if not changed:
+            return
+        with self.lock:
+            listeners = list(self.listeners)
+        for callback in listeners:
+            try:
+                callback(dict(changed))
+            except Exception as e:
+                add_log(f"Error notifying the change of settings {sorted(changed)}: {e}", "error")
+
+    @staticmethod
+    def get_instance() -> "SettingsStore":
+        """
+        Get the singleton instance of the SettingsStore class.
+            :return: The singleton instance of SettingsStore.
+        """
+        if SettingsStore.instance is None:
+            raise Exception("SettingsStore instance not created. Call SettingsStore first.")
+        return SettingsStore.instance
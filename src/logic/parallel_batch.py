@@ -0,0 +1,74 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import replace
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional
+
+from logic.startup import setup_all
+from logic.manage_resources.game_data_catalog import GameDataCatalog
+from logic.headless_calculator import calculate_session_record, get_spot_prices
+from logic.data_classes.price_context import PriceContext
+from config.config import batch_chunk_size, batch_max_pending_chunks
+
+Chunk = list[tuple[int, Any]] # (position in the file, session record)
+
+worker_context: Optional[PriceContext] = None # Price context of the worker process, set once by its initializer
+
+def init_batch_worker(context: PriceContext):
+    """
+    Initialize a worker process of the parallel batch, loading the game data and the price context once.
+        :param context: The price context of the sessions, the loot prices of the spots are loaded from the price cache by every worker.
+    """
+    global worker_context
+    if GameDataCatalog.instance is None and not setup_all(): # Processes started with spawn (Windows) do not inherit the loaded data
+        raise RuntimeError("Resources could not be loaded in the batch worker process.")
+    worker_context = context
+
+def calculate_chunk(chunk: Chunk) -> list[dict[str, Any]]:
+    """
+    Calculate the results of a chunk of session records in a worker process.
+        :param chunk: The session records and their positions in the file.
+        :return: The results of the sessions, in the order of the chunk.
+    """
+    assert worker_context is not None, "The batch worker must be initialized with init_batch_worker."
+    return [calculate_session_record(record, index, worker_context) for index, record in chunk]
+
+def get_chunks(records: Iterable[Any], chunk_size: int) -> Iterator[Chunk]:
+    """
+    Split the session records in consecutive chunks, so the same file is always split the same way.
+        :param records: The session records.
+        :param chunk_size: The number of records of every chunk (the last one can be smaller).
+        :return: An iterator over the chunks.
+    """
+    numbered = enumerate(records, start=1)
+    while chunk := list(islice(numbered, chunk_size)):
+        yield chunk
+
+def calculate_session_records(records: Iterable[Any], context: PriceContext, workers: int = 1, chunk_size: int = batch_chunk_size) -> Iterator[dict[str, Any]]:
+    """
+    Calculate the results of session records, splitting them across worker processes when more than one is requested.
+    The results are returned in the order of the records while the next chunks are still being calculated.
+        :param records: The session records (e.g. read by read_session_records).
+        :param context: The price context of the sessions.
+        :param workers: The number of worker processes, 1 to calculate them in this process.
+        :param chunk_size: The number of records sent at once to a worker.
+        :return: An iterator over the results of the sessions.
+    """
+    if workers <= 1:
+        for index, record in enumerate(records, start=1):
+            yield calculate_session_record(record, index, context)
+        return
+
+    chunk_context = replace(context, fetch=False, spots={}) # Outdated prices are only fetched by this process
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker, initargs=(chunk_context,)) as executor:
+        pending: deque[Future[list[dict[str, Any]]]] = deque()
+        for chunk in get_chunks(records, chunk_size):
+            if context.fetch: # Cache the prices of the spots of the chunk before the workers read them
+                for _, record in chunk:
+                    if isinstance(record, dict):
+                        get_spot_prices(context, str(record.get("spot") or "").strip())
+            pending.append(executor.submit(calculate_chunk, chunk))
+            if len(pending) >= workers * batch_max_pending_chunks:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,55 @@
+from logic.logs import add_log
+from logic.api.api_connection import make_api_requests_regions
+from logic.manage_resources.access_resources import get_spot_loot
+from logic.sql_items_data.sql_db_connection import check_cached_data, update_cached_data
+from logic.data_classes.region_price_matrix import RegionPriceMatrix
+from config.config import FlatDict, reduced_item_names
+
+def get_regions_price_matrix(spot_name: str, regions: list[str]) -> tuple[bool, RegionPriceMatrix]:
+    """
+    Get the prices of the loot of a hunting spot in several regions at the same time.
+    Cached prices are used when they are up to date, the outdated ones of every region are fetched in one batch.
+        :param spot_name: The name of the hunting spot.
+        :param regions: The regions to get the prices for.
+        :return: A tuple containing a boolean indicating if all prices were retrieved, and the price matrix with the prices retrieved.
+    """
+    loot_items = get_spot_loot(spot_name)
+    matrix = RegionPriceMatrix(
+        spot_name, 
+        regions, 
+        {item_id: reduced_item_names.get(name, name) for item_id, name in loot_items.items()}
+    )
+    if not loot_items:
+        add_log(f"Error fetching loot for spot '{spot_name}'.", "error")
+        return (False, matrix)
+
+    outdated_regions: dict[str, dict[str, str]] = {}
+    cached_regions: dict[str, FlatDict] = {}
+    for region in regions:
+        outdated_items, cached_regions[region] = check_cached_data(loot_items, region)
+        if outdated_items:
+            outdated_regions[region] = outdated_items
+
+    all_fetched = True
+    fetched_regions: dict[str, FlatDict] = {}
+    if outdated_regions:
+        all_fetched, fetched_regions = make_api_requests_regions(outdated_regions)
+        for region, fetched_items in fetched_regions.items():
+            update_cached_data({
+                "items": fetched_items, 
+                "elixirs": {}, 
+                "lightstones": {}, 
+                "imperfect_lightstones": {}, 
+                "black_stone_cost": {}
+            }, region) # Cache whatever was fetched so it does not start from scratch next time
+    else:
+        add_log(f"No outdated data found for regions {regions}, using cached data.", "info")
+
+    for item_id in loot_items:
+        matrix.prices[item_id] = {}
+        for region in regions:
+            price_item = fetched_regions.get(region, {}).get(item_id) or cached_regions[region].get(item_id)
+            if price_item is not None:
+                matrix.prices[item_id][region] = price_item[1]
+
+    return (all_fetched, matrix)
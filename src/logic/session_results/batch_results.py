@@ -0,0 +1,574 @@
+from dataclasses import dataclass, field, replace
+from typing import Any, Optional
+
+import numpy as np
+
+from config.config import (
+    n_fragment_exchange,
+    n_black_stone_exchange,
+    n_sharp_exchange_concentrate,
+    n_black_gem_concentrate_gem_exchange,
+    n_sharp_exchange_concentrate_gem,
+    n_damaged_hide_exchange,
+    n_usable_hide_exchange,
+    n_supreme_exchange,
+    n_breath_of_narcion_exchange,
+    n_supreme_hide_scroll,
+    n_magical_lightstone_exchange,
+    n_magical_lightstones_scroll,
+    n_remnants_of_mystic_beasts_exchange,
+    n_scrolls_lighstone,
+    n_wildspark_exchange,
+    n_fragment_wildspark_exchange,
+    n_usable_hide_damaged_exchange,
+    n_damaged_hide_usable_exchange,
+    scroll_lightstone_ids,
+    value_pack_multiplier,
+    extra_profit_multiplier
+)
+from logic.logs import add_log
+from logic.exchange_calculator import max_ratio_numerator, max_ratio_denominator
+from logic.data_classes.session_results import SessionResultsData
+from logic.data_classes.recipe import RecipePlan
+from logic.data_classes.session_input import (
+    parse_number,
+    get_item_category,
+    stone_names,
+    category_stone,
+    category_head,
+    category_head_product,
+    category_green_head,
+    category_yellow_head,
+    category_special_yellow_head
+)
+from logic.session_results.recipe_graph import RecipeGraph, build_recipes, get_purchase_costs
+from logic.session_results.calculate_results_session import CalculateResultsSession
+
+stone_actions = [ # Actions of the scalar engine, their index is the action code
+    "",
+    "No Action",
+    "Black Gem Fragments + Concentrated Black Stone",
+    "Black Gem Fragments + Sharps",
+    "Black Gem + Concentrated Black Stone",
+    "Black Gem + Sharps",
+    "Concentrated Black Gem + Concentrated Black Stone",
+    "Concentrated Black Gem + Sharps"
+]
+
+Arrays = dict[str, np.ndarray]
+
+overflow_margin = 1 << 10 # Growth allowed to the values of a row by the exchanges (e.g. 70 remnants per breath of narcion) and the sums of the calculations
+int64_limit = int(np.iinfo(np.int64).max) // overflow_margin # Bound of (highest price or cost) * (sum of amounts) of a row of the batch
+
+def exceeds_int64_limit(highest_value: Any, n_units: int) -> Any:
+    """
+    Check whether the results of rows of a batch could overflow int64.
+        :param highest_value: The highest price or cost of the rows, an integer or an array of floats (one per row).
+        :param n_units: The sum of the amounts of the session, plus its hours and 1.
+        :return: True (or an array of bools) where highest_value * n_units exceeds int64_limit.
+    """
+    return highest_value * n_units > int64_limit
+
+@dataclass
+class SessionBatch:
+    """
+    Data class to hold N sessions with the same items as arrays (one row per session), so their input is only parsed once.
+    The amounts of 'Breath of Narcion Previous' are already added to 'Breath of Narcion', as the scalar engine does.
+    """
+    item_names: list[str]
+    prices: np.ndarray # (N, items) int64
+    amounts: np.ndarray # (N, items) int64
+    hours: np.ndarray # (N,) int64
+    elixirs_cost_h: np.ndarray # (N,) int64, cost of the elixirs per hour
+    value_pack_val: np.ndarray # (N,) float64, value pack and extra profit multiplier
+    market_tax: np.ndarray # (N,) float64
+    auto_calculate_best_profit: np.ndarray # (N,) bool
+    black_stone_cost: np.ndarray # (N,) int64
+    lightstone_ids: list[str]
+    lightstone_names: list[str]
+    lightstone_costs: np.ndarray # (N, lightstones) int64
+    imperfect_lightstone_cost: np.ndarray # (N,) int64, cost of the cheapest imperfect lightstone
+    valid: np.ndarray # (N,) bool, False if an input is not a number (the scalar engine returns -1) or the row can overflow
+    overflow: np.ndarray # (N,) bool, True if the results of the row can overflow int64, its values are not stored and it must be calculated by the scalar engine
+
+    def __len__(self) -> int:
+        return len(self.hours)
+
+    def with_prices(self, prices: np.ndarray) -> "SessionBatch":
+        """
+        Get a batch of the first session of this batch under N price vectors (e.g. to re-value a session or for what-if analysis).
+        The bound of build_session_batch is checked again with every price vector, the rows that exceed it are marked as overflow (and invalid) and their prices are not stored.
+            :param prices: The prices of the items, (N, items) array of integers or rounded floats in the order of item_names.
+            :return: A batch with N rows, the same session with every price vector.
+        """
+        prices = np.asarray(prices)
+        n_rows = prices.shape[0]
+        def repeat(values: np.ndarray) -> np.ndarray:
+            return np.repeat(values[:1], n_rows, axis=0)
+
+        highest_cost = max(int(self.lightstone_costs[0].max(initial=0)), int(self.imperfect_lightstone_cost[0]), int(self.black_stone_cost[0]), int(self.elixirs_cost_h[0]), 1)
+        highest_value = np.maximum(np.abs(prices.astype(np.float64)).max(axis=1, initial=0), highest_cost) # Checked as floats, the prices may not fit in int64
+        overflow = self.overflow[0] | exceeds_int64_limit(highest_value, int(self.amounts[0].sum()) + int(self.hours[0]) + 1)
+
+        return replace(
+            self,
+            prices=np.where(overflow[:, None], 0, prices).astype(np.int64),
+            amounts=repeat(self.amounts),
+            hours=repeat(self.hours),
+            elixirs_cost_h=repeat(self.elixirs_cost_h),
+            value_pack_val=repeat(self.value_pack_val),
+            market_tax=repeat(self.market_tax),
+            auto_calculate_best_profit=repeat(self.auto_calculate_best_profit),
+            black_stone_cost=repeat(self.black_stone_cost),
+            lightstone_costs=repeat(self.lightstone_costs),
+            imperfect_lightstone_cost=repeat(self.imperfect_lightstone_cost),
+            valid=self.valid[0] & ~overflow,
+            overflow=overflow
+        )
+
+@dataclass
+class BatchResults:
+    """
+    Data class to hold the results of a batch of sessions, one value per session.
+    The actions are codes of action_labels ('' if the best profit is not calculated automatically).
+    """
+    total: np.ndarray
+    total_h: np.ndarray
+    taxed: np.ndarray
+    taxed_h: np.ndarray
+    elixirs_cost: np.ndarray
+    action_codes: np.ndarray
+    valid: np.ndarray
+    action_labels: list[str] = field(default_factory=lambda: list(stone_actions))
+
+    @property
+    def actions(self) -> list[str]:
+        """
+        Get the action for the user of every session.
+            :return: A list with the action of every session.
+        """
+        return [self.action_labels[code] for code in self.action_codes]
+
+    def get_action_code(self, action: str) -> int:
+        """
+        Get the code of an action, adding it to the labels if it is new (optimized plans).
+            :param action: The action for the user.
+            :return: The code of the action.
+        """
+        if action not in self.action_labels:
+            self.action_labels.append(action)
+        return self.action_labels.index(action)
+
+def build_session_batch(sessions: list[SessionResultsData]) -> SessionBatch:
+    """
+    Parse sessions with the same items into a batch of arrays.
+    Rows whose highest price or cost times the sum of their amounts exceeds int64_limit are marked as overflow (and invalid), as their results could wrap.
+        :param sessions: The sessions to parse, all of them must have the same items in the same order.
+        :return: The batch of the sessions.
+        :raise ValueError: If the sessions do not have the same items.
+    """
+    item_names = [name for name in sessions[0].data_input if name != 'Hours']
+    lightstone_ids = list(sessions[0].lightstone_costs)
+    lightstone_names = [name for name, _ in sessions[0].lightstone_costs.values()]
+    n_rows, n_items = len(sessions), len(item_names)
+
+    prices = np.zeros((n_rows, n_items), dtype=np.int64)
+    amounts = np.zeros((n_rows, n_items), dtype=np.int64)
+    hours = np.zeros(n_rows, dtype=np.int64)
+    elixirs_cost_h = np.zeros(n_rows, dtype=np.int64)
+    lightstone_costs = np.zeros((n_rows, len(lightstone_ids)), dtype=np.int64)
+    imperfect_lightstone_cost = np.zeros(n_rows, dtype=np.int64)
+    black_stone_cost = np.zeros(n_rows, dtype=np.int64)
+    valid = np.ones(n_rows, dtype=bool)
+    overflow = np.zeros(n_rows, dtype=bool)
+
+    breath = item_names.index('Breath of Narcion') if 'Breath of Narcion' in item_names else None
+    breath_previous = item_names.index('Breath of Narcion Previous') if 'Breath of Narcion Previous' in item_names else None
+    for row, session in enumerate(sessions):
+        if [name for name in session.data_input if name != 'Hours'] != item_names:
+            raise ValueError("All the sessions of a batch must have the same items.")
+
+        row_prices = [parse_number(session.data_input[name][0]) for name in item_names]
+        row_amounts = [parse_number(session.data_input[name][1]) for name in item_names]
+        hours_text = session.data_input.get('Hours', ("", "0"))[1] or "0"
+        elixirs_text = session.elixirs_cost.replace(',', '').replace(' ', '')
+        if None in row_prices or None in row_amounts or not hours_text.isdigit() or not elixirs_text.isdigit():
+            valid[row] = False
+            continue
+
+        row_lightstone_costs = [session.lightstone_costs[lightstone_id][1] for lightstone_id in lightstone_ids]
+        row_imperfect_lightstone_cost = min((cost for _, cost in session.imperfect_lightstone_costs.values()), default=0)
+        row_black_stone_cost = [cost for name, cost in session.black_stone_cost.values() if name == 'Black Stone'][0]
+        highest_value = max(*row_prices, *row_lightstone_costs, row_imperfect_lightstone_cost, row_black_stone_cost, int(elixirs_text), 1) # type: ignore
+        if exceeds_int64_limit(highest_value, sum(row_amounts) + int(hours_text) + 1): # type: ignore
+            valid[row], overflow[row] = False, True
+            continue
+
+        prices[row], amounts[row] = row_prices, row_amounts
+        hours[row], elixirs_cost_h[row] = int(hours_text), int(elixirs_text)
+        lightstone_costs[row] = row_lightstone_costs
+        imperfect_lightstone_cost[row] = row_imperfect_lightstone_cost
+        black_stone_cost[row] = row_black_stone_cost
+
+    if breath is not None and breath_previous is not None: # Add previous breath of narcion to actual breath of narcion
+        amounts[:, breath] += amounts[:, breath_previous]
+        amounts[:, breath_previous] = 0
+
+    return SessionBatch(
+        item_names=item_names,
+        prices=prices,
+        amounts=amounts,
+        hours=hours,
+        elixirs_cost_h=elixirs_cost_h,
+        value_pack_val=np.array([(value_pack_multiplier if session.value_pack else 0) + (extra_profit_multiplier if session.extra_profit else 0) for session in sessions], dtype=np.float64),
+        market_tax=np.array([session.market_tax for session in sessions], dtype=np.float64),
+        auto_calculate_best_profit=np.array([session.auto_calculate_best_profit for session in sessions], dtype=bool),
+        black_stone_cost=black_stone_cost,
+        lightstone_ids=lightstone_ids,
+        lightstone_names=lightstone_names,
+        lightstone_costs=lightstone_costs,
+        imperfect_lightstone_cost=imperfect_lightstone_cost,
+        valid=valid,
+        overflow=overflow
+    )
+
+def exchange_results_array(green: np.ndarray, blue: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized version of exchange_results: exchange blue resources to green ones while (green + 60) / (blue - 30) is in [0, 1.2).
+        :param green: The initial amounts of green resources.
+        :param blue: The initial amounts of blue resources.
+        :return: The final amounts of green and blue resources.
+    """
+    green_next, blue_next = green + n_damaged_hide_usable_exchange, blue - n_usable_hide_damaged_exchange
+    step = max_ratio_denominator * n_damaged_hide_usable_exchange + max_ratio_numerator * n_usable_hide_damaged_exchange
+    n_exchanges = np.select(
+        [
+            (blue_next > 0) & (green_next >= 0),
+            (blue_next < 0) & (green_next <= 0) & (max_ratio_denominator * green_next > max_ratio_numerator * blue_next)
+        ],
+        [
+            np.maximum(0, -((max_ratio_denominator * green_next - max_ratio_numerator * blue_next) // step)),
+            -green_next // n_damaged_hide_usable_exchange + 1
+        ],
+        0
+    )
+    return (green + n_exchanges * n_damaged_hide_usable_exchange, blue - n_exchanges * n_usable_hide_damaged_exchange)
+
+class BatchCalculator:
+    """
+    Class to calculate the results of a batch of sessions with NumPy, matching the results of CalculateResultsSession.
+    The fixed exchange chains are vectorized, the exchange optimizer (a small integer program) is solved per session when enabled.
+    """
+    def __init__(self, batch: SessionBatch, optimize: bool = True):
+        """
+        Initialize the BatchCalculator with the provided batch.
+            :param batch: The batch of sessions.
+            :param optimize: True to also use the exchange optimizer (as the scalar engine), False to only use the fixed exchange chains (faster).
+        """
+        self.batch = batch
+        self.optimize = optimize
+        self.columns = {name: column for column, name in enumerate(batch.item_names)}
+        self.categories = {name: get_item_category(name) for name in batch.item_names} # Category flags of the items, as the scalar engine
+
+    def price(self, name: str) -> np.ndarray:
+        return self.batch.prices[:, self.columns[name]]
+
+    def amount(self, name: str) -> np.ndarray:
+        return self.batch.amounts[:, self.columns[name]]
+
+    def calculate(self) -> BatchResults:
+        """
+        Calculate the results of every session of the batch.
+            :return: The results of the batch.
+        """
+        batch = self.batch
+        n_rows = len(batch)
+        has_hours = batch.valid & (batch.hours > 0)
+        hours = np.where(has_hours, batch.hours, 1) # Avoid dividing by 0, the results without hours are 0
+        elixirs_cost_h = np.where(has_hours, batch.elixirs_cost_h, 0)
+        total_elixirs_cost = elixirs_cost_h * batch.hours
+        results = BatchResults(
+            total=np.zeros(n_rows, dtype=np.int64),
+            total_h=np.zeros(n_rows, dtype=np.int64),
+            taxed=np.zeros(n_rows, dtype=np.int64),
+            taxed_h=np.zeros(n_rows, dtype=np.int64),
+            elixirs_cost=total_elixirs_cost,
+            action_codes=np.zeros(n_rows, dtype=np.int64),
+            valid=batch.valid.copy()
+        )
+
+        auto = batch.auto_calculate_best_profit & batch.valid
+        result = (batch.prices * batch.amounts).sum(axis=1) # Total without exchanges
+        stones_cost = np.zeros(n_rows, dtype=np.int64)
+        scrolls_cost = np.zeros(n_rows, dtype=np.int64)
+        if auto.any():
+            result_auto, stones_cost, scrolls_cost, action_codes = self.calculate_max_profit(results)
+            result = np.where(auto, result_auto, result)
+            stones_cost = np.where(auto, stones_cost, 0)
+            scrolls_cost = np.where(auto, scrolls_cost, 0)
+            results.action_codes = np.where(auto, action_codes, 0)
+
+        total_no_elixirs = np.where(has_hours, result, 0)
+        total_h = np.trunc(total_no_elixirs / hours).astype(np.int64)
+        taxed = total_no_elixirs * (1 - batch.market_tax)
+        taxed += taxed * batch.value_pack_val
+        taxed = np.trunc(taxed).astype(np.int64)
+        taxed_h = np.trunc(taxed / hours).astype(np.int64)
+        stones_cost_h = np.trunc(stones_cost / hours).astype(np.int64)
+        scrolls_cost_h = np.trunc(scrolls_cost / hours).astype(np.int64)
+
+        results.total = np.where(has_hours, total_no_elixirs - total_elixirs_cost - stones_cost - scrolls_cost, 0)
+        results.taxed = np.where(has_hours, taxed - total_elixirs_cost - stones_cost - scrolls_cost, 0)
+        results.total_h = np.where(has_hours, total_h - elixirs_cost_h - stones_cost_h - scrolls_cost_h, 0)
+        results.taxed_h = np.where(has_hours, taxed_h - elixirs_cost_h - stones_cost_h - scrolls_cost_h, 0)
+        return results
+
+    def calculate_max_profit(self, results: BatchResults) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate the maximum profit of every session as CalculateMaxProfit.
+            :param results: The results of the batch, used to register the actions of the optimized plans.
+            :return: The profit without costs, the cost of black stones, the cost of scrolls and the action code of every session.
+        """
+        n_rows = len(self.batch)
+        rest_columns = [column for name, column in self.columns.items() if not self.categories[name] & (category_stone | category_head | category_head_product)]
+        result = (self.batch.prices[:, rest_columns] * self.batch.amounts[:, rest_columns]).sum(axis=1)
+
+        if any(name in self.columns for name in stone_names):
+            stones_profit, stones_cost, action_codes = self.calculate_stones_best_profit(results)
+        else:
+            stones_profit, stones_cost, action_codes = (np.zeros(n_rows, dtype=np.int64), np.zeros(n_rows, dtype=np.int64), np.ones(n_rows, dtype=np.int64))
+
+        heads_profit, scrolls_cost = self.calculate_heads_best_profit()
+        return (result + stones_profit + heads_profit, stones_cost, scrolls_cost, action_codes)
+
+    def get_profit_sharps(self, stones: Arrays, black_stone_cost: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized version of CalculateMaxProfit.get_profit_sharps.
+            :param stones: A dictionary of the stone names and their amounts.
+            :param black_stone_cost: The cost of black stones used for the previous exchanges.
+            :return: The profit, whether concentrated black stones are more profitable than sharps and the cost of black stones.
+        """
+        price_sharp, price_conc_stone = self.price('S. Black Crystal Shard'), self.price('Conc. Mag. Black Stone')
+        result = self.price('Black Gem Frag.') * stones['Black Gem Frag.'] + self.price('Black Gem') * stones['Black Gem'] + self.price('Conc. Mag. Black Gem') * stones['Conc. Mag. Black Gem']
+
+        if n_sharp_exchange_concentrate > 0 and n_black_stone_exchange > 0:
+            amount_exchange = stones['S. Black Crystal Shard'] // n_sharp_exchange_concentrate
+            profit_concentrated_stone = amount_exchange * price_conc_stone + (amount_exchange % n_sharp_exchange_concentrate) * price_sharp
+            cost_concentrated_stone = amount_exchange * n_black_stone_exchange * self.batch.black_stone_cost
+        else:
+            profit_concentrated_stone = cost_concentrated_stone = np.zeros(len(self.batch), dtype=np.int64)
+
+        profit_sharps = price_sharp * stones['S. Black Crystal Shard']
+        concentrated = (profit_concentrated_stone - cost_concentrated_stone) > profit_sharps
+        result = result + np.where(concentrated, profit_concentrated_stone, profit_sharps)
+        return (result, concentrated, black_stone_cost + np.where(concentrated, cost_concentrated_stone, 0))
+
+    def calculate_stones_best_profit(self, results: BatchResults) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized version of CalculateMaxProfit.calculate_stones_best_profit.
+            :param results: The results of the batch, used to register the actions of the optimized plans.
+            :return: The profit of the stones, the cost of black stones and the action code of every session.
+        """
+        stones = {name: self.amount(name) for name in stone_names}
+        original_stones = dict(stones)
+        stones['Black Gem Frag.'] = stones['Black Gem Frag.'] + (stones['Wildspark'] // n_wildspark_exchange) * n_fragment_wildspark_exchange
+        stones['Wildspark'] = stones['Wildspark'] % n_wildspark_exchange
+
+        no_cost = np.zeros(len(self.batch), dtype=np.int64)
+        profit_fragments, action_fragments, cost_fragments = self.get_profit_sharps(stones, no_cost)
+
+        black_gem = dict(stones)
+        cost_exchange_black_gem = no_cost
+        if n_fragment_exchange > 0 and n_black_stone_exchange > 0:
+            amount_black_gem = stones['Black Gem Frag.'] // n_fragment_exchange
+            black_gem['Black Gem Frag.'] = stones['Black Gem Frag.'] % n_fragment_exchange
+            black_gem['Black Gem'] = stones['Black Gem'] + amount_black_gem
+            cost_exchange_black_gem = amount_black_gem * n_black_stone_exchange * self.batch.black_stone_cost
+        profit_black_gem, action_black_gem, cost_black_gem = self.get_profit_sharps(black_gem, cost_exchange_black_gem)
+
+        concentrated = dict(black_gem)
+        if n_black_gem_concentrate_gem_exchange > 0 and n_sharp_exchange_concentrate_gem > 0:
+            amount_concentrated = np.minimum(black_gem['Black Gem'] // n_black_gem_concentrate_gem_exchange, black_gem['S. Black Crystal Shard'] // n_sharp_exchange_concentrate_gem)
+            concentrated['Black Gem'] = black_gem['Black Gem'] - amount_concentrated * n_black_gem_concentrate_gem_exchange
+            concentrated['S. Black Crystal Shard'] = black_gem['S. Black Crystal Shard'] - amount_concentrated * n_sharp_exchange_concentrate_gem
+            concentrated['Conc. Mag. Black Gem'] = black_gem['Conc. Mag. Black Gem'] + amount_concentrated
+        profit_concentrated, action_concentrated, cost_concentrated = self.get_profit_sharps(concentrated, cost_exchange_black_gem)
+
+        net_fragments = profit_fragments - cost_fragments
+        net_black_gem = profit_black_gem - cost_black_gem
+        net_concentrated = profit_concentrated - cost_concentrated
+        max_profit = np.maximum(np.maximum(net_fragments, net_black_gem), net_concentrated)
+
+        is_fragments = max_profit == net_fragments # Ties keep the order of the scalar engine
+        is_black_gem = ~is_fragments & (max_profit == net_black_gem)
+        profit = np.select([max_profit <= 0, is_fragments, is_black_gem], [0, profit_fragments, profit_black_gem], profit_concentrated)
+        cost = np.select([max_profit <= 0, is_fragments, is_black_gem], [0, cost_fragments, cost_black_gem], cost_concentrated)
+        action_codes = np.select(
+            [max_profit <= 0, is_fragments, is_black_gem],
+            [1, np.where(action_fragments, 2, 3), np.where(action_black_gem, 4, 5)],
+            np.where(action_concentrated, 6, 7)
+        )
+
+        if self.optimize:
+            recipes = build_recipes({})
+            for row in np.flatnonzero(self.batch.auto_calculate_best_profit & self.batch.valid):
+                plan = self.optimize_row(row, recipes, list(stone_names), original_stones)
+                if plan is not None and plan.profit > max(max_profit[row], 0):
+                    profit[row], cost[row] = plan.value, plan.cost
+                    action_codes[row] = results.get_action_code("Optimized: " + ", ".join(f"{name} x{count:,}" for name, count in plan.crafts.items()) if plan.crafts else "No Action")
+        return (profit, cost, action_codes)
+
+    def get_profit_greens(self, heads: Arrays, name_green: str) -> np.ndarray:
+        return heads[name_green] * self.price(name_green) + self.price('Breath of Narcion') * heads['Breath of Narcion']
+
+    def get_profit_yellows(self, heads: Arrays, name_green: str, name_yellow: str, name_special_yellow: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized version of the normal and special yellow heads profits of CalculateMaxProfit.
+            :param heads: A dictionary of the heads items and their amounts.
+            :param name_green: The name of the green head.
+            :param name_yellow: The name of the yellow head.
+            :param name_special_yellow: The name of the special yellow head.
+            :return: The profit of exchanging yellow heads and the profit of also exchanging special yellow heads.
+        """
+        usable = heads['Usable Hide'] + heads['Supreme Hide'] * n_supreme_exchange
+        damaged, usable = exchange_results_array(heads['Damaged Hide'], usable)
+        n_yellow = np.minimum(np.minimum(damaged // n_damaged_hide_exchange, usable // n_usable_hide_exchange), heads[name_green])
+        yellows = {**heads, name_green: heads[name_green] - n_yellow}
+        profit_yellow = self.get_profit_greens(yellows, name_green) + self.price(name_yellow) * n_yellow
+
+        n_special_yellow = np.minimum(n_yellow, heads['Breath of Narcion'] // n_breath_of_narcion_exchange)
+        specials = {**yellows, 'Breath of Narcion': heads['Breath of Narcion'] - n_special_yellow * n_breath_of_narcion_exchange}
+        profit_special_yellow = self.get_profit_greens(specials, name_green) + self.price(name_yellow) * (n_yellow - n_special_yellow) + self.price(name_special_yellow) * n_special_yellow
+        return (profit_yellow, profit_special_yellow)
+
+    def calculate_heads_best_profit(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized version of CalculateMaxProfit.calculate_heads_best_profit.
+            :return: The profit of the heads and the cost of the scrolls crafted of every session.
+        """
+        head_columns = [name for name in self.columns if self.categories[name] & (category_head | category_head_product)]
+        name_green = next((name for name in head_columns if self.categories[name] & category_green_head), "")
+        name_yellow = next((name for name in head_columns if self.categories[name] & category_yellow_head), "")
+        name_special_yellow = next((name for name in head_columns if self.categories[name] & category_special_yellow_head), "")
+        heads = {name: self.amount(name) if self.categories[name] & category_head else np.zeros(len(self.batch), dtype=np.int64) for name in head_columns}
+
+        profit_green = self.get_profit_greens(heads, name_green)
+        profit_yellow, profit_special_yellow = self.get_profit_yellows(heads, name_green, name_yellow, name_special_yellow)
+        profit_scrolls, cost_scrolls = self.get_profit_scrolls(heads, name_green, name_yellow, name_special_yellow)
+
+        max_profit = np.maximum(np.maximum(profit_green, profit_yellow), np.maximum(profit_special_yellow, profit_scrolls))
+        is_scrolls = (max_profit != profit_green) & (max_profit != profit_yellow) & (max_profit != profit_special_yellow) # Ties keep the order of the scalar engine
+        cost = np.where(is_scrolls, cost_scrolls, 0)
+
+        if self.optimize:
+            recipes = build_recipes({'green_head': name_green, 'yellow_head': name_yellow, 'special_yellow_head': name_special_yellow})
+            for row in np.flatnonzero(self.batch.auto_calculate_best_profit & self.batch.valid):
+                plan = self.optimize_row(row, recipes, head_columns, heads)
+                if plan is not None and plan.profit > max_profit[row] - cost[row]:
+                    max_profit[row], cost[row] = plan.value, plan.cost
+        return (max_profit, cost)
+
+    def get_profit_scrolls(self, heads: Arrays, name_green: str, name_yellow: str, name_special_yellow: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized version of CalculateMaxProfit.get_profit_scrolls.
+            :param heads: A dictionary of the heads items and their amounts.
+            :param name_green: The name of the green head.
+            :param name_yellow: The name of the yellow head.
+            :param name_special_yellow: The name of the special yellow head.
+            :return: The profit of crafting the most profitable scroll (and exchanging the heads left) and the cost of the scrolls.
+        """
+        n_rows = len(self.batch)
+        breath = heads['Breath of Narcion']
+        has_breath = breath != 0
+        if not has_breath.any():
+            return (np.zeros(n_rows, dtype=np.int64), np.zeros(n_rows, dtype=np.int64))
+
+        scroll_names = list(scroll_lightstone_ids)
+        scroll_prices = np.stack([self.price(scroll) for scroll in scroll_names], axis=1)
+        scroll_lightstones = self.batch.lightstone_costs[:, [self.batch.lightstone_ids.index(lightstone_id) for lightstone_id in scroll_lightstone_ids.values()]]
+        best = np.argmax(scroll_prices - scroll_lightstones // n_scrolls_lighstone, axis=1) # First maximum, as the scalar engine (the order books are not used)
+        best_price = np.take_along_axis(scroll_prices, best[:, None], axis=1)[:, 0]
+        best_lightstone = np.take_along_axis(scroll_lightstones, best[:, None], axis=1)[:, 0]
+
+        n_scrolls = np.minimum(heads['Supreme Hide'] // n_supreme_hide_scroll, breath * n_remnants_of_mystic_beasts_exchange)
+        cost_magical_lightstones = -(-n_scrolls * n_magical_lightstones_scroll // n_magical_lightstone_exchange) * self.batch.imperfect_lightstone_cost
+        cost_remnants = np.ceil(self.price('Breath of Narcion') / n_remnants_of_mystic_beasts_exchange).astype(np.int64)
+        cost_scrolls = (best_lightstone // n_scrolls_lighstone + cost_remnants) * n_scrolls + cost_magical_lightstones
+        profit_scrolls = best_price * n_scrolls
+
+        breath_used = np.where(self.price('Breath of Narcion') != 0, np.ceil(n_scrolls / n_remnants_of_mystic_beasts_exchange).astype(np.int64), 0)
+        left = {**heads, 'Supreme Hide': heads['Supreme Hide'] - n_scrolls * n_supreme_hide_scroll, 'Breath of Narcion': breath - breath_used}
+        profit_green = self.get_profit_greens(left, name_green)
+        profit_yellow, profit_special_yellow = self.get_profit_yellows(left, name_green, name_yellow, name_special_yellow)
+        profit = np.maximum(np.maximum(profit_green, profit_yellow), profit_special_yellow) + profit_scrolls
+        return (np.where(has_breath, profit, 0), np.where(has_breath, cost_scrolls, 0))
+
+    def optimize_row(self, row: int, recipes: list[Any], item_names: list[str], amounts: Arrays) -> Optional[RecipePlan]:
+        """
+        Find the best exchanges of some items of a session with the recipe graph.
+            :param row: The session of the batch.
+            :param recipes: The recipes of the graph.
+            :param item_names: The names of the items to exchange.
+            :param amounts: A dictionary of the item names and their amounts.
+            :return: The best plan of exchanges, or None if it could not be calculated.
+        """
+        stock = {name: int(amounts[name][row]) for name in item_names}
+        prices = {name: int(self.price(name)[row]) for name in item_names}
+        purchase_costs = get_purchase_costs(
+            {name: int(cost) for name, cost in zip(self.batch.lightstone_names, self.batch.lightstone_costs[row])},
+            int(self.batch.imperfect_lightstone_cost[row]),
+            int(self.batch.black_stone_cost[row])
+        )
+        return RecipeGraph(recipes).optimize(stock, prices, purchase_costs)
+
+def calculate_scalar_results(session: SessionResultsData) -> dict[str, Any] | int:
+    """
+    Calculate the results of a session with the scalar engine, in the format of the batch results.
+        :param session: The session to calculate, it is not modified.
+        :return: The results of the session, or -1 if its input is not valid or an item is missing.
+    """
+    try:
+        results = CalculateResultsSession(replace(session, data_input=dict(session.data_input))).calculate_results_session()
+    except KeyError as e:
+        add_log(f"Missing item {e} in the session, its results can not be calculated.", "error")
+        return -1
+    if isinstance(results, int):
+        return results
+    return {key: value for key, value in results.items() if key not in ('new_labels_input_text', 'strategies')}
+
+def calculate_batch_results(sessions: list[SessionResultsData], optimize: bool = True) -> list[dict[str, Any] | int]:
+    """
+    Calculate the results of many sessions with the batch engine, sessions with the same items are calculated together.
+    The sessions whose results could overflow the int64 arrays are calculated by the scalar engine (Python integers) on a copy of their data.
+        :param sessions: The sessions to calculate.
+        :param optimize: True to also use the exchange optimizer (as the scalar engine), False to only use the fixed exchange chains (faster).
+        :return: The results of every session (as CalculateResultsSession without the labels), or -1 if its input is not valid or an item is missing.
+    """
+    groups: dict[tuple[Any, ...], list[int]] = {} # Sessions with the same items and mode
+    for index, session in enumerate(sessions):
+        groups.setdefault((session.auto_calculate_best_profit, *session.data_input), []).append(index)
+
+    all_results: list[dict[str, Any] | int] = [-1] * len(sessions)
+    for indexes in groups.values():
+        try:
+            batch = build_session_batch([sessions[index] for index in indexes])
+            results = BatchCalculator(batch, optimize).calculate()
+        except KeyError as e:
+            add_log(f"Missing item {e} in the sessions of the batch, their results can not be calculated.", "error")
+            continue
+        actions = results.actions
+        for row, index in enumerate(indexes):
+            if batch.overflow[row]:
+                all_results[index] = calculate_scalar_results(sessions[index])
+                continue
+            if not results.valid[row]:
+                continue
+            all_results[index] = {
+                'total': int(results.total[row]),
+                'total_h': int(results.total_h[row]),
+                'taxed': int(results.taxed[row]),
+                'taxed_h': int(results.taxed_h[row]),
+                'elixirs_cost': f"{int(results.elixirs_cost[row]):,}",
+                'action_user': actions[row]
+            }
+    return all_results
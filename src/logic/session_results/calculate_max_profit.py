@@ -1,5 +1,6 @@
-from typing import Any
+from typing import Any, Optional
 import math
+from dataclasses import replace
 
 from config.config import (
     n_fragment_exchange, 
@@ -12,23 +13,38 @@ from config.config import (
     n_supreme_exchange,
     n_breath_of_narcion_exchange,
     n_supreme_hide_scroll,
-    n_magical_lightstone_exchange,
-    n_magical_lightstones_scroll,
     n_remnants_of_mystic_beasts_exchange,
-    n_scrolls_lighstone,
+    n_wildspark_exchange,
+    n_fragment_wildspark_exchange,
+    scroll_lightstone_ids,
     FlatDictInt,
     FlatDict,
-    FlatDictStr,
+    OrderBooks,
     TupleContributions
 )
 from logic.exchange_calculator import exchange_results
+from logic.data_classes.recipe import RecipePlan
+from logic.data_classes.strategy_result import StrategyResult
+from logic.data_classes.session_input import (
+    SessionInput,
+    category_hours,
+    category_stone,
+    category_head,
+    category_head_product,
+    category_green_head,
+    category_yellow_head,
+    category_special_yellow_head
+)
+from logic.session_results.recipe_graph import RecipeGraph, build_recipes, get_purchase_costs
+from logic.session_results.incremental_results import SessionGroupCache
+from logic.session_results.scroll_sourcing import get_scroll_sourcing
 
 class CalculateMaxProfit:
     """
     Class to calculate the maximum profit from black gem fragments, black gems and concentrated black gems based on the provided stone data.
     """
     
-    def __init__(self, data_input: FlatDictStr, 
+    def __init__(self, session_input: SessionInput, 
                        lightstone_costs: FlatDict, 
                        imperfect_lightstone_costs: FlatDict, 
                        black_stone_cost: int, 
@@ -36,8 +52,10 @@ class CalculateMaxProfit:
                        value_pack_val: float, 
                        market_tax: float,
                        elixir_cost_session: int,
-                       elixirs_cost_h: int):
-        self.data_input = data_input  # Input data for the session
+                       elixirs_cost_h: int,
+                       group_cache: Optional[SessionGroupCache] = None,
+                       order_books: Optional[OrderBooks] = None):
+        self.session_input = session_input  # Parsed input of the session, the amounts calculated by the exchanges are set in it
         self.lightstone_costs = lightstone_costs  # Lightstone costs for the session
         self.imperfect_lightstone_costs = imperfect_lightstone_costs  # Imperfect lightstone costs for the session
         self.black_stone_price = black_stone_cost  # Black stone buy price for the session
@@ -46,6 +64,14 @@ class CalculateMaxProfit:
         self.market_tax = market_tax  # Market tax for the session
         self.elixir_cost_session = elixir_cost_session  # Elixir cost for the session
         self.elixirs_cost_h = elixirs_cost_h  # Elixir cost per hour for the session
+        self.group_cache = group_cache if group_cache is not None else SessionGroupCache()  # Last evaluation of the stones and heads, reused if their inputs did not change
+        self.order_books = order_books if order_books is not None else {}  # Sell listings of the lightstones and imperfect lightstones, used to source the scrolls
+
+        self.purchase_costs = get_purchase_costs(  # Items the exchange optimizer can buy
+            {name: cost for name, cost in self.lightstone_costs.values()},
+            min((cost for _, cost in self.imperfect_lightstone_costs.values()), default=None),
+            self.black_stone_price
+        )
 
     def calculate_max_profit(self) -> dict[str, Any]:
         """
@@ -56,28 +82,45 @@ class CalculateMaxProfit:
         gems: FlatDictInt = {}
         heads: FlatDictInt = {}
         contribution_to_total: dict[str, int] = {}
-        for name, (price, amount) in self.data_input.items():
-            if name == 'Hours':
+        for name, price, amount, category in zip(self.session_input.names, self.session_input.prices, self.session_input.amounts, self.session_input.categories):
+            if category & category_hours:
                 continue  # Skip the 'Hours' item as it is not relevant for profit calculation
-            elif name in ['Black Gem Frag.', 'Black Gem', 'Conc. Mag. Black Gem', 'S. Black Crystal Shard', 'Wildspark', 'Conc. Mag. Black Stone']:
-                gems[name] = (int(price.replace(',', '').replace(' ', '')) if price else 0, int(amount.replace(',', '').replace(' ', '')) if amount else 0)
-            elif name in ['Damaged Hide', 'Usable Hide', 'Supreme Hide', 'Breath of Narcion'] or name.startswith('St.'):
-                heads[name] = (int(price.replace(',', '').replace(' ', '')) if price else 0, int(amount.replace(',', '').replace(' ', '')) if amount else 0)
-            elif 'St.' in name or 'BMB' in name:
-                heads[name] = (int(price.replace(',', '').replace(' ', '')) if price else 0, 0)  # Set amount to 0 so previous calculations do not affect the profit calculation
+            elif category & category_stone:
+                gems[name] = (price, amount)
+            elif category & category_head:
+                heads[name] = (price, amount)
+            elif category & category_head_product:
+                heads[name] = (price, 0)  # Set amount to 0 so previous calculations do not affect the profit calculation
             else:
-                result_parcial = (int(price.replace(',', '').replace(' ', '')) if price else 0) * (int(amount.replace(',', '').replace(' ', '')) if amount else 0)  # Calculate the profit for each item
+                result_parcial = price * amount  # Calculate the profit for each item
                 contribution_to_total[name] = result_parcial  # Store the contribution of each item to the total profit
                 result += result_parcial
 
-        result_no_deducted, action_user, black_stone_cost = self.calculate_stones_best_profit(gems, contribution_to_total)  # Calculate the best profit from stones
+        purchase_costs_key = tuple(self.purchase_costs.items())
+        stones_key = (tuple(gems.items()), purchase_costs_key)
+        stones_evaluation = self.group_cache.get("stones", stones_key)
+        if stones_evaluation is None: # Stones changed since the last calculation
+            stones_contribution: dict[str, int] = {}
+            stones_evaluation = (*self.calculate_stones_best_profit(gems, stones_contribution), stones_contribution)  # Calculate the best profit from stones
+            self.group_cache.put("stones", stones_key, stones_evaluation)
+        result_no_deducted, action_user, black_stone_cost, stones_strategies, stones_contribution = stones_evaluation
+        contribution_to_total.update(stones_contribution)
         result += result_no_deducted  # Add the best profit from stones to the total result
 
-        self.data_input["Conc. Mag. Black Stone"] = ( # Update the input data with the maximum profit value for concentrated black stones
-            str(gems["Conc. Mag. Black Stone"][0]), 
-            str(int(contribution_to_total["Conc. Mag. Black Stone"] / gems["Conc. Mag. Black Stone"][0])) if action_user != "No Action" and contribution_to_total["Conc. Mag. Black Stone"] else "0"
+        self.session_input.set_amount( # Update the input data with the maximum profit value for concentrated black stones
+            "Conc. Mag. Black Stone",
+            int(contribution_to_total["Conc. Mag. Black Stone"] / gems["Conc. Mag. Black Stone"][0]) if action_user != "No Action" and contribution_to_total["Conc. Mag. Black Stone"] else 0
         )
-        result_heads, cost_scrolls = self.calculate_heads_best_profit(heads, contribution_to_total)  # Calculate the best profit from stones
+        order_books_key = tuple((item_id, tuple(levels)) for item_id, levels in self.order_books.items())
+        heads_key = (tuple(heads.items()), tuple(self.lightstone_costs.items()), tuple(self.imperfect_lightstone_costs.items()), purchase_costs_key, order_books_key)
+        heads_evaluation = self.group_cache.get("heads", heads_key)
+        if heads_evaluation is None: # Heads changed since the last calculation
+            heads_contribution: dict[str, int] = {}
+            heads_evaluation = (*self.calculate_heads_best_profit(heads, heads_contribution), heads_contribution)  # Calculate the best profit from heads
+            self.group_cache.put("heads", heads_key, heads_evaluation)
+        result_heads, cost_scrolls, heads_amounts, heads_strategies, heads_contribution = heads_evaluation
+        contribution_to_total.update(heads_contribution)
+        self.set_amounts(heads_amounts)  # Update the input data with the amounts of the selected exchanges
         result += result_heads
 
         new_labels = self.update_labels(result, contribution_to_total)
@@ -102,55 +145,82 @@ class CalculateMaxProfit:
             'taxed_h': total_taxed_h,
             'new_labels_input_text': new_labels,
             'elixirs_cost': str(f"{self.elixir_cost_session:,}"),
-            'action_user': action_user
+            'action_user': action_user,
+            'strategies': {'stones': stones_strategies, 'heads': heads_strategies}
         }
 
-    def calculate_stones_best_profit(self, stones_best_profit: FlatDictInt, contribution_to_total: dict[str, int]) -> tuple[int, str, int]:
+    def calculate_stones_best_profit(self, stones_best_profit: FlatDictInt, contribution_to_total: dict[str, int]) -> tuple[int, str, int, tuple[StrategyResult, ...]]:
         """
         Calculate the best profit from stones based on the provided stone data.
             :param stones_best_profit: A dictionary containing the stone data with their prices and amounts.
             :param contribution_to_total: A dictionary containing the contribution of each item to the total profit.
-            :return: The total best profit from the stones, action for the user to get that maximum profit and cost of black stones used for the maximum profit.
+            :return: The total best profit from the stones, action for the user to get that maximum profit, cost of black stones used for the maximum profit and every strategy evaluated (ranked).
         """
         if not stones_best_profit:
-            return (0, "No Action", 0)  # Return 0 profit and empty action if no stones are provided
+            return (0, "No Action", 0, ())  # Return 0 profit and empty action if no stones are provided
         
+        optimized_plan = self.optimize_exchanges(stones_best_profit, {})  # Best plan of the recipe graph, it can also exchange only part of the stones
         self.exchange_wildsparks(stones_best_profit)  # Exchange wildsparks to black gem fragments if auto calculate best profit is enabled
         contribution_to_total['Wildspark'] = stones_best_profit['Wildspark'][0] * stones_best_profit['Wildspark'][1]  # Add the contribution of Wildsparks to the total profit
 
-        profit_fragments, action_fragments, cost_black_stones_fragments, contribution_to_total_fragments = self.calculate_profit_fragments(stones_best_profit.copy())  # Calculate profit for each stone separately
-        profit_black_gem, action_black_gem, cost_black_stones_black_gem, contribution_to_total_black_gem = self.calc_profit_black_gem(stones_best_profit.copy())  # Calculate profit for black gems and concentrated black stones (if that is the max profit, otherwise sharps)
-        profit_conc_black_gem, action_concentrated, cost_black_stones_concentrated, contribution_to_total_concentrated = self.calc_profit_conc_black_gem(stones_best_profit.copy()) # Calculate profit for concentrated gems and concentrated black stones (if that is the max profit, otherwise sharps)
-        
-        profit_fragments_cost_applied = profit_fragments - cost_black_stones_fragments  # Add the profit from fragments to the total result and deduct the cost of black stones used for fragments
-        profit_black_gem_cost_applied = profit_black_gem - cost_black_stones_black_gem  # Add the
-        profit_conc_black_gem_cost_applied = profit_conc_black_gem - cost_black_stones_concentrated  # Add the profit from concentrated black gems to the total result and deduct the cost of black stones used for concentrated gems
-
-        max_profit = max(profit_fragments_cost_applied, profit_black_gem_cost_applied, profit_conc_black_gem_cost_applied)  # Get the maximum profit from all calculations
+        profit_fragments, action_fragments, cost_black_stones_fragments, contribution_to_total_fragments = self.calculate_profit_fragments(stones_best_profit)  # Calculate profit for each stone separately
+        profit_black_gem, action_black_gem, cost_black_stones_black_gem, contribution_to_total_black_gem = self.calc_profit_black_gem(stones_best_profit)  # Calculate profit for black gems and concentrated black stones (if that is the max profit, otherwise sharps)
+        profit_conc_black_gem, action_concentrated, cost_black_stones_concentrated, contribution_to_total_concentrated = self.calc_profit_conc_black_gem(stones_best_profit) # Calculate profit for concentrated gems and concentrated black stones (if that is the max profit, otherwise sharps)
+
+        strategies = [ # Strategies in the order of preference when their profits are the same
+            StrategyResult("Black Gem Fragments + " + ("Concentrated Black Stone" if action_fragments else "Sharps"), profit_fragments, cost_black_stones_fragments),
+            StrategyResult("Black Gem + " + ("Concentrated Black Stone" if action_black_gem else "Sharps"), profit_black_gem, cost_black_stones_black_gem),
+            StrategyResult("Concentrated Black Gem + " + ("Concentrated Black Stone" if action_concentrated else "Sharps"), profit_conc_black_gem, cost_black_stones_concentrated)
+        ]
+        contributions = [contribution_to_total_fragments, contribution_to_total_black_gem, contribution_to_total_concentrated]
+        max_profit = max(strategy.net for strategy in strategies)  # Get the maximum profit from all calculations
+
+        if optimized_plan is not None:
+            strategies.append(StrategyResult(self.get_optimized_action(optimized_plan), optimized_plan.value, optimized_plan.cost))
+            if optimized_plan.profit > max(max_profit, 0):  # Only used when it beats every fixed exchange chain
+                for name in stones_best_profit:
+                    contribution_to_total[name] = stones_best_profit[name][0] * optimized_plan.final_amounts.get(name, 0)
+                strategies[-1] = replace(strategies[-1], selected=True)
+                return (optimized_plan.value, strategies[-1].name, optimized_plan.cost, self.rank_strategies(strategies))
 
         if max_profit <= 0: # If no profit can be made, return 0 profit and empty action
-            return (0, "No Action", 0)
+            strategies.append(StrategyResult("No Action", 0, selected=True))
+            return (0, "No Action", 0, self.rank_strategies(strategies))
 
-        if max_profit == profit_fragments_cost_applied:
-            max_profit_action_user = "Black Gem Fragments + "
-            max_profit_action_user += "Concentrated Black Stone" if action_fragments else "Sharps"  # Add the action based on whether concentrated black stone profit is greater than sharps profit
+        best = next(i for i, strategy in enumerate(strategies) if strategy.net == max_profit)
+        strategies[best] = replace(strategies[best], selected=True)
+        contribution_to_total.update(contributions[best])  # Update the contribution to total profit with the contribution of the best strategy
+        return (strategies[best].profit, strategies[best].name, strategies[best].black_stone_cost, self.rank_strategies(strategies))
 
-            contribution_to_total.update(contribution_to_total_fragments)  # Update the contribution to total profit with fragments contribution
-            return (profit_fragments, max_profit_action_user, cost_black_stones_fragments)  # Return the maximum profit from fragments calculation
-        
-        elif max_profit == profit_black_gem_cost_applied:
-            max_profit_action_user = "Black Gem + "
-            max_profit_action_user += "Concentrated Black Stone" if action_black_gem else "Sharps"
+    def rank_strategies(self, strategies: list[StrategyResult]) -> tuple[StrategyResult, ...]:
+        """
+        Rank the strategies evaluated for a group of items by their net profit, setting the difference of each one to the best.
+            :param strategies: The strategies evaluated.
+            :return: The strategies from the most to the least profitable (the selected one first if several have the same profit).
+        """
+        ranked = sorted(strategies, key=lambda strategy: (-strategy.net, not strategy.selected))
+        return tuple(replace(strategy, delta=ranked[0].net - strategy.net) for strategy in ranked)
 
-            contribution_to_total.update(contribution_to_total_black_gem)  # Update the contribution to total profit with black gem contribution
-            return (profit_black_gem, max_profit_action_user, cost_black_stones_black_gem)  # Return the maximum profit from black gem calculation
-        
-        else:
-            max_profit_action_user = "Concentrated Black Gem + "
-            max_profit_action_user += "Concentrated Black Stone" if action_concentrated else "Sharps"
+    def optimize_exchanges(self, items: FlatDictInt, placeholders: dict[str, str]) -> Optional[RecipePlan]:
+        """
+        Find the best exchanges of the provided items with the recipe graph (recipes of the config).
+            :param items: A dictionary containing the items data with their prices and amounts.
+            :param placeholders: A dictionary of the placeholders of the recipes (e.g. '{green_head}') and the item names that replace them.
+            :return: The best plan of exchanges, or None if it could not be calculated.
+        """
+        stock = {name: amount for name, (_, amount) in items.items()}
+        prices = {name: price for name, (price, _) in items.items()}
+        return RecipeGraph(build_recipes(placeholders)).optimize(stock, prices, self.purchase_costs)
 
-            contribution_to_total.update(contribution_to_total_concentrated)  # Update the contribution to total profit with concentrated black gem contribution
-            return (profit_conc_black_gem, max_profit_action_user, cost_black_stones_concentrated)  # Return the maximum profit from sharp calculation
+    def get_optimized_action(self, plan: RecipePlan) -> str:
+        """
+        Get the action for the user to follow the optimized plan.
+            :param plan: The plan of exchanges.
+            :return: The exchanges of the plan and how many times each one is done.
+        """
+        if not plan.crafts:
+            return "No Action"
+        return "Optimized: " + ", ".join(f"{name} x{count:,}" for name, count in plan.crafts.items())
 
     def calculate_profit_fragments(self, data_gems_stones: FlatDictInt) -> TupleContributions:
         """
@@ -163,7 +233,7 @@ class CalculateMaxProfit:
     def calc_profit_black_gem(self, data_gems_stones: FlatDictInt) -> TupleContributions:
         """
         Calculate the profit from black gems and sharps based on the provided stone data.
-            :param data_gems_stones: A dictionary containing the stones and gems data with their prices and amounts.
+            :param data_gems_stones: A dictionary containing the stones and gems data with their prices and amounts, it is not modified.
             :return: The total profit from black gems, whether concentrated black stone profit is greater than sharps profit and specific amount of profits for each stone.
         """
         black_stone_cost = 0
@@ -171,14 +241,11 @@ class CalculateMaxProfit:
             amount_black_gem_exchange = data_gems_stones["Black Gem Frag."][1] // n_fragment_exchange  # Number of Black Gem Fragments that can be exchanged
             black_stone_exchange = amount_black_gem_exchange * n_black_stone_exchange  # Number of Black Stones needed for the exchange
 
-            data_gems_stones["Black Gem Frag."] = (
-                data_gems_stones["Black Gem Frag."][0], 
-                data_gems_stones["Black Gem Frag."][1] % n_fragment_exchange
-            )  # Remaining Black Gem Fragments after exchange
-            data_gems_stones["Black Gem"] = (
-                data_gems_stones["Black Gem"][0], 
-                data_gems_stones["Black Gem"][1] + amount_black_gem_exchange
-            )  # Update the tuple with the new amount of Black Gems
+            data_gems_stones = { # Amounts after the exchange, the provided data is shared with the other strategies
+                **data_gems_stones,
+                "Black Gem Frag.": (data_gems_stones["Black Gem Frag."][0], data_gems_stones["Black Gem Frag."][1] % n_fragment_exchange), # Remaining Black Gem Fragments after exchange
+                "Black Gem": (data_gems_stones["Black Gem"][0], data_gems_stones["Black Gem"][1] + amount_black_gem_exchange) # New amount of Black Gems
+            }
 
             black_stone_cost = black_stone_exchange * self.black_stone_price  # Black stone cost to deduct from the profit
 
@@ -187,43 +254,39 @@ class CalculateMaxProfit:
     def calc_profit_conc_black_gem(self, data_gems_stones: FlatDictInt) -> TupleContributions:
         """
         Calculate the profit from concentrated black gems and sharps based on the provided stone data.
-            :param data_gems_stones: A dictionary containing the stones and gems data with their prices and amounts.
+            :param data_gems_stones: A dictionary containing the stones and gems data with their prices and amounts, it is not modified.
             :return: The total profit from concentrated black gems, whether concentrated black stone profit is greater than sharps profit and specific amount of profits for each stone.
         """
+        n_fragments = data_gems_stones["Black Gem Frag."][1]
+        n_black_gem = data_gems_stones["Black Gem"][1]
+        n_sharps = data_gems_stones["S. Black Crystal Shard"][1]
+        n_concentrated_gem = data_gems_stones["Conc. Mag. Black Gem"][1]
+
         black_stone_cost = 0
         if n_fragment_exchange > 0 and n_black_stone_exchange > 0:
-            amount_black_gem_exchange = data_gems_stones["Black Gem Frag."][1] // n_fragment_exchange  # Number of Black Gem Fragments that can be exchanged
+            amount_black_gem_exchange = n_fragments // n_fragment_exchange  # Number of Black Gem Fragments that can be exchanged
             black_stone_exchange = amount_black_gem_exchange * n_black_stone_exchange  # Number of Black Stones needed for the exchange
 
-            data_gems_stones["Black Gem Frag."] = (
-                data_gems_stones["Black Gem Frag."][0], 
-                data_gems_stones["Black Gem Frag."][1] % n_fragment_exchange
-            )  # Remaining Black Gem Fragments after exchange
-            data_gems_stones["Black Gem"] = (
-                data_gems_stones["Black Gem"][0], 
-                data_gems_stones["Black Gem"][1] + amount_black_gem_exchange
-            )  # Number of Black Gems obtained from fragments
+            n_fragments %= n_fragment_exchange  # Remaining Black Gem Fragments after exchange
+            n_black_gem += amount_black_gem_exchange  # Number of Black Gems obtained from fragments
 
             black_stone_cost = black_stone_exchange * self.black_stone_price  # Subtract the cost of Black Stones used for exchange
 
         if n_black_gem_concentrate_gem_exchange > 0 and n_sharp_exchange_concentrate_gem > 0:
-            amount_concentrated_black_stone = min(data_gems_stones["Black Gem"][1] // n_black_gem_concentrate_gem_exchange, data_gems_stones["S. Black Crystal Shard"][1] // n_sharp_exchange_concentrate_gem)  # Number of Concentrated Magical Black Stone that can be exchanged
-
-            data_gems_stones["Black Gem"] = (
-                data_gems_stones["Black Gem"][0], 
-                data_gems_stones["Black Gem"][1] - amount_concentrated_black_stone * n_black_gem_concentrate_gem_exchange
-            )  # Remaining Black Gems after exchange
-            data_gems_stones["S. Black Crystal Shard"] = (
-                data_gems_stones["S. Black Crystal Shard"][0], 
-                data_gems_stones["S. Black Crystal Shard"][1] - amount_concentrated_black_stone * n_sharp_exchange_concentrate_gem
-            )  # Remaining Special Black Crystal Shards after exchange
-
-            data_gems_stones["Conc. Mag. Black Gem"] = (
-                data_gems_stones["Conc. Mag. Black Gem"][0], 
-                data_gems_stones["Conc. Mag. Black Gem"][1] + amount_concentrated_black_stone
-            ) # Add the number of Concentrated Magical Black Gems obtained from the exchange
-
-        return self.get_profit_sharps(data_gems_stones, black_stone_cost)  # Calculate profit from sharps and return the result adding it to current result
+            amount_concentrated_black_stone = min(n_black_gem // n_black_gem_concentrate_gem_exchange, n_sharps // n_sharp_exchange_concentrate_gem)  # Number of Concentrated Magical Black Stone that can be exchanged
+
+            n_black_gem -= amount_concentrated_black_stone * n_black_gem_concentrate_gem_exchange  # Remaining Black Gems after exchange
+            n_sharps -= amount_concentrated_black_stone * n_sharp_exchange_concentrate_gem  # Remaining Special Black Crystal Shards after exchange
+            n_concentrated_gem += amount_concentrated_black_stone  # Add the number of Concentrated Magical Black Gems obtained from the exchange
+
+        concentrated = { # Amounts after the exchanges, the provided data is shared with the other strategies
+            **data_gems_stones,
+            "Black Gem Frag.": (data_gems_stones["Black Gem Frag."][0], n_fragments),
+            "Black Gem": (data_gems_stones["Black Gem"][0], n_black_gem),
+            "S. Black Crystal Shard": (data_gems_stones["S. Black Crystal Shard"][0], n_sharps),
+            "Conc. Mag. Black Gem": (data_gems_stones["Conc. Mag. Black Gem"][0], n_concentrated_gem)
+        }
+        return self.get_profit_sharps(concentrated, black_stone_cost)  # Calculate profit from sharps and return the result adding it to current result
 
     def get_profit_sharps(self, gem_stones: FlatDictInt, black_stone_cost: int) -> TupleContributions:
         """
@@ -232,12 +295,10 @@ class CalculateMaxProfit:
             :param black_stone_cost: The cost of Black Stones used for the exchange.
             :return: The total profit from Sharps and Concentrated Magical Black Stones, whether concentrated black stone profit is greater than sharps profit and specific amount of profits for each stone.
         """
-        gem_stones_concentrated = gem_stones.copy()  # Create a copy of the gem stones data for concentrated black stone calculations
-
         profit_fragments = gem_stones["Black Gem Frag."][0] * gem_stones["Black Gem Frag."][1]  # Calculate profit from Black Gem Fragments
         profit_black_gem = gem_stones["Black Gem"][0] * gem_stones["Black Gem"][1]  # Calculate profit from Black Gems
         profit_concentrated_gem = gem_stones["Conc. Mag. Black Gem"][0] * gem_stones["Conc. Mag. Black Gem"][1]  # Calculate profit from Concentrated Magical Black Gems
-        profit_concentrated_stone, black_stone_cost_concentrated, profit_sharps = self.get_results_concentrated_black_stone(gem_stones_concentrated)  # Calculate profit from Sharps
+        profit_concentrated_stone, black_stone_cost_concentrated, profit_sharps = self.get_results_concentrated_black_stone(gem_stones)  # Calculate profit from Sharps
 
         contribution_to_total = {
             "Black Gem Frag.": profit_fragments,
@@ -270,9 +331,6 @@ class CalculateMaxProfit:
             black_stone_exchange = amount_exchange_concentrated * n_black_stone_exchange  # Number of Black Stones needed for the exchange
 
             amount_sharps = amount_exchange_concentrated % n_sharp_exchange_concentrate  # Remaining Special Black Crystal Shards after exchange
-            
-            data_gems_stones["Conc. Mag. Black Stone"] = (data_gems_stones["Conc. Mag. Black Stone"][0], data_gems_stones["Conc. Mag. Black Stone"][1] + amount_exchange_concentrated)  # Update the tuple with the new amount of Concentrated Magical Black Stones
-            data_gems_stones["S. Black Crystal Shard"] = (data_gems_stones["S. Black Crystal Shard"][0], amount_sharps)  # Update the tuple with the new amount of Special Black Crystal Shards
 
             return ((amount_exchange_concentrated * data_gems_stones["Conc. Mag. Black Stone"][0]) + (amount_sharps * data_gems_stones["S. Black Crystal Shard"][0]), (black_stone_exchange * self.black_stone_price), (amount_sharps * data_gems_stones["S. Black Crystal Shard"][0]))
         
@@ -286,9 +344,9 @@ class CalculateMaxProfit:
         wildspark = stones_best_profit['Wildspark'][1] # Get current wildspark value
         black_gem_fragment = stones_best_profit['Black Gem Frag.'][1]  # Get current black gem fragment value
 
-        n_exchanges = wildspark // 10 # 10 Wildsparks can be exchanged for 5 Black Gem Fragment
-        wildspark %= 10 # Remaining Wildsparks after exchange
-        black_gem_fragment += n_exchanges * 5
+        n_exchanges = wildspark // n_wildspark_exchange # 10 Wildsparks can be exchanged for 5 Black Gem Fragment
+        wildspark %= n_wildspark_exchange # Remaining Wildsparks after exchange
+        black_gem_fragment += n_exchanges * n_fragment_wildspark_exchange
 
         stones_best_profit['Black Gem Frag.'] = (stones_best_profit["Black Gem Frag."][0], black_gem_fragment) # Update Black Gem Fragment amount
         stones_best_profit['Wildspark'] = (stones_best_profit["Wildspark"][0], wildspark) # Update Wildspark amount
@@ -300,7 +358,7 @@ class CalculateMaxProfit:
             :param contribution_to_total: A dictionary containing the contribution of each item to the total profit.
         """
         new_labels: list[str] = []
-        for name, _ in self.data_input.items():
+        for name in self.session_input.names:
             if name == "Hours":
                 new_labels.append("Hours")  # Append "Hours" label as it is not a profit item
                 continue
@@ -323,61 +381,69 @@ class CalculateMaxProfit:
         taxed += taxed * self.value_pack_val  # Apply value pack multiplier
         return int(taxed)
     
-    def calculate_heads_best_profit(self, heads: FlatDictInt, contribution_to_total: dict[str, int]) -> tuple[int, int]:
+    def calculate_heads_best_profit(self, heads: FlatDictInt, contribution_to_total: dict[str, int]) -> tuple[int, int, dict[str, int], tuple[StrategyResult, ...]]:
         """
         Calculate the best profit from heads based on the provided heads data.
             :param heads: A dictionary containing the heads data with their prices and amounts.
             :param contribution_to_total: A dictionary containing the contribution of each item to the total profit.
-            :return: The total profit from heads.
+            :return: The total profit from heads, the cost of the scrolls crafted, the amounts of the heads after the selected exchanges and every strategy evaluated (ranked).
         """
-        name_yellow = ""
-        name_special_yellow = ""
-        name_green = ""
-
-        for item in heads:
-            if item.startswith('St.'):
-                name_green = item
-            elif item.startswith('M. St.'):
-                name_yellow = item
-            elif item.startswith('M. Sp. St.'):
-                name_special_yellow = item
+        name_green = self.session_input.get_name(category_green_head)
+        name_yellow = self.session_input.get_name(category_yellow_head)
+        name_special_yellow = self.session_input.get_name(category_special_yellow_head)
 
-        green_copy = heads.copy()  # Create a copy of the heads data for green head calculations
-        contribution_to_total_green = contribution_to_total.copy()  # Create a copy of the contribution to total profit for green heads
-        profit_green = self.get_profit_greens(green_copy, name_green, contribution_to_total_green)  # Calculate the profit from green heads
+        contribution_to_total_green: dict[str, int] = {}  # Contribution of the heads of every strategy, only the selected one is added to the total
+        profit_green = self.get_profit_greens(heads, name_green, contribution_to_total_green)  # Calculate the profit from green heads, no exchange so the heads are not modified
 
         yellows_copy = heads.copy()  # Create a copy of the heads data for further calculations
-        contribution_to_total_yellow = contribution_to_total.copy()  # Create a copy of the contribution to total profit for yellow heads
+        contribution_to_total_yellow: dict[str, int] = {}
         profit_yellow = self.get_profit_normal_yellow_head(yellows_copy, name_yellow, name_green, contribution_to_total_yellow)
 
         yellow_special_copy = yellows_copy.copy()  # Create a copy of the heads data for special yellow head calculations
-        contribution_to_total_special_yellow = contribution_to_total.copy()  # Create a copy of the contribution to total profit for special yellow heads
+        contribution_to_total_special_yellow: dict[str, int] = {}
         profit_special_yellow = self.get_profit_special_yellow_head(yellow_special_copy,name_green, name_yellow, name_special_yellow, contribution_to_total_special_yellow)
 
         scrolls_copy = heads.copy()  # Create a copy of the heads data for scrolls calculations
-        contribution_to_total_scrolls = contribution_to_total.copy()  # Create a copy of the contribution to total profit for scrolls
+        contribution_to_total_scrolls: dict[str, int] = {}
         profit_scrolls, cost_scrolls = self.get_profit_scrolls(scrolls_copy, contribution_to_total_scrolls, name_green, name_yellow, name_special_yellow)  # Calculate the profit from scrolls
 
-        max_profit = max(profit_green, profit_yellow, profit_special_yellow, profit_scrolls)  # Get the maximum profit from green, yellow and special yellow heads
-        cost = 0
-
-        heads_result: FlatDictStr = {}
-        if max_profit == profit_green:
-            heads_result = {name: (str(price), str(amount)) for name, (price, amount) in green_copy.items()}
-            contribution_to_total.update(contribution_to_total_green)  # Update the contribution to total profit with green heads contribution
-        elif max_profit == profit_yellow:
-            heads_result = {name: (str(price), str(amount)) for name, (price, amount) in yellows_copy.items()}
-            contribution_to_total.update(contribution_to_total_yellow)  # Update the contribution to total profit with yellow heads contribution
-        elif max_profit == profit_special_yellow:
-            heads_result = {name: (str(price), str(amount)) for name, (price, amount) in yellow_special_copy.items()}
-            contribution_to_total.update(contribution_to_total_special_yellow)  # Update the contribution to total profit with special yellow heads contribution
-        else:
-            cost = cost_scrolls
-            heads_result = {name: (str(price), str(amount)) for name, (price, amount) in scrolls_copy.items()}
-            contribution_to_total.update(contribution_to_total_scrolls)
-
-        self.data_input.update(heads_result)  # Update the contribution to total profit with green heads contribution
-        return (max_profit, cost)
+        strategies = [ # Strategies in the order of preference when their profits are the same
+            StrategyResult("Green Heads", profit_green),
+            StrategyResult("Yellow Heads", profit_yellow),
+            StrategyResult("Special Yellow Heads", profit_special_yellow),
+            StrategyResult("Scrolls", profit_scrolls, scrolls_cost=cost_scrolls)
+        ]
+        results = [(heads, contribution_to_total_green), (yellows_copy, contribution_to_total_yellow), (yellow_special_copy, contribution_to_total_special_yellow), (scrolls_copy, contribution_to_total_scrolls)]
+        if not heads.get('Breath of Narcion', (0, 0))[1]: # Scrolls need Breath of Narcion
+            strategies.pop()
+
+        max_profit = max(profit_green, profit_yellow, profit_special_yellow, profit_scrolls)  # The strategies are compared without the cost of the scrolls
+        best = next(i for i, strategy in enumerate(strategies) if strategy.profit == max_profit)
+        max_profit_cost_applied = strategies[best].net
+
+        optimized_plan = self.optimize_exchanges(heads, {'green_head': name_green, 'yellow_head': name_yellow, 'special_yellow_head': name_special_yellow})
+        if optimized_plan is not None:
+            strategies.append(StrategyResult(self.get_optimized_action(optimized_plan), optimized_plan.value, scrolls_cost=optimized_plan.cost))
+            if optimized_plan.profit > max_profit_cost_applied:  # Only used when it beats every fixed exchange chain
+                heads_result = {name: optimized_plan.final_amounts.get(name, 0) for name in heads}
+                contribution_to_total.update({name: price * optimized_plan.final_amounts.get(name, 0) for name, (price, _) in heads.items()})
+                strategies[-1] = replace(strategies[-1], selected=True)
+                return (optimized_plan.value, optimized_plan.cost, heads_result, self.rank_strategies(strategies))
+
+        strategies[best] = replace(strategies[best], selected=True)
+        heads_copy, contribution_to_total_best = results[best]
+        contribution_to_total.update(contribution_to_total_best)  # Update the contribution to total profit with the contribution of the best strategy
+        heads_result = {name: amount for name, (_, amount) in heads_copy.items()}
+        return (strategies[best].profit, strategies[best].scrolls_cost, heads_result, self.rank_strategies(strategies))
+
+    def set_amounts(self, amounts: dict[str, int]):
+        """
+        Set the amounts calculated by the exchanges in the session input.
+            :param amounts: A dictionary of the item names and their new amounts.
+        """
+        for name, amount in amounts.items():
+            if name in self.session_input.index: # Heads the spot does not have are not shown
+                self.session_input.set_amount(name, amount)
     
     def get_profit_greens(self, heads: FlatDictInt, name_green: str, contribution_to_total: dict[str, int]) -> int:
         """
@@ -465,77 +531,47 @@ class CalculateMaxProfit:
         if n_breath_of_narcion == 0:
             return 0, 0
 
-        most_profitable_scroll = self.get_most_profitable_scroll(heads)
-        n_scrolls = heads['Supreme Hide'][1] // n_supreme_hide_scroll
-        max_profit_scroll = most_profitable_scroll[1][0] # Maximum profit from the most profitable scroll
-
-        # Calculate how many scrolls can be crafted
-        n_imperfect_lightstones_scroll = math.ceil(n_magical_lightstones_scroll / n_magical_lightstone_exchange)
-        lowest_cost_imperfects = min(v[1] for v in self.imperfect_lightstone_costs.values())
-
-        cost_magical_lightstones_scroll = n_imperfect_lightstones_scroll * lowest_cost_imperfects  # Cost of magical lightstones per scroll
-        cost_lightstone_scroll = most_profitable_scroll[1][1] // n_scrolls_lighstone # Cost of lightstone per scroll
-        breath_of_narcion_cost = int(heads['Breath of Narcion'][0])  # Breath of Narcion cost
-
-        n_max_scrolls = n_breath_of_narcion * n_remnants_of_mystic_beasts_exchange
-        if n_max_scrolls < n_scrolls:
-            n_scrolls = n_max_scrolls
-
-        cost_remnants_scroll = math.ceil(breath_of_narcion_cost / n_remnants_of_mystic_beasts_exchange) # Cost of remnants of mystic beasts per scroll
-        cost_scrolls = (cost_lightstone_scroll + cost_magical_lightstones_scroll + cost_remnants_scroll) * n_scrolls  # Total cost of scrolls crafted
+        n_scrolls = min(heads['Supreme Hide'][1] // n_supreme_hide_scroll, n_breath_of_narcion * n_remnants_of_mystic_beasts_exchange)  # Calculate how many scrolls can be crafted
+        sourcing = get_scroll_sourcing( # Most profitable scroll and cheapest inputs to craft it
+            {scroll: heads[scroll][0] for scroll in scroll_lightstone_ids},
+            n_scrolls,
+            self.lightstone_costs,
+            self.imperfect_lightstone_costs,
+            int(heads['Breath of Narcion'][0]),
+            self.order_books
+        )
+        cost_scrolls = sourcing.cost  # Total cost of scrolls crafted
 
         # Total profit from scrolls crafted
-        profit_scrolls = max_profit_scroll * n_scrolls
+        profit_scrolls = sourcing.price * n_scrolls
 
-        heads[most_profitable_scroll[0]] = (most_profitable_scroll[1][0], n_scrolls)  # Update the number of scrolls crafted
+        heads[sourcing.scroll] = (sourcing.price, n_scrolls)  # Update the number of scrolls crafted
         heads['Supreme Hide'] = (heads['Supreme Hide'][0], heads['Supreme Hide'][1] - (n_scrolls * n_supreme_hide_scroll))  # Update the number of supreme hides left
         n_breath_of_narcion_reduced = math.ceil(n_scrolls / n_remnants_of_mystic_beasts_exchange) if heads["Breath of Narcion"][0] else 0
 
         heads['Breath of Narcion'] = (heads['Breath of Narcion'][0], heads['Breath of Narcion'][1] - n_breath_of_narcion_reduced)
 
         # Use remnants of mystic beasts if available in heads
-        green_copy_scrolls = heads.copy()  # Create a copy of the heads data for green head calculations
-        contribution_to_total_green_scrolls = contribution_to_total.copy()  # Create a copy of the contribution to total profit for green heads
-        profit_green = self.get_profit_greens(green_copy_scrolls, name_green, contribution_to_total_green_scrolls)  # Calculate the profit from green heads
+        contribution_to_total_green_scrolls: dict[str, int] = {}  # Contribution of the heads left of every exchange, only the selected one is added to the total
+        profit_green = self.get_profit_greens(heads, name_green, contribution_to_total_green_scrolls)  # Calculate the profit from green heads, no exchange so the heads are not modified
 
         yellow_scrolls_copy = heads.copy()
-        contribution_to_total_yellow_scrolls = contribution_to_total.copy()  # Create a copy of the contribution to total profit for yellow scrolls
+        contribution_to_total_yellow_scrolls: dict[str, int] = {}
         profit_yellow = self.get_profit_normal_yellow_head(yellow_scrolls_copy, name_yellow, name_green, contribution_to_total_yellow_scrolls)  # Calculate the profit from yellow heads
 
         yellow_special_scrolls_copy = yellow_scrolls_copy.copy()  # Create a copy of the heads data for special yellow head calculations
-        contribution_to_total_special_yellow_scrolls = contribution_to_total.copy()  # Create a copy of the contribution to total profit for special yellow heads
+        contribution_to_total_special_yellow_scrolls: dict[str, int] = {}
         profit_special_yellow = self.get_profit_special_yellow_head(yellow_special_scrolls_copy, name_green, name_yellow, name_special_yellow, contribution_to_total_special_yellow_scrolls)
     
         max_profit = max(profit_green, profit_yellow, profit_special_yellow)  # Get the maximum profit from green, yellow special yellow heads
-        heads_result: FlatDictInt = {}
         if max_profit == profit_green:
-            heads_result = {name: (price, amount) for name, (price, amount) in green_copy_scrolls.items()}
-            contribution_to_total.update(contribution_to_total_green_scrolls)  # Update the contribution to total profit with green heads contribution
+            contribution_to_total.update(contribution_to_total_green_scrolls)  # Update the contribution to total profit with green heads contribution, the heads are already the ones left
         elif max_profit == profit_yellow:
-            heads_result = {name: (price, amount) for name, (price, amount) in yellow_scrolls_copy.items()}
+            heads.update(yellow_scrolls_copy) # Update the heads with the results of the yellow heads exchange
             contribution_to_total.update(contribution_to_total_yellow_scrolls)  # Update the contribution to total profit with yellow heads contribution
         else:
-            heads_result = {name: (price, amount) for name, (price, amount) in yellow_special_scrolls_copy.items()}
+            heads.update(yellow_special_scrolls_copy) # Update the heads with the results of the special yellow heads exchange
             contribution_to_total.update(contribution_to_total_special_yellow_scrolls)  # Update the contribution to total profit with special yellow heads contribution
 
-        contribution_to_total[most_profitable_scroll[0]] = profit_scrolls  # Update the contribution to total profit with scrolls contribution
-
-        heads.update(heads_result) # Update the heads with the results of the calculations
-        return ((max_profit + profit_scrolls), cost_scrolls)  # Return the total profit from scrolls and heads combined
-    
-    def get_most_profitable_scroll(self, heads: FlatDictInt):
-        """
-        Get the most profitable scroll based on the heads data.
-            :param heads: A dictionary containing the heads data with their prices and amounts.
-            :return: The most profitable scroll and its cost.
-        """
-        scrolls = {
-            'BMB: All AP': (heads['BMB: All AP'][0], self.lightstone_costs["758001"][1]), # Lighstone of fire: Rage
-            'BMB: Accuracy': (heads['BMB: Accuracy'][0], self.lightstone_costs["758002"][1]), # Lighstone of earth: Marked
-            'BMB: Evasion': (heads['BMB: Evasion'][0], self.lightstone_costs["760002"][1]), # Lighstone of earth: Waves
-            'BMB: Damage Reduction': (heads['BMB: Damage Reduction'][0], self.lightstone_costs["760001"][1]), # Lighstone of earth: Iron Wall
-            'BMB: Max HP': (heads['BMB: Max HP'][0], self.lightstone_costs["762001"][1]) # Lighstone of Wind: Heart
-        }
-        
-        max_scroll = max(scrolls.items(), key=lambda x: x[1][0] - x[1][1])
-        return max_scroll
\ No newline at end of file
+        contribution_to_total[sourcing.scroll] = profit_scrolls  # Update the contribution to total profit with scrolls contribution
+        return ((max_profit + profit_scrolls), cost_scrolls)  # Return the total profit from scrolls and heads combined
\ No newline at end of file
@@ -1,13 +1,14 @@
-from typing import Any
+from typing import Any, Optional
 
 from logic.logs import add_log
 from logic.session_results.calculate_max_profit import CalculateMaxProfit
+from logic.session_results.incremental_results import SessionGroupCache
 from logic.data_classes.session_results import SessionResultsData
+from logic.data_classes.session_input import SessionInput, category_hours
 from config.config import (
     FlatDict,
     value_pack_multiplier,
-    extra_profit_multiplier,
-    FlatDictStr
+    extra_profit_multiplier
 )
 
 def calculate_elixirs_cost_hour(elixirs: FlatDict) -> str:
@@ -33,18 +34,21 @@ class CalculateResultsSession:
     Class to calculate the results of a hunting session based on the provided session results data.
     This class takes the session results data and performs calculations to determine the total profit, taxed profit, and other relevant metrics.
     """
-    def __init__(self, session_results: SessionResultsData):
+    def __init__(self, session_results: SessionResultsData, group_cache: Optional[SessionGroupCache] = None):
         """
         Initialize the CalculateResultsSession with the provided session results data.
             :param session_results: An instance of SessionResultsData containing the necessary data for the session.
+            :param group_cache: The last evaluation of the groups of items of the session, to only recalculate the groups that changed (None to calculate everything).
         """
         self.session_results = session_results  # Store the session results data
+        self.group_cache = group_cache  # Last evaluation of the stones and heads of the session
         self.data_input = session_results.data_input  # Get the data input from the session results
         self.name_spot = session_results.name_spot  # Get the name of the hunting spot
         self.auto_calculate_best_profit = session_results.auto_calculate_best_profit  # Get the auto calculate best profit flag
         self.data_input = session_results.data_input  # Get the data input from the session results
         self.lightstone_costs = session_results.lightstone_costs  # Get the lightstone costs from the session results
         self.imperfect_lightstone_costs = session_results.imperfect_lightstone_costs  # Get the imperfect lightstone costs from the session results
+        self.order_books = session_results.order_books  # Get the sell listings of the lightstones from the session results
         self.value_pack = session_results.value_pack  # Get the value pack flag from the session results
         self.market_tax = session_results.market_tax  # Get the market tax from the session results
         self.extra_profit = session_results.extra_profit  # Get the extra profit flag from the session results
@@ -71,7 +75,6 @@ class CalculateResultsSession:
         if not self.check_data_input():
             return -1  # Check if the input data is valid
         
-        original_data_input = self.data_input.copy()  # Keep a copy of the original data input for restoring some values later
         self.exchange_breath_of_narcion() # Add breath of narcion previous to actual breath of narcion
 
         self.value_pack_val = value_pack_multiplier if self.value_pack else 0  # Set value pack multiplier if value pack is active, otherwise set to 0
@@ -91,8 +94,6 @@ class CalculateResultsSession:
             total_h -= self.elixirs_cost_h # Subtract elixirs cost per hour
             taxed_h -= self.elixirs_cost_h # Subtract elixirs cost per hour after tax
 
-            self.restore_data_input(original_data_input)  # Restore the original data input values
-
             return {
                 'total': total,
                 'total_h': total_h,
@@ -100,10 +101,11 @@ class CalculateResultsSession:
                 'taxed_h': taxed_h,
                 'new_labels_input_text': self.recalculate_labels_input(),
                 'elixirs_cost': str(f"{total_elixirs_cost:,}"),
-                'action_user': ''
+                'action_user': '',
+                'strategies': {}
             }
 
-        max_profit = CalculateMaxProfit(self.data_input, 
+        max_profit = CalculateMaxProfit(self.session_input, 
                                         self.lightstone_costs, 
                                         self.imperfect_lightstone_costs, 
                                         self.black_stone_cost, 
@@ -111,36 +113,32 @@ class CalculateResultsSession:
                                         self.value_pack_val, 
                                         self.market_tax,
                                         total_elixirs_cost,
-                                        self.elixirs_cost_h)
+                                        self.elixirs_cost_h,
+                                        self.group_cache,
+                                        self.order_books)
         result_max_profit = max_profit.calculate_max_profit()
-        self.restore_data_input(original_data_input)  # Restore the original data input values
+        self.update_data_input()  # Show the amounts calculated by the exchanges
         return result_max_profit  # Return the result of the maximum profit calculation
 
-    def restore_data_input(self, original_data_input: FlatDictStr):
+    def update_data_input(self):
         """
-        Restore the original data input values after calculations for some inputs that must keep their states.
-            :param original_data_input: A dictionary containing the original data input values.
+        Update the data input with the amounts calculated by the exchanges, except the inputs that must keep their states.
         """
         user_inputs = ["Breath of Narcion", "Breath of Narcion Previous", "Usable Hide", "Damaged Hide", "Supreme Hide", f"St. {self.name_spot} Head", "Wildspark", "Black Gem Frag.", f"St. {self.name_spot}"]
-        for key in user_inputs: # Restore original data input values for specific keys that were changed during calculations
-            if key in original_data_input:
-                self.data_input[key] = original_data_input[key]
+        for name, value in self.session_input.get_updated_input().items():
+            if name not in user_inputs:
+                self.data_input[name] = value
 
     def check_data_input(self) -> bool:
         """
-        Check if the input data is valid.
+        Check if the input data is valid, parsing it once for every calculation.
             :return: True if the input data is valid, False otherwise.
         """
-        for name, (price, amount) in self.data_input.items():
-            if name == 'Hours':
-                continue  # Skip hours as it is not an item
-
-            price = price.replace(',', '').replace(' ', '') if price != '' else '0' # Remove commas and spaces for validation, default to '0' if empty
-            amount = amount.replace(',', '').replace(' ', '') if amount != '' else '0' # Remove commas and spaces for validation, default to '0' if empty
-            
-            if not price.isdigit() or not amount.isdigit():
-                add_log(f"Invalid input data for {name}: price '{price}' or amount '{amount}' is not a valid number.", "error")
-                return False
+        try:
+            self.session_input = SessionInput.from_data_input(self.data_input)
+        except ValueError as e:
+            add_log(str(e), "error")
+            return False
         return True
 
     def get_total_elixirs_cost(self) -> int:
@@ -156,16 +154,7 @@ class CalculateResultsSession:
             :param data_input: A dictionary containing the input data for the session. (name: (price, amount))
             :return: The total results from the session.
         """
-        total = 0
-        for name, (price, amount) in self.data_input.items():
-            if name == 'Hours':
-                continue  # Skip hours as it is not an item
-
-            price = int(price.replace(',', '').replace(' ', '')) if price != '' else 0 # Remove commas and spaces
-            amount = int(amount.replace(',', '').replace(' ', '')) if amount != '' else 0 # Remove commas and spaces
-            total += amount * price
-
-        return total
+        return sum(price * amount for price, amount in zip(self.session_input.prices, self.session_input.amounts)) # 'Hours' has price and amount 0
 
     def results_h(self) -> int:
         """
@@ -199,50 +188,28 @@ class CalculateResultsSession:
         Recalculate the labels for input data based on the total results.
             :return: A list of recalculated labels for input data.
         """
-        total_percent = 0.0
         new_labels_input_text: list[str] = []
-        for name, (price, amount) in self.data_input.items():
-            if name == 'Hours':
+        for name, price, amount, category in zip(self.session_input.names, self.session_input.prices, self.session_input.amounts, self.session_input.categories):
+            if category & category_hours:
                 new_labels_input_text.append(name)
-            else:
-                price = int(price.replace(',', '').replace(' ', '')) if price != '' else 0 # Remove commas and spaces for validation
-                amount = int(amount.replace(',', '').replace(' ', '')) if amount != '' else 0 # Remove commas and spaces for validation
-
-                if name == 'Breath of Narcion':
-                    amount_breath_of_narcion_prev = self.get_amount_val_data(self.data_input, 'Breath of Narcion Previous')  # Get the previous breath of narcion amount
-                    amount += amount_breath_of_narcion_prev  # Add the previous breath of narcion amount to the current one
-                elif name == "Breath of Narcion Previous":
-                    new_labels_input_text.append(f"{name} ({0:.2f}%)")
-                    continue  # Skip previous breath of narcion as it is used in Breath of Narcion calculation
+                continue
 
-                item_total = price * amount
-
-                percent = (item_total / self.total_no_elixirs) * 100 if self.total_no_elixirs > 0 else 0
-                if percent > 100:
-                    percent = 100.0
-                total_percent += percent  # Add the percentage to the total percentage
-                new_labels_input_text.append(f"{name} ({percent:.2f}%)")
+            item_total = price * amount # The previous breath of narcion is already added to the current one
+            percent = (item_total / self.total_no_elixirs) * 100 if self.total_no_elixirs > 0 else 0
+            if percent > 100:
+                percent = 100.0
+            new_labels_input_text.append(f"{name} ({percent:.2f}%)")
 
         return new_labels_input_text
 
-    def get_amount_val_data(self, data: FlatDictStr, name_key: str) -> int:
-        """
-        Get the amount value from the input data based on the provided name key.
-            :param data: A dictionary containing the input data for the session. (name: (price, amount))
-            :param name_key: The key to look for in the input data.
-            :return: The amount value as an integer, or 0 if not found / the value is empty.
-        """
-        value = data.get(name_key, ("", "0"))[1]
-        cleaned = value.replace(',', '').replace(' ', '')
-        return int(cleaned) if cleaned and cleaned != '0' else 0
-
     def exchange_breath_of_narcion(self):
         """
-        Exchange the previous Breath of Narcions to the current one in the input data.
-            :param data_input: A dictionary containing the input data for the session. (name: (price, amount))
+        Exchange the previous Breath of Narcions to the current one in the parsed input.
         """
-        breath_of_narc = self.get_amount_val_data(self.data_input, 'Breath of Narcion')  # Get current breath of narcion
-        breath_of_narc_prev = self.get_amount_val_data(self.data_input, 'Breath of Narcion Previous')  # Get current breath of narcion
+        if 'Breath of Narcion' not in self.session_input.index or 'Breath of Narcion Previous' not in self.session_input.index:
+            return
+        breath_of_narc = self.session_input.amount('Breath of Narcion')  # Get current breath of narcion
+        breath_of_narc_prev = self.session_input.amount('Breath of Narcion Previous')  # Get previous breath of narcion
 
-        self.data_input['Breath of Narcion Previous'] = (self.data_input["Breath of Narcion Previous"][0], "0") # Update previous breath of narcion
-        self.data_input['Breath of Narcion'] = (self.data_input["Breath of Narcion"][0], str(breath_of_narc + breath_of_narc_prev)) # Update current breath of narcion
\ No newline at end of file
+        self.session_input.amounts[self.session_input.index['Breath of Narcion Previous']] = 0 # Update previous breath of narcion
+        self.session_input.amounts[self.session_input.index['Breath of Narcion']] = breath_of_narc + breath_of_narc_prev # Update current breath of narcion
@@ -0,0 +1,39 @@
+from typing import Any, Hashable, Optional
+
+class SessionGroupCache:
+    """
+    Keeps the last evaluation of every group of items of a session (e.g. stones or heads) with the inputs it was calculated from.
+    A recalculation only evaluates again the groups whose items, prices or costs changed, e.g. editing a loot item does not run the stones exchanges.
+    """
+    def __init__(self):
+        """
+        Initialize the SessionGroupCache without evaluations.
+        """
+        self.evaluations: dict[str, tuple[Hashable, Any]] = {} # Group name: (inputs of the group, evaluation)
+
+    def get(self, group: str, inputs: Hashable) -> Optional[Any]:
+        """
+        Get the last evaluation of a group if its inputs did not change.
+            :param group: The name of the group.
+            :param inputs: The inputs of the group (items with their prices and amounts, and the costs it depends on).
+            :return: The evaluation of the group, or None if it must be evaluated again.
+        """
+        evaluation = self.evaluations.get(group)
+        if evaluation is None or evaluation[0] != inputs:
+            return None
+        return evaluation[1]
+
+    def put(self, group: str, inputs: Hashable, evaluation: Any):
+        """
+        Store the evaluation of a group, replacing the previous one.
+            :param group: The name of the group.
+            :param inputs: The inputs of the group.
+            :param evaluation: The evaluation of the group, it must not be modified afterwards.
+        """
+        self.evaluations[group] = (inputs, evaluation)
+
+    def clear(self):
+        """
+        Remove every evaluation.
+        """
+        self.evaluations.clear()
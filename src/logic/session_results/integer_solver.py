@@ -0,0 +1,184 @@
+import heapq, math
+from typing import Optional
+
+epsilon = 1e-9 # Tolerance of the floating point comparisons
+
+def pivot(table: list[list[float]], objective_row: list[float], basis: list[int], row: int, column: int):
+    """
+    Pivot the simplex table so the column enters the basis in the provided row.
+        :param table: The rows of the simplex table (the last value of every row is its right hand side).
+        :param objective_row: The reduced costs row, updated in place.
+        :param basis: The column in the basis of every row, updated in place.
+        :param row: The row leaving the basis.
+        :param column: The column entering the basis.
+    """
+    pivot_row = table[row]
+    pivot_value = pivot_row[column]
+    pivot_row[:] = [value / pivot_value for value in pivot_row]
+    for other_row in (*table, objective_row):
+        factor = other_row[column]
+        if other_row is not pivot_row and abs(factor) > epsilon:
+            other_row[:] = [value - factor * pivot for value, pivot in zip(other_row, pivot_row)]
+    basis[row] = column
+
+def run_simplex(table: list[list[float]], basis: list[int], costs: list[float], n_columns: int) -> bool:
+    """
+    Maximize the costs over the simplex table with Bland's rule (no cycling), starting from a feasible basis.
+        :param table: The rows of the simplex table, updated in place.
+        :param basis: The column in the basis of every row, updated in place.
+        :param costs: The objective coefficient of every column.
+        :param n_columns: Only the first n_columns columns can enter the basis.
+        :return: True if the optimum was found, False if the problem is unbounded.
+    """
+    objective_row = [-cost for cost in costs] + [0.0]
+    for row, column in zip(table, basis):
+        if costs[column]:
+            objective_row = [value + costs[column] * row_value for value, row_value in zip(objective_row, row)]
+    tolerance = epsilon * max(1.0, max(abs(cost) for cost in costs))
+
+    while True:
+        column = next((j for j in range(n_columns) if objective_row[j] < -tolerance), None)
+        if column is None:
+            return True
+
+        leaving: Optional[int] = None
+        best_ratio = 0.0
+        for i, row in enumerate(table):
+            if row[column] > epsilon:
+                ratio = row[-1] / row[column]
+                if leaving is None or ratio < best_ratio - epsilon or (abs(ratio - best_ratio) <= epsilon and basis[i] < basis[leaving]):
+                    leaving, best_ratio = i, ratio
+        if leaving is None:
+            return False
+        pivot(table, objective_row, basis, leaving, column)
+
+def solve_linear_program(objective: list[float], constraints: list[list[float]], limits: list[float]) -> Optional[tuple[float, list[float]]]:
+    """
+    Maximize objective * x subject to constraints * x <= limits and x >= 0 (two phase simplex).
+        :param objective: The objective coefficient of every variable.
+        :param constraints: The coefficients of the variables in every constraint.
+        :param limits: The right hand side of every constraint.
+        :return: The optimal value and variables, or None if the problem is infeasible.
+        :raise ValueError: If the problem is unbounded.
+    """
+    n_variables, n_rows = len(objective), len(constraints)
+    artificial_rows = [i for i, limit in enumerate(limits) if limit < 0]
+    n_columns = n_variables + n_rows + len(artificial_rows)
+
+    table: list[list[float]] = []
+    basis: list[int] = []
+    for i, (constraint, limit) in enumerate(zip(constraints, limits)):
+        sign = -1.0 if limit < 0 else 1.0 # Rows with a negative limit are negated and start with an artificial variable
+        row = [sign * value for value in constraint] + [0.0] * (n_columns - n_variables) + [sign * limit]
+        row[n_variables + i] = sign # Slack variable
+        if limit < 0:
+            artificial_column = n_variables + n_rows + artificial_rows.index(i)
+            row[artificial_column] = 1.0
+            basis.append(artificial_column)
+        else:
+            basis.append(n_variables + i)
+        table.append(row)
+
+    if artificial_rows: # Phase 1: find a feasible basis by minimizing the artificial variables
+        phase_costs = [0.0] * (n_variables + n_rows) + [-1.0] * len(artificial_rows)
+        run_simplex(table, basis, phase_costs, n_columns)
+        if sum(table[i][-1] for i, column in enumerate(basis) if column >= n_variables + n_rows) > epsilon * max(1.0, max(abs(limit) for limit in limits)):
+            return None
+
+        for i in reversed(range(len(table))): # Move the artificial variables left at 0 out of the basis
+            if basis[i] < n_variables + n_rows:
+                continue
+            column = next((j for j in range(n_variables + n_rows) if abs(table[i][j]) > epsilon), None)
+            if column is None:
+                del table[i], basis[i] # Redundant constraint
+            else:
+                pivot(table, [0.0] * (n_columns + 1), basis, i, column)
+
+    costs = list(objective) + [0.0] * (n_columns - n_variables)
+    if not run_simplex(table, basis, costs, n_variables + n_rows):
+        raise ValueError("The linear program is unbounded.")
+
+    values = [0.0] * n_variables
+    for row, column in zip(table, basis):
+        if column < n_variables:
+            values[column] = row[-1]
+    return (sum(cost * value for cost, value in zip(objective, values)), values)
+
+def solve_integer_program(objective: list[float], constraints: list[list[float]], limits: list[float], integer_variables: list[int], max_nodes: int) -> Optional[tuple[float, list[float]]]:
+    """
+    Maximize objective * x subject to constraints * x <= limits, x >= 0 and integer values for the provided variables (branch and bound).
+        :param objective: The objective coefficient of every variable.
+        :param constraints: The coefficients of the variables in every constraint.
+        :param limits: The right hand side of every constraint.
+        :param integer_variables: The indexes of the variables that must be integers.
+        :param max_nodes: The maximum number of linear programs solved, the best solution found so far is returned when reached.
+        :return: The best value and variables found, or None if the problem is infeasible.
+        :raise ValueError: If the problem is unbounded.
+    """
+    def bound_rows(bounds: list[tuple[int, float, float]]) -> tuple[list[list[float]], list[float]]:
+        rows = list(constraints)
+        row_limits = list(limits)
+        for variable, lower, upper in bounds:
+            if upper < math.inf: # x <= upper
+                rows.append([1.0 if i == variable else 0.0 for i in range(len(objective))])
+                row_limits.append(upper)
+            if lower > 0: # -x <= -lower
+                rows.append([-1.0 if i == variable else 0.0 for i in range(len(objective))])
+                row_limits.append(-lower)
+        return (rows, row_limits)
+
+    def get_fractional(values: list[float]) -> list[tuple[float, int]]:
+        return [(abs(values[i] - round(values[i])), i) for i in integer_variables if abs(values[i] - round(values[i])) > 1e-6]
+
+    def dive(bounds: list[tuple[int, float, float]], values: list[float]) -> Optional[tuple[float, list[float]]]:
+        # Fix the least fractional variable to its nearest integer (or the other one if infeasible) until the solution is integer
+        nonlocal nodes
+        value = 0.0
+        while nodes < max_nodes:
+            fractional = get_fractional(values)
+            if not fractional:
+                return (value, [float(round(values[i])) if i in integer_variables else values[i] for i in range(len(values))])
+            _, variable = min(fractional)
+            targets = sorted((math.floor(values[variable]), math.ceil(values[variable])), key=lambda target: abs(target - values[variable]))
+            for target in targets:
+                nodes += 1
+                candidate = [bound for bound in bounds if bound[0] != variable] + [(variable, float(target), float(target))]
+                solution = solve_linear_program(objective, *bound_rows(candidate))
+                if solution is not None:
+                    bounds, (value, values) = candidate, solution
+                    break
+            else:
+                return None
+        return None
+
+    best: Optional[tuple[float, list[float]]] = None
+    pending: list[tuple[float, int, list[tuple[int, float, float]]]] = [(-math.inf, 0, [])] # (-bound of the parent, order, bounds), best bound first
+    nodes = 0
+    while pending and nodes < max_nodes:
+        parent_bound, _, bounds = heapq.heappop(pending)
+        if best is not None and -parent_bound <= best[0] + epsilon * max(1.0, abs(best[0])):
+            break # No pending branch can improve the best solution
+        nodes += 1
+        solution = solve_linear_program(objective, *bound_rows(bounds))
+        if solution is None:
+            continue
+        value, values = solution
+        if best is not None and value <= best[0] + epsilon * max(1.0, abs(value)):
+            continue # This branch can not improve the best solution
+
+        fractional = get_fractional(values)
+        if not fractional:
+            best = (value, [float(round(values[i])) if i in integer_variables else values[i] for i in range(len(values))])
+            continue
+
+        if best is None: # Diving to an integer solution first gives a bound to prune the branches early
+            best = dive(bounds, values)
+
+        _, variable = max(fractional)
+        current = {bound[0]: bound for bound in bounds}
+        _, lower, upper = current.get(variable, (variable, 0.0, math.inf))
+        others = [bound for bound in bounds if bound[0] != variable]
+        heapq.heappush(pending, (-value, nodes * 2, others + [(variable, lower, float(math.floor(values[variable])))]))
+        heapq.heappush(pending, (-value, nodes * 2 + 1, others + [(variable, float(math.ceil(values[variable])), upper)]))
+
+    return best
@@ -0,0 +1,69 @@
+from typing import Optional
+
+import numpy as np
+
+from config.config import monte_carlo_samples, monte_carlo_default_volatility, monte_carlo_percentiles
+from logic.logs import add_log
+from logic.data_classes.session_results import SessionResultsData
+from logic.data_classes.price_uncertainty import PriceUncertaintyReport
+from logic.session_results.batch_results import BatchCalculator, build_session_batch
+
+def sample_prices(prices: np.ndarray, volatilities: np.ndarray, n_samples: int, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Sample price vectors around the current prices, every price follows a lognormal distribution with the same mean.
+        :param prices: The current prices of the items.
+        :param volatilities: The volatility (standard deviation of the log price) of every item, 0 to keep its price.
+        :param n_samples: The number of price vectors to sample.
+        :param seed: The seed of the random generator, None for a random one.
+        :return: The sampled prices rounded to integers, (n_samples, items) float64 array (not cast to int64, the batch checks their bound first).
+    """
+    generator = np.random.default_rng(seed)
+    noise = generator.standard_normal((n_samples, len(prices)))
+    factors = np.exp(noise * volatilities - volatilities ** 2 / 2) # Mean of the factors is 1
+    return np.rint(prices * factors)
+
+def analyze_price_uncertainty(session: SessionResultsData, volatilities: dict[str, float], n_samples: int = monte_carlo_samples, seed: Optional[int] = None) -> PriceUncertaintyReport | int:
+    """
+    Evaluate the results of a session under many sampled prices (Monte Carlo), using the batch engine on all the samples at once.
+    The prices of the items are sampled independently, the exchange optimizer is not used so it finishes in well under a second.
+        :param session: The session to analyze.
+        :param volatilities: A dictionary of item names and their volatility, the items not included use monte_carlo_default_volatility.
+        :param n_samples: The number of price samples.
+        :param seed: The seed of the random generator, None for a random one.
+        :return: The report of the analysis (of the samples that can not overflow), or -1 if the input of the session is not valid, an item is missing or every sample could overflow.
+    """
+    try:
+        batch = build_session_batch([session])
+    except ValueError as e:
+        add_log(f"Error building the session for the price uncertainty analysis: {e}", "error")
+        return -1
+    if not batch.valid[0] or batch.hours[0] <= 0:
+        return -1
+
+    prices = batch.prices[0]
+    item_volatilities = np.array([volatilities.get(name, monte_carlo_default_volatility) if price > 0 else 0.0 for name, price in zip(batch.item_names, prices)])
+    try:
+        results = BatchCalculator(batch.with_prices(sample_prices(prices, item_volatilities, n_samples, seed)), optimize=False).calculate()
+    except KeyError as e:
+        add_log(f"Missing item {e} in the session, the price uncertainty can not be analyzed.", "error")
+        return -1
+
+    valid = results.valid # The samples whose results could overflow int64 are dropped
+    n_valid = int(valid.sum())
+    if n_valid == 0:
+        add_log("Every price sample of the session could overflow, the price uncertainty can not be analyzed.", "warning")
+        return -1
+    if n_valid < n_samples:
+        add_log(f"{n_samples - n_valid} price samples of the session could overflow, they are dropped from the analysis.", "warning")
+
+    total_h, taxed_h = results.total_h[valid], results.taxed_h[valid]
+    codes, counts = np.unique(results.action_codes[valid], return_counts=True)
+    frequencies = sorted(((results.action_labels[code] or "Manual", float(count / n_valid)) for code, count in zip(codes, counts)), key=lambda action: -action[1])
+    return PriceUncertaintyReport(
+        n_samples=n_valid,
+        expected_total_h=int(total_h.mean()),
+        expected_taxed_h=int(taxed_h.mean()),
+        percentiles_taxed_h={percentile: int(value) for percentile, value in zip(monte_carlo_percentiles, np.percentile(taxed_h, monte_carlo_percentiles))},
+        action_frequencies=dict(frequencies),
+        volatilities={name: float(volatility) for name, volatility in zip(batch.item_names, item_volatilities) if volatility > 0}
+    )
@@ -0,0 +1,155 @@
+import math
+from collections import defaultdict
+from typing import Any, Optional
+
+from config.config import recipes, recipe_solver_max_nodes
+from logic.data_classes.recipe import Recipe, RecipePlan
+from logic.session_results.integer_solver import solve_integer_program
+
+def build_recipes(placeholders: dict[str, str], recipes_data: Optional[list[dict[str, Any]]] = None) -> list[Recipe]:
+    """
+    Build the recipes replacing the placeholders of the item names (e.g. '{green_head}').
+        :param placeholders: A dictionary of placeholder names and the item names that replace them.
+        :param recipes_data: The recipes to build (name, inputs and outputs), None to use the recipes of the config.
+        :return: A list of the recipes whose item names are all known.
+    """
+    names = defaultdict(str, placeholders) # Unknown placeholders are empty
+    built: list[Recipe] = []
+    for recipe in recipes if recipes_data is None else recipes_data:
+        inputs = {item.format_map(names): amount for item, amount in recipe['inputs'].items()}
+        outputs = {item.format_map(names): amount for item, amount in recipe['outputs'].items()}
+        if all(inputs) and all(outputs): # Items of heads the spot does not have (or not provided) are empty
+            built.append(Recipe(recipe['name'].format_map(names), inputs, outputs))
+    return built
+
+def get_purchase_costs(lightstone_costs: dict[str, float], imperfect_lightstone_cost: Optional[float], black_stone_cost: float) -> dict[str, float]:
+    """
+    Get the items the exchange optimizer can buy and their cost.
+        :param lightstone_costs: A dictionary of the lightstone names and their cost.
+        :param imperfect_lightstone_cost: The cost of the cheapest imperfect lightstone (any of them gives magical lightstones), None if unknown.
+        :param black_stone_cost: The cost of a black stone.
+        :return: A dictionary of the items that can be bought and their cost.
+    """
+    purchase_costs = dict(lightstone_costs)
+    purchase_costs["Black Stone"] = black_stone_cost
+    if imperfect_lightstone_cost is not None:
+        purchase_costs["Imperfect Lightstone"] = imperfect_lightstone_cost
+    return purchase_costs
+
+class RecipeGraph:
+    """
+    Graph of exchanges (recipes) between items.
+    It finds how many times every recipe must be crafted to maximize the value of the items left minus the cost of the items bought,
+    solved as a small integer program so partial exchanges (e.g. only some of the black gems) are also considered.
+    """
+    def __init__(self, recipes_graph: list[Recipe]):
+        """
+        Initialize the RecipeGraph with the provided recipes.
+            :param recipes_graph: A list of the recipes that can be crafted.
+        """
+        self.recipes = recipes_graph
+
+    def get_usable_recipes(self, stock: dict[str, int], purchase_costs: dict[str, float]) -> list[Recipe]:
+        """
+        Get the recipes whose inputs can be obtained (in stock, bought or produced by other usable recipes).
+            :param stock: A dictionary of item names and the amount available.
+            :param purchase_costs: A dictionary of the items that can be bought and their cost.
+            :return: A list of the usable recipes.
+        """
+        available = {item for item, amount in stock.items() if amount > 0} | set(purchase_costs)
+        usable: list[Recipe] = []
+        pending = list(self.recipes)
+        changed = True
+        while changed:
+            changed = False
+            for recipe in list(pending):
+                if all(item in available for item in recipe.inputs):
+                    usable.append(recipe)
+                    available.update(recipe.outputs)
+                    pending.remove(recipe)
+                    changed = True
+        return usable
+
+    def optimize(self, stock: dict[str, int], prices: dict[str, int], purchase_costs: dict[str, float]) -> Optional[RecipePlan]:
+        """
+        Find the crafts that maximize the profit of the provided items.
+            :param stock: A dictionary of item names and the amount available.
+            :param prices: A dictionary of item names and their sell price, items without price are worth 0.
+            :param purchase_costs: A dictionary of the items that can be bought and their cost.
+            :return: The best plan found, or None if it could not be calculated (e.g. buying an item to sell it is profitable).
+        """
+        usable = self.get_usable_recipes(stock, purchase_costs)
+        if not usable:
+            return None
+
+        produced = {item for recipe in usable for item in recipe.outputs}
+        consumed = {item for recipe in usable for item in recipe.inputs}
+        # Items bought only to be consumed have no variable nor constraint, their cost is part of the recipes that consume them
+        direct_purchases = {item for item in consumed & set(purchase_costs) if not stock.get(item) and not prices.get(item) and item not in produced}
+        purchases = sorted((consumed & set(purchase_costs)) - direct_purchases)
+        constrained_items = sorted(consumed - direct_purchases)
+
+        objective: list[float] = []
+        columns: list[tuple[float, ...]] = []
+        best_recipes: dict[tuple[float, ...], int] = {} # Recipes with the same inputs and outputs of constrained items: best one
+        for recipe in usable:
+            gain = sum(prices.get(item, 0) * amount for item, amount in recipe.outputs.items())
+            loss = sum(prices.get(item, 0) * amount for item, amount in recipe.inputs.items())
+            loss += sum(purchase_costs[item] * amount for item, amount in recipe.inputs.items() if item in direct_purchases)
+            column = tuple(recipe.inputs.get(item, 0) - recipe.outputs.get(item, 0) for item in constrained_items)
+            if column not in best_recipes or gain - loss > objective[best_recipes[column]]: # Only the most profitable one would be crafted (e.g. scrolls)
+                best_recipes[column] = len(objective)
+            objective.append(gain - loss)
+            columns.append(column)
+
+        candidates = sorted(best_recipes.values())
+        usable = [usable[i] for i in candidates]
+        n_recipes = len(usable)
+        objective = [objective[i] for i in candidates] + [prices.get(item, 0) - purchase_costs[item] for item in purchases]
+
+        constraints: list[list[float]] = []
+        limits: list[float] = []
+        for row_index, item in enumerate(constrained_items): # Consumed - produced - bought <= stock
+            row = [float(columns[i][row_index]) for i in candidates]
+            row += [-1.0 if item == purchase else 0.0 for purchase in purchases]
+            constraints.append(row)
+            limits.append(float(stock.get(item, 0)))
+
+        try:
+            solution = solve_integer_program(objective, constraints, limits, list(range(n_recipes)), recipe_solver_max_nodes)
+        except ValueError:
+            return None
+        if solution is None:
+            return None
+
+        return self.build_plan(usable, [int(value) for value in solution[1][:n_recipes]], stock, prices, purchase_costs)
+
+    def build_plan(self, usable: list[Recipe], crafts: list[int], stock: dict[str, int], prices: dict[str, int], purchase_costs: dict[str, float]) -> RecipePlan:
+        """
+        Build the plan of the provided crafts, calculating the items left and bought with exact amounts.
+            :param usable: A list of the recipes crafted.
+            :param crafts: The number of times every recipe is crafted.
+            :param stock: A dictionary of item names and the amount available.
+            :param prices: A dictionary of item names and their sell price.
+            :param purchase_costs: A dictionary of the items that can be bought and their cost.
+            :return: The plan of the crafts.
+        """
+        balance: dict[str, float] = {item: float(amount) for item, amount in stock.items()}
+        for recipe, count in zip(usable, crafts):
+            for item, amount in recipe.outputs.items():
+                balance[item] = balance.get(item, 0.0) + amount * count
+            for item, amount in recipe.inputs.items():
+                balance[item] = balance.get(item, 0.0) - amount * count
+
+        plan = RecipePlan(crafts={recipe.name: count for recipe, count in zip(usable, crafts) if count > 0})
+        cost = 0.0
+        for item, amount in balance.items():
+            if amount < -1e-6 and item in purchase_costs: # Missing items are bought
+                plan.bought[item] = -amount
+                cost += -amount * purchase_costs[item]
+                amount = 0.0
+            plan.final_amounts[item] = max(0, math.floor(amount + 1e-6))
+
+        plan.value = sum(prices.get(item, 0) * amount for item, amount in plan.final_amounts.items())
+        plan.cost = math.ceil(cost - 1e-6)
+        return plan
@@ -0,0 +1,84 @@
+import copy
+from collections import OrderedDict
+from typing import Any, Optional
+
+from logic.data_classes.session_results import SessionResultsData
+from config.config import FlatDictStr
+
+CacheKey = tuple[Any, ...]
+
+def normalize_input(value: str) -> str:
+    """
+    Normalize an input value the way the calculations read it (without separators, empty means 0).
+        :param value: The value to normalize.
+        :return: The normalized value.
+    """
+    return value.replace(',', '').replace(' ', '') or '0'
+
+def get_cache_key(session_results: SessionResultsData) -> CacheKey:
+    """
+    Get the canonical key of the inputs of a session calculation (items, prices and settings).
+        :param session_results: An instance of SessionResultsData containing the data of the session.
+        :return: A hashable key, equal for inputs that give the same results.
+    """
+    return (
+        session_results.name_spot,
+        session_results.value_pack,
+        session_results.market_tax,
+        session_results.extra_profit,
+        session_results.auto_calculate_best_profit,
+        normalize_input(session_results.elixirs_cost),
+        tuple((name, normalize_input(price), normalize_input(amount)) for name, (price, amount) in session_results.data_input.items()),
+        tuple(sorted(session_results.lightstone_costs.items())),
+        tuple(sorted(session_results.imperfect_lightstone_costs.items())),
+        tuple(sorted(session_results.black_stone_cost.items())),
+        tuple(sorted((item_id, tuple(levels)) for item_id, levels in session_results.order_books.items()))
+    )
+
+class SessionResultsCache:
+    """
+    Bounded memo of the results of session calculations, the least recently used results are discarded first.
+    The calculations update some input amounts (e.g. exchanged concentrated black stones), so those updates are stored and replayed too.
+    """
+    def __init__(self, max_size: int):
+        """
+        Initialize the SessionResultsCache.
+            :param max_size: The maximum number of results stored.
+        """
+        self.max_size = max_size
+        self.entries: OrderedDict[CacheKey, tuple[dict[str, Any], FlatDictStr]] = OrderedDict() # Key: (results, inputs updated by the calculation)
+
+    def get(self, key: CacheKey, data_input: FlatDictStr) -> Optional[dict[str, Any]]:
+        """
+        Get the results of a calculation, applying to the input data the updates of the calculation.
+            :param key: The key of the inputs of the calculation.
+            :param data_input: The input data of the session, updated in place.
+            :return: A copy of the results, or None if they are not stored.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        results, updated_inputs = entry
+        data_input.update(updated_inputs)
+        return copy.deepcopy(results)
+
+    def put(self, key: CacheKey, results: dict[str, Any], original_input: FlatDictStr, data_input: FlatDictStr):
+        """
+        Store the results of a calculation.
+            :param key: The key of the inputs of the calculation.
+            :param results: The results of the calculation.
+            :param original_input: The input data before the calculation.
+            :param data_input: The input data after the calculation.
+        """
+        updated_inputs = {name: value for name, value in data_input.items() if original_input.get(name) != value}
+        self.entries[key] = (copy.deepcopy(results), updated_inputs)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove every stored result.
+        """
+        self.entries.clear()
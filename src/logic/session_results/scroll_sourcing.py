@@ -0,0 +1,86 @@
+from typing import Iterable, Optional
+import math
+
+from config.config import (
+    n_magical_lightstone_exchange,
+    n_magical_lightstones_scroll,
+    n_remnants_of_mystic_beasts_exchange,
+    n_scrolls_lighstone,
+    scroll_lightstone_ids,
+    FlatDict,
+    OrderBooks
+)
+from logic.data_classes.scroll_sourcing import ScrollSourcing
+
+Source = tuple[int, Optional[int], str] # (price, amount available or None if unlimited, item name)
+
+def get_sources(item_ids: Iterable[str], costs: FlatDict, order_books: OrderBooks) -> list[Source]:
+    """
+    Get the sources an input can be bought from: the sell listings of every item, and buy orders at its current price.
+        :param item_ids: The IDs of the items that can be used as the input.
+        :param costs: A dictionary of item IDs and their names and current prices.
+        :param order_books: A dictionary of item IDs and their sell listings (price, amount), items without them are only bought at their current price.
+        :return: The sources, cheapest first (items in the given order on ties).
+    """
+    sources: list[Source] = []
+    for item_id in item_ids:
+        name, price = costs[item_id]
+        sources.extend((level_price, amount, name) for level_price, amount in order_books.get(item_id, []) if level_price < price)
+        sources.append((price, None, name))
+    sources.sort(key=lambda source: source[0])
+    return sources
+
+def buy_cheapest(sources: list[Source], quantity: int) -> tuple[int, dict[str, int]]:
+    """
+    Buy a quantity of an input from the cheapest sources first, moving to the next one when a source can not cover the rest.
+        :param sources: The sources of the input, cheapest first.
+        :param quantity: The quantity to buy.
+        :return: A tuple containing the total cost and the amount bought of every item.
+    """
+    cost = 0
+    bought: dict[str, int] = {}
+    for price, available, name in sources:
+        if quantity <= 0:
+            break
+        n_bought = quantity if available is None else min(available, quantity)
+        cost += n_bought * price
+        bought[name] = bought.get(name, 0) + n_bought
+        quantity -= n_bought
+    return cost, bought
+
+def get_scroll_sourcing(scroll_prices: dict[str, int], n_scrolls: int, lightstone_costs: FlatDict, imperfect_lightstone_costs: FlatDict, breath_of_narcion_price: int, order_books: OrderBooks) -> ScrollSourcing:
+    """
+    Choose the most profitable scroll and the least-cost mix of inputs to craft a number of them.
+    Without order books every input is bought at its current price, with the same costs the scrolls always had except for the magical lightstones,
+    that are exchanged for all the scrolls at once instead of rounding the imperfect lightstones up for every scroll.
+        :param scroll_prices: A dictionary of the scrolls and their prices.
+        :param n_scrolls: The number of scrolls to craft.
+        :param lightstone_costs: A dictionary of lightstone IDs and their names and prices.
+        :param imperfect_lightstone_costs: A dictionary of imperfect lightstone IDs and their names and prices.
+        :param breath_of_narcion_price: The price of a Breath of Narcion, exchanged to remnants of mystic beasts.
+        :param order_books: A dictionary of item IDs and their sell listings (price, amount).
+        :return: The scroll to craft and the cost of its inputs.
+    """
+    n_lightstones = max(-(-n_scrolls // n_scrolls_lighstone), 1) # At least one so the scrolls can be compared when none are crafted
+    best: Optional[tuple[str, int, int]] = None # (scroll, price, lightstone cost per scroll)
+    for scroll, lightstone_id in scroll_lightstone_ids.items():
+        cost_lightstones, _ = buy_cheapest(get_sources([lightstone_id], lightstone_costs, order_books), n_lightstones)
+        cost_lightstone_scroll = cost_lightstones // n_lightstones // n_scrolls_lighstone
+        if best is None or scroll_prices[scroll] - cost_lightstone_scroll > best[1] - best[2]: # First maximum on ties
+            best = (scroll, scroll_prices[scroll], cost_lightstone_scroll)
+    assert best is not None, "At least one scroll must be craftable."
+    scroll, price, cost_lightstone_scroll = best
+
+    n_imperfect_lightstones = -(-n_scrolls * n_magical_lightstones_scroll // n_magical_lightstone_exchange)
+    cost_magical_lightstones, imperfect_lightstones = buy_cheapest(get_sources(imperfect_lightstone_costs, imperfect_lightstone_costs, order_books), n_imperfect_lightstones)
+    cost_remnants_scroll = math.ceil(breath_of_narcion_price / n_remnants_of_mystic_beasts_exchange)
+
+    return ScrollSourcing(
+        scroll,
+        price,
+        n_scrolls,
+        cost_lightstone_scroll * n_scrolls,
+        cost_magical_lightstones,
+        cost_remnants_scroll * n_scrolls,
+        imperfect_lightstones
+    )
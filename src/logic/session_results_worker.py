@@ -0,0 +1,64 @@
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from logic.logs import add_log
+from logic.data_classes.session_results import SessionResultsData
+from logic.data_classes.price_uncertainty import PriceUncertaintyReport
+
+class SessionResultsSignals(QObject):
+    """
+    Signals of SessionResultsWorker, a QRunnable can not emit signals itself.
+    """
+    finished_calculating = Signal(int, object, object) # Signal to emit when the results are calculated (generation, results or error code, price uncertainty report or None)
+
+class SessionResultsWorker(QRunnable):
+    """
+    SessionResultsWorker is a QRunnable that calculates the results of a session outside the GUI thread.
+    Every calculation has a generation number, the calculations that are already outdated when they start are skipped.
+    """
+    def __init__(
+        self,
+        generation: int,
+        session_results: SessionResultsData,
+        get_results: Callable[[SessionResultsData], dict[str, Any] | int],
+        get_price_uncertainty: Optional[Callable[[SessionResultsData], PriceUncertaintyReport | int]],
+        is_outdated: Callable[[int], bool]
+    ):
+        """
+        Initialize the SessionResultsWorker with the necessary parameters.
+            :param generation: The generation number of the calculation, increased on every change of the inputs.
+            :param session_results: An instance of SessionResultsData containing the inputs of the session.
+            :param get_results: Function to calculate the results of the session.
+            :param get_price_uncertainty: Function to analyze the price uncertainty of the session, None to skip the analysis.
+            :param is_outdated: Function to check whether a generation was replaced by a newer one.
+        """
+        super().__init__()
+        self.generation = generation
+        self.session_results = session_results
+        self.get_results = get_results
+        self.get_price_uncertainty = get_price_uncertainty
+        self.is_outdated = is_outdated
+        self.signals = SessionResultsSignals()
+
+    def run(self):
+        """
+        Calculate the results of the session and emit them, unless the inputs changed before the calculation started.
+        """
+        if self.is_outdated(self.generation):
+            return # Newer inputs are queued, their results replace these
+
+        try:
+            results = self.get_results(self.session_results)
+        except Exception as e:
+            add_log(f"Error calculating the results of the session: {e}", "error")
+            results = -1
+
+        report = None
+        if isinstance(results, dict) and self.get_price_uncertainty is not None and not self.is_outdated(self.generation):
+            try:
+                report = self.get_price_uncertainty(self.session_results)
+            except Exception as e: # The results are emitted anyway, without the analysis
+                add_log(f"Error analyzing the price uncertainty of the session: {e}", "error")
+                report = -1
+        self.signals.finished_calculating.emit(self.generation, results, report)
@@ -1,8 +1,39 @@
-import sqlite3, time
+import sqlite3, time, gzip, json, math
 
-from config.config import sql_file, time_cached, FlatDict, NestedDict
+from config.config import sql_file, time_cached, snapshot_version, price_history_window, price_history_min_points, FlatDict, NestedDict, OrderBooks
 from logic.logs import add_log
 
+cached_tables: dict[str, tuple[tuple[str, ...], str]] = { # Tables of the cached data: (columns, definition), snapshots can only contain these tables and columns
+    "items": (("id", "region", "price", "last_updated"), """
+    CREATE TABLE IF NOT EXISTS items (
+        id TEXT,
+        region TEXT,
+        price REAL,
+        last_updated REAL,
+        PRIMARY KEY (id, region)
+    )
+    """),
+    "price_history": (("id", "region", "price", "fetched_at"), """
+    CREATE TABLE IF NOT EXISTS price_history (
+        id TEXT,
+        region TEXT,
+        price REAL,
+        fetched_at REAL,
+        PRIMARY KEY (id, region, fetched_at)
+    )
+    """),
+    "order_book": (("id", "region", "price", "amount", "fetched_at"), """
+    CREATE TABLE IF NOT EXISTS order_book (
+        id TEXT,
+        region TEXT,
+        price REAL,
+        amount INTEGER,
+        fetched_at REAL,
+        PRIMARY KEY (id, region, price)
+    )
+    """)
+}
+
 def check_cached_data(data_items: dict[str, str], region: str) -> tuple[dict[str, str], FlatDict]:
     """
     Check the cached data in the SQLite database to determine which items are outdated and which are up-to-date.
@@ -18,15 +49,7 @@ def check_cached_data(data_items: dict[str, str], region: str) -> tuple[dict[str
     conn = sqlite3.connect(sql_file)
     cursor = conn.cursor()
 
-    cursor.execute(f"""
-    CREATE TABLE IF NOT EXISTS items (
-        id TEXT,
-        region TEXT,
-        price REAL,
-        last_updated REAL,
-        PRIMARY KEY (id, region)
-    )
-    """)
+    cursor.execute(cached_tables["items"][1])
 
     conn.commit()
 
@@ -53,6 +76,32 @@ def check_cached_data(data_items: dict[str, str], region: str) -> tuple[dict[str
 
     return outdated_items, cached_items
 
+def get_cached_prices(data_items: dict[str, str], region: str) -> FlatDict:
+    """
+    Get the last cached prices of some items, whatever their age (for calculations that do not need live prices).
+        :param data_items: Dictionary of item IDs and their names.
+        :param region: The region of the prices.
+        :return: A dictionary of item IDs and their names and prices, items never cached are not included.
+    """
+    cached_items: FlatDict = {}
+    try:
+        conn = sqlite3.connect(sql_file)
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'items'")
+        if cursor.fetchone() is None: # No prices cached yet
+            conn.close()
+            return cached_items
+
+        for item_id, item_name in data_items.items():
+            cursor.execute("SELECT price FROM items WHERE id = ? AND region = ?", (item_id, region))
+            row = cursor.fetchone()
+            if row:
+                cached_items[item_id] = (item_name, int(row[0]))
+        conn.close()
+    except Exception as e:
+        add_log(f"Error reading the cached prices: {e}", "error")
+    return cached_items
+
 def update_cached_data(data_items: NestedDict, region: str):
     """
     Update the cached data in the SQLite database with the fetched prices.
@@ -84,12 +133,194 @@ def update_cached_data(data_items: NestedDict, region: str):
     conn = sqlite3.connect(sql_file)
     cursor = conn.cursor()
 
+    cursor.execute(cached_tables["price_history"][1])
+
     for item_id, price in update_items.items():
+        time_now = time.time()
         cursor.execute(f"""
         INSERT OR REPLACE INTO items (id, region, price, last_updated)
         VALUES (?, ?, ?, ?)
-        """, (item_id, region, price, time.time()))
+        """, (item_id, region, price, time_now))
+        cursor.execute(f"""
+        INSERT OR REPLACE INTO price_history (id, region, price, fetched_at)
+        VALUES (?, ?, ?, ?)
+        """, (item_id, region, price, time_now))
         add_log(f"Updated cached price for item ID {item_id} to {price}", "debug")
 
+    cursor.execute("DELETE FROM price_history WHERE fetched_at < ?", (time.time() - price_history_window,)) # Prices older than the window are not used to estimate the volatility
+    if cursor.rowcount > 0:
+        add_log(f"Deleted {cursor.rowcount} prices older than the price history window.", "debug")
+
     conn.commit()
-    conn.close()
\ No newline at end of file
+    conn.close()
+
+def update_order_books(order_books: OrderBooks, region: str):
+    """
+    Replace the cached order books (sell listings) of some items.
+        :param order_books: Dictionary of item IDs and their sell listings (price, amount).
+        :param region: The region of the order books.
+    """
+    if not order_books:
+        return
+
+    conn = sqlite3.connect(sql_file)
+    cursor = conn.cursor()
+
+    cursor.execute(cached_tables["order_book"][1])
+
+    time_now = time.time()
+    for item_id, levels in order_books.items():
+        cursor.execute("DELETE FROM order_book WHERE id = ? AND region = ?", (item_id, region))
+        cursor.executemany("""
+        INSERT OR REPLACE INTO order_book (id, region, price, amount, fetched_at)
+        VALUES (?, ?, ?, ?, ?)
+        """, [(item_id, region, price, amount, time_now) for price, amount in levels])
+        add_log(f"Updated order book for item ID {item_id} ({len(levels)} levels)", "debug")
+
+    conn.commit()
+    conn.close()
+
+def get_order_books(item_ids: list[str], region: str) -> OrderBooks:
+    """
+    Get the cached order books (sell listings) of some items, as old as their cached prices at most.
+        :param item_ids: The IDs of the items.
+        :param region: The region of the order books.
+        :return: A dictionary of item IDs and their sell listings (price, amount), cheapest first. Items without order book are not included.
+    """
+    order_books: OrderBooks = {}
+    try:
+        conn = sqlite3.connect(sql_file)
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'order_book'")
+        if cursor.fetchone() is None: # No order books fetched yet
+            conn.close()
+            return order_books
+
+        since = time.time() - time_cached
+        for item_id in item_ids:
+            cursor.execute("SELECT price, amount FROM order_book WHERE id = ? AND region = ? AND fetched_at >= ? ORDER BY price", (item_id, region, since))
+            levels = [(int(price), int(amount)) for price, amount in cursor.fetchall()]
+            if levels:
+                order_books[item_id] = levels
+        conn.close()
+    except Exception as e:
+        add_log(f"Error reading the order books: {e}", "error")
+    return order_books
+
+def get_price_volatilities(item_ids: list[str], region: str) -> dict[str, float]:
+    """
+    Estimate the volatility of the prices of some items from their price history (standard deviation of the log prices in the history window).
+        :param item_ids: The IDs of the items.
+        :param region: The region of the prices.
+        :return: A dictionary of item IDs and their volatility, items without enough history are not included.
+    """
+    volatilities: dict[str, float] = {}
+    try:
+        conn = sqlite3.connect(sql_file)
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'price_history'")
+        if cursor.fetchone() is None: # No prices fetched yet
+            conn.close()
+            return volatilities
+
+        since = time.time() - price_history_window
+        for item_id in item_ids:
+            cursor.execute("SELECT price FROM price_history WHERE id = ? AND region = ? AND fetched_at >= ? AND price > 0", (item_id, region, since))
+            log_prices = [math.log(price) for (price,) in cursor.fetchall()]
+            if len(log_prices) < price_history_min_points:
+                continue
+            mean = sum(log_prices) / len(log_prices)
+            volatilities[item_id] = math.sqrt(sum((log_price - mean) ** 2 for log_price in log_prices) / (len(log_prices) - 1))
+        conn.close()
+    except Exception as e:
+        add_log(f"Error reading the price history: {e}", "error")
+    return volatilities
+
+def export_cached_snapshot(snapshot_path: str) -> int:
+    """
+    Export the tables of the cached data database (prices, history and order books when present) to one compressed snapshot file.
+        :param snapshot_path: The path of the snapshot file to create.
+        :return: The number of rows exported, or -1 if an error occurred.
+    """
+    try:
+        conn = sqlite3.connect(sql_file)
+        cursor = conn.cursor()
+
+        tables: dict[str, dict[str, object]] = {}
+        n_rows = 0
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        existing_tables = {row[0] for row in cursor.fetchall()}
+        for table_name, (columns, _) in cached_tables.items():
+            if table_name not in existing_tables:
+                continue
+            cursor.execute(f'SELECT {", ".join(columns)} FROM {table_name}')
+            rows = cursor.fetchall()
+            tables[table_name] = {"columns": list(columns), "rows": rows}
+            n_rows += len(rows)
+        conn.close()
+
+        snapshot = {"version": snapshot_version, "created": time.time(), "tables": tables}
+        with gzip.open(snapshot_path, 'wt', encoding='utf-8') as file:
+            json.dump(snapshot, file)
+    except Exception as e:
+        add_log(f"Error exporting cached data snapshot to '{snapshot_path}': {e}", "error")
+        return -1
+
+    add_log(f"Exported {n_rows} cached rows from {len(tables)} tables to '{snapshot_path}'", "info")
+    return n_rows
+
+def import_cached_snapshot(snapshot_path: str) -> int:
+    """
+    Import a compressed snapshot file into the cached data database in a single transaction.
+    Only the known tables and columns are accepted, they are created from their own definitions (no SQL of the file is run).
+    Rows already cached with the same key are replaced by the ones of the snapshot.
+        :param snapshot_path: The path of the snapshot file to import.
+        :return: The number of rows imported, or -1 if an error occurred (nothing is imported in that case).
+    """
+    try:
+        with gzip.open(snapshot_path, 'rt', encoding='utf-8') as file:
+            snapshot = json.load(file)
+    except Exception as e:
+        add_log(f"Error reading cached data snapshot '{snapshot_path}': {e}", "error")
+        return -1
+
+    if not isinstance(snapshot, dict) or snapshot.get("version") != snapshot_version:
+        add_log(f"Unsupported snapshot version in '{snapshot_path}', expected {snapshot_version}", "error")
+        return -1
+
+    tables = snapshot.get("tables")
+    if not isinstance(tables, dict):
+        add_log(f"No tables found in snapshot '{snapshot_path}'", "error")
+        return -1
+    for table_name, table in tables.items(): # Validated before writing anything, only known tables and columns are imported
+        if table_name not in cached_tables or not isinstance(table, dict) or not isinstance(table.get("rows"), list):
+            add_log(f"Unknown table '{table_name}' in snapshot '{snapshot_path}'", "error")
+            return -1
+        columns = table.get("columns")
+        if not isinstance(columns, list) or sorted(columns) != sorted(cached_tables[table_name][0]):
+            add_log(f"Unexpected columns {columns} of table '{table_name}' in snapshot '{snapshot_path}'", "error")
+            return -1
+
+    n_rows = 0
+    conn = sqlite3.connect(sql_file, isolation_level=None) # Transaction handled explicitly, so the table creation is rolled back too
+    try:
+        conn.execute("BEGIN")
+        try:
+            for table_name, table in tables.items():
+                conn.execute(cached_tables[table_name][1])
+                column_names = ", ".join(table["columns"]) # Checked against the known columns
+                placeholders = ", ".join("?" for _ in table["columns"])
+                conn.executemany(f"INSERT OR REPLACE INTO {table_name} ({column_names}) VALUES ({placeholders})", table["rows"])
+                n_rows += len(table["rows"])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK") # Nothing is imported if any row fails
+            raise
+    except Exception as e:
+        add_log(f"Error importing cached data snapshot '{snapshot_path}': {e}", "error")
+        return -1
+    finally:
+        conn.close()
+
+    add_log(f"Imported {n_rows} cached rows from '{snapshot_path}'", "info")
+    return n_rows
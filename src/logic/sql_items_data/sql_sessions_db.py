@@ -0,0 +1,248 @@
+import sqlite3, threading
+from typing import Any, Optional
+
+from config.config import sessions_sql_file, sessions_excel_import_version
+from logic.data_classes.stored_session import StoredSession
+from logic.logs import add_log
+
+class SessionsDatabase:
+    """
+    A singleton class that stores the saved hunting sessions in a SQLite database, the primary store of the sessions.
+    Every session is a typed row (spot, time, hours, totals and user action) with a row per item amount, indexed by spot and time,
+    so saving a session is a single small transaction and the history is queried without opening the Excel files.
+    The connection is opened once and shared, the Excel exports update it from their background thread.
+    """
+    instance = None
+
+    def __init__(self, db_path: str = sessions_sql_file):
+        """
+        Initialize the SessionsDatabase, the database is opened on first use.
+            :param db_path: The path to the SQLite database file of the sessions.
+        """
+        if SessionsDatabase.instance is not None:
+            raise Exception("SessionsDatabase is a singleton!")
+        SessionsDatabase.instance = self
+
+        self.db_path = db_path
+        self.conn: Optional[sqlite3.Connection] = None
+        self.lock = threading.RLock()
+
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        Get the connection to the database, opening it and creating its tables the first time.
+            :return: The connection to the sessions database.
+        """
+        if self.conn is not None:
+            return self.conn
+
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL") # Commits append to the log, readers do not block the writer
+        conn.execute("PRAGMA synchronous = NORMAL") # No disk sync on every commit, a crash may only lose the last sessions
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.executescript("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            spot TEXT NOT NULL,
+            saved_at REAL NOT NULL,
+            hours INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            total_h INTEGER NOT NULL,
+            taxed INTEGER NOT NULL,
+            taxed_h INTEGER NOT NULL,
+            action_user TEXT NOT NULL,
+            excel_path TEXT
+        );
+        CREATE TABLE IF NOT EXISTS session_items (
+            session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            amount INTEGER NOT NULL,
+            PRIMARY KEY (session_id, position)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS sessions_spot_saved_at ON sessions (spot, saved_at);
+        CREATE INDEX IF NOT EXISTS sessions_saved_at ON sessions (saved_at);
+        CREATE INDEX IF NOT EXISTS sessions_excel_path ON sessions (excel_path);
+        """)
+        self.conn = conn
+        return conn
+
+    def insert_session(self, spot: str, saved_at: float, hours: int, results: tuple[int, int, int, int], action_user: str, items: list[tuple[str, int]]) -> Optional[int]:
+        """
+        Store a hunting session.
+            :param spot: The name of the hunting spot.
+            :param saved_at: Unix time when the session was saved.
+            :param hours: The hours of the session.
+            :param results: The total, total per hour, taxed and taxed per hour results of the session.
+            :param action_user: The user action of the session.
+            :param items: A list of the item names and their amounts, in the order of the session inputs.
+            :return: The ID of the stored session, or None if an error occurs.
+        """
+        with self.lock:
+            try:
+                conn = self.get_connection()
+                with conn: # Single transaction, committed on exit
+                    cursor = conn.execute("""
+                    INSERT INTO sessions (spot, saved_at, hours, total, total_h, taxed, taxed_h, action_user)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (spot, saved_at, hours, *results, action_user))
+                    session_id = cursor.lastrowid
+                    conn.executemany(
+                        "INSERT INTO session_items (session_id, position, name, amount) VALUES (?, ?, ?, ?)",
+                        [(session_id, position, name, amount) for position, (name, amount) in enumerate(items)]
+                    )
+                return session_id
+            except sqlite3.Error as e:
+                add_log(f"Error storing the session of spot '{spot}': {e}", "error")
+                return None
+
+    def needs_excel_import(self) -> bool:
+        """
+        Check whether the sessions of the Excel files saved before the database existed are not imported yet.
+            :return: True if they must be imported, False if they were already imported or an error occurs.
+        """
+        with self.lock:
+            try:
+                return self.get_connection().execute("PRAGMA user_version").fetchone()[0] < sessions_excel_import_version
+            except sqlite3.Error as e:
+                add_log(f"Error reading the version of the sessions database: {e}", "error")
+                return False
+
+    def get_excel_paths(self) -> set[str]:
+        """
+        Get the paths of the Excel files of the stored sessions.
+            :return: A set of the paths of the Excel files, empty if an error occurs.
+        """
+        with self.lock:
+            try:
+                return {path for path, in self.get_connection().execute("SELECT excel_path FROM sessions WHERE excel_path IS NOT NULL")}
+            except sqlite3.Error as e:
+                add_log(f"Error reading the Excel files of the stored sessions: {e}", "error")
+                return set()
+
+    def import_sessions(self, sessions: list[StoredSession]) -> int:
+        """
+        Store the sessions read from their Excel files and mark the import as done, in a single transaction.
+            :param sessions: The sessions to store, their IDs are ignored.
+            :return: The number of sessions stored, -1 if an error occurs (nothing is stored and the import is not marked as done).
+        """
+        with self.lock:
+            try:
+                conn = self.get_connection()
+                with conn:
+                    for session in sessions:
+                        cursor = conn.execute("""
+                        INSERT INTO sessions (spot, saved_at, hours, total, total_h, taxed, taxed_h, action_user, excel_path)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """, (session.spot, session.saved_at, session.hours, session.total, session.total_h, session.taxed, session.taxed_h, session.action_user, session.excel_path))
+                        conn.executemany(
+                            "INSERT INTO session_items (session_id, position, name, amount) VALUES (?, ?, ?, ?)",
+                            [(cursor.lastrowid, position, name, amount) for position, (name, amount) in enumerate(session.items.items())]
+                        )
+                    conn.execute(f"PRAGMA user_version = {int(sessions_excel_import_version)}")
+                return len(sessions)
+            except sqlite3.Error as e:
+                add_log(f"Error importing the sessions of the Excel files: {e}", "error")
+                return -1
+
+    def set_excel_path(self, session_id: int, excel_path: str):
+        """
+        Record the Excel export of a session.
+            :param session_id: The ID of the session.
+            :param excel_path: The path of the Excel file of the session.
+        """
+        with self.lock:
+            try:
+                conn = self.get_connection()
+                with conn:
+                    conn.execute("UPDATE sessions SET excel_path = ? WHERE id = ?", (excel_path, session_id))
+            except sqlite3.Error as e:
+                add_log(f"Error recording the Excel file of session {session_id}: {e}", "error")
+
+    def get_sessions(self, spot: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None, with_items: bool = False) -> list[StoredSession]:
+        """
+        Get the stored sessions, the newest first.
+            :param spot: The name of the hunting spot, all the spots if None.
+            :param since: Unix time of the oldest session, no limit if None.
+            :param until: Unix time of the newest session, no limit if None.
+            :param with_items: Whether to also read the item amounts of the sessions.
+            :return: A list of the sessions found, empty if an error occurs.
+        """
+        conditions: list[str] = []
+        params: list[Any] = []
+        for condition, value in (("spot = ?", spot), ("saved_at >= ?", since), ("saved_at <= ?", until)):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self.lock:
+            try:
+                conn = self.get_connection()
+                rows = conn.execute(f"""
+                SELECT id, spot, saved_at, hours, total, total_h, taxed, taxed_h, action_user, excel_path
+                FROM sessions {where} ORDER BY saved_at DESC
+                """, params).fetchall()
+                sessions = [StoredSession(*row) for row in rows]
+                if with_items:
+                    by_id = {session.session_id: session for session in sessions}
+                    for session_id, name, amount in conn.execute(f"""
+                    SELECT session_id, name, amount FROM session_items
+                    WHERE session_id IN (SELECT id FROM sessions {where}) ORDER BY session_id, position
+                    """, params):
+                        by_id[session_id].items[name] = amount
+                return sessions
+            except sqlite3.Error as e:
+                add_log(f"Error reading the stored sessions: {e}", "error")
+                return []
+
+    def get_spot_totals(self) -> dict[str, tuple[int, int, int]]:
+        """
+        Get the totals of the stored sessions of every hunting spot.
+            :return: A dictionary of the spot names and their number of sessions, total hours and total taxed money, empty if an error occurs.
+        """
+        with self.lock:
+            try:
+                rows = self.get_connection().execute("SELECT spot, COUNT(*), SUM(hours), SUM(taxed_h * hours) FROM sessions GROUP BY spot").fetchall()
+                return {spot: (sessions, hours, money) for spot, sessions, hours, money in rows}
+            except sqlite3.Error as e:
+                add_log(f"Error reading the totals of the stored sessions: {e}", "error")
+                return {}
+
+    def delete_session_by_excel(self, excel_path: str) -> int:
+        """
+        Delete the stored session exported to an Excel file.
+            :param excel_path: The path of the Excel file of the session.
+            :return: The number of sessions deleted, -1 if an error occurs.
+        """
+        with self.lock:
+            try:
+                conn = self.get_connection()
+                with conn:
+                    return conn.execute("DELETE FROM sessions WHERE excel_path = ?", (excel_path,)).rowcount
+            except sqlite3.Error as e:
+                add_log(f"Error deleting the session of '{excel_path}': {e}", "error")
+                return -1
+
+    def delete_all_sessions(self) -> int:
+        """
+        Delete every stored session.
+            :return: The number of sessions deleted, -1 if an error occurs.
+        """
+        with self.lock:
+            try:
+                conn = self.get_connection()
+                with conn:
+                    return conn.execute("DELETE FROM sessions").rowcount
+            except sqlite3.Error as e:
+                add_log(f"Error deleting the stored sessions: {e}", "error")
+                return -1
+
+    @staticmethod
+    def get_instance() -> "SessionsDatabase":
+        """
+        Get the singleton instance of SessionsDatabase, created on first use.
+            :return: The singleton instance of SessionsDatabase.
+        """
+        if SessionsDatabase.instance is None:
+            return SessionsDatabase() # Opened by the first save or query of the sessions
+        return SessionsDatabase.instance
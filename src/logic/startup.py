@@ -1,5 +1,6 @@
 from logic.logs import LoggerManager, add_log
 from logic.manage_resources.prepare_resources import startup_resources
+from logic.startup_profiler import profile_phase
 
 def setup_all() -> bool:
     """
@@ -9,10 +10,13 @@ def setup_all() -> bool:
     It initializes logging, prepares resources, and loads the application.
         :return: True if setup is successful, False otherwise.
     """
-    LoggerManager()
+    with profile_phase("LoggerManager init"):
+        LoggerManager()
     add_log("Starting APP - Setting up all components\n", "info")
     add_log("Preparing resources...", "info")
-    if not startup_resources():
+    with profile_phase("startup_resources"):
+        resources_ready = startup_resources()
+    if not resources_ready:
         add_log("Failed to prepare resources. Exiting application.", "error")
         return False
     add_log("Loading app...\n", "info")
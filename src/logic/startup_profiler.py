@@ -0,0 +1,112 @@
+import cProfile, os, time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional
+
+from config.config import startup_profile_env, startup_profile_report, startup_profile_dump
+
+class StartupProfiler:
+    """
+    A singleton class that times the phases of the application startup.
+    It is only created when the startup profiling is enabled (--profile-startup flag or environment variable),
+    otherwise the phases are not timed at all.
+    """
+    instance = None
+
+    def __init__(self, use_cprofile: bool = False):
+        """
+        Initialize the StartupProfiler and start timing the startup.
+            :param use_cprofile: True to also run cProfile during the startup and dump its statistics.
+        """
+        if StartupProfiler.instance is not None:
+            raise Exception("StartupProfiler is a singleton!")
+        StartupProfiler.instance = self
+
+        self.start = time.perf_counter()
+        self.depth = 0
+        self.phases: list[tuple[int, str, float, float]] = [] # (depth, name, start offset, duration) in seconds
+        self.profile: Optional[cProfile.Profile] = cProfile.Profile() if use_cprofile else None
+        if self.profile:
+            self.profile.enable()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a phase of the startup, phases can be nested.
+            :param name: The name of the phase.
+        """
+        index = len(self.phases)
+        self.phases.append((self.depth, name, 0.0, 0.0))
+        self.depth += 1
+        phase_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - phase_start
+            self.depth -= 1
+            self.phases[index] = (self.depth, name, phase_start - self.start, duration)
+
+    def build_report(self) -> str:
+        """
+        Build the text report of the timed phases.
+            :return: The report with the start offset and duration (ms) of every phase.
+        """
+        total = time.perf_counter() - self.start
+        lines = [
+            f"Startup profile - {datetime.now().strftime('%d-%m-%Y %H:%M:%S')}",
+            f"{'start (ms)':>12}{'duration (ms)':>16}  phase"
+        ]
+        for depth, name, offset, duration in self.phases:
+            lines.append(f"{offset * 1000:>12.1f}{duration * 1000:>16.1f}  {'    ' * depth}{name}")
+        lines.append(f"{'':>12}{total * 1000:>16.1f}  Total until the report")
+        return "\n".join(lines) + "\n"
+
+    def finish(self):
+        """
+        Stop profiling and write the report (and the cProfile statistics if enabled) to the logs folder.
+        """
+        if self.profile:
+            self.profile.disable()
+            self.profile.dump_stats(startup_profile_dump)
+
+        os.makedirs(os.path.dirname(startup_profile_report), exist_ok=True)
+        with open(startup_profile_report, 'w', encoding='utf-8') as file:
+            file.write(self.build_report())
+            if self.profile:
+                file.write(f"\ncProfile statistics saved in '{startup_profile_dump}' (open it with pstats or snakeviz).\n")
+
+def start_startup_profiler(argv: list[str]) -> Optional[StartupProfiler]:
+    """
+    Create the startup profiler if it is enabled with the --profile-startup flag (--profile-startup=cprofile to use cProfile)
+    or the environment variable (1 or cprofile).
+        :param argv: The command line arguments, the profiling flag is removed from them.
+        :return: The startup profiler, or None if the profiling is not enabled.
+    """
+    mode = os.environ.get(startup_profile_env, '').strip().lower()
+    for arg in list(argv):
+        if arg == '--profile-startup' or arg.startswith('--profile-startup='):
+            mode = arg.partition('=')[2].lower() or '1'
+            argv.remove(arg)
+
+    if mode in ('', '0', 'false'):
+        return None
+    return StartupProfiler(use_cprofile=(mode == 'cprofile'))
+
+@contextmanager
+def profile_phase(name: str) -> Iterator[None]:
+    """
+    Time a phase of the startup if the profiler is enabled, otherwise it does nothing.
+        :param name: The name of the phase.
+    """
+    if StartupProfiler.instance is None:
+        yield
+        return
+    with StartupProfiler.instance.phase(name):
+        yield
+
+def finish_startup_profiler():
+    """
+    Write the startup profile report if the profiler is enabled.
+    """
+    if StartupProfiler.instance is not None:
+        StartupProfiler.instance.finish()
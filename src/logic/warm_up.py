@@ -0,0 +1,27 @@
+import importlib, threading, time
+
+from logic.logs import add_log
+from config.config import lazy_modules
+
+def warm_up_modules(module_names: list[str]):
+    """
+    Import the modules that are loaded lazily, so they are ready when their feature is first used.
+        :param module_names: The names of the modules to import.
+    """
+    for module_name in module_names:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module_name)
+        except ImportError as e:
+            add_log(f"Warm up of module '{module_name}' failed: {e}", "warning")
+            continue
+        add_log(f"Module '{module_name}' warmed up in {(time.perf_counter() - start) * 1000:.0f} ms", "debug")
+
+def start_warm_up() -> threading.Thread:
+    """
+    Start a background thread that imports the lazily loaded modules once the main window is shown.
+        :return: The started daemon thread.
+    """
+    thread = threading.Thread(target=warm_up_modules, args=(lazy_modules,), name="WarmUpModules", daemon=True)
+    thread.start()
+    return thread
@@ -1,19 +1,34 @@
-from PySide6.QtWidgets import QApplication
-
-from gui.gui_entry_point import GuiEntryPoint
-from logic.startup import setup_all
-
 import sys
 
+from logic.startup_profiler import start_startup_profiler, profile_phase, finish_startup_profiler
+
 def main():
     """
     Main function to start the application.
     """
-    if not setup_all():
-        sys.exit(1)  # Exit if setup fails
-    app = QApplication(sys.argv)
-    window = GuiEntryPoint()
-    window.show()
+    start_startup_profiler(sys.argv) # Started before the imports so they are also timed
+
+    with profile_phase("Imports"):
+        from PySide6.QtWidgets import QApplication
+        from PySide6.QtCore import QTimer
+
+        from gui.gui_entry_point import GuiEntryPoint
+        from logic.startup import setup_all
+        from logic.warm_up import start_warm_up
+        from logic.manage_excels import start_excel_sessions_import
+
+    with profile_phase("setup_all"):
+        if not setup_all():
+            sys.exit(1)  # Exit if setup fails
+    with profile_phase("QApplication creation"):
+        app = QApplication(sys.argv)
+    with profile_phase("GuiEntryPoint creation"):
+        window = GuiEntryPoint()
+    with profile_phase("Main window show"):
+        window.show()
+    QTimer.singleShot(0, finish_startup_profiler) # The report is written once the event loop starts (window painted)
+    QTimer.singleShot(0, start_warm_up) # Import the heavy modules in background once the window is painted
+    QTimer.singleShot(0, start_excel_sessions_import) # Import once the sessions of the Excel files saved before the sessions database, in background
     app.exec()
 
 if __name__ == "__main__":
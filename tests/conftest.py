@@ -0,0 +1,20 @@
+import os, sys
+
+import pytest
+
+root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_path, 'src')) # The modules of the app are imported from 'src', as when it is run
+
+from logic.logs import LoggerManager
+
+@pytest.fixture(scope="session", autouse=True)
+def logger(tmp_path_factory: pytest.TempPathFactory):
+    """
+    Create the logger of the app, writing its logs to a temporary folder instead of the repository.
+    """
+    previous_path = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("app"))
+    try:
+        yield LoggerManager.instance or LoggerManager()
+    finally:
+        os.chdir(previous_path)
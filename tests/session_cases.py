@@ -0,0 +1,44 @@
+import json, os, random
+
+from config.config import reduced_item_names
+from logic.data_classes.session_results import SessionResultsData
+
+data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'res', 'data.json')
+
+def make_session_cases(n_cases: int, seed: int = 1234) -> list[SessionResultsData]:
+    """
+    Generate random sessions of the spots of the data file, with prices and amounts from 0 to large values.
+        :param n_cases: The number of sessions to generate.
+        :param seed: The seed of the random generator.
+        :return: A list of the sessions.
+    """
+    with open(data_path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+
+    generator = random.Random(seed)
+    sessions: list[SessionResultsData] = []
+    for _ in range(n_cases):
+        spot = generator.choice(list(data['spots']))
+        big = generator.random() < 0.3
+        data_input: dict[str, tuple[str, str]] = {}
+        for name in {**data['spots'][spot]['loot'], **data['common_items']}.values():
+            price = generator.choice([0, generator.randint(1, 5_000_000), generator.randint(1_000_000, 900_000_000)])
+            amount = generator.randint(0, 50_000 if big else 300)
+            data_input[reduced_item_names.get(name, name)] = (f"{price:,}", str(amount) if generator.random() > 0.05 else "")
+        for name in data['spots'][spot]['no_market_items']:
+            data_input[name] = ("0", str(generator.randint(0, 200_000 if big else 3_000)))
+        data_input['Hours'] = ("", str(generator.choice([0, 1, 3, 10])))
+
+        sessions.append(SessionResultsData(
+            name_spot=spot,
+            value_pack=generator.random() < 0.5,
+            market_tax=0.35,
+            extra_profit=generator.random() < 0.5,
+            data_input=data_input,
+            elixirs_cost=f"{generator.randint(0, 5_000_000):,}",
+            auto_calculate_best_profit=generator.random() < 0.6,
+            lightstone_costs={item_id: (name, generator.randint(1_000_000, 300_000_000)) for item_id, name in data['lighstone_items'].items()},
+            imperfect_lightstone_costs={item_id: (name, generator.randint(100_000, 5_000_000)) for item_id, name in data['imperfect_lighstone_items'].items()},
+            black_stone_cost={item_id: (name, generator.randint(50_000, 500_000)) for item_id, name in data['black_stone_cost'].items()}
+        ))
+    return sessions
@@ -0,0 +1,82 @@
+import copy
+from dataclasses import replace
+from typing import Any
+
+import numpy as np
+import pytest
+
+from logic.data_classes.session_results import SessionResultsData
+from logic.session_results.batch_results import BatchCalculator, build_session_batch, calculate_batch_results, int64_limit
+from logic.session_results.calculate_results_session import CalculateResultsSession
+from session_cases import make_session_cases
+
+def scalar_results(session: SessionResultsData) -> dict[str, Any] | int | None:
+    """
+    Calculate the results of a session with the scalar engine, without the fields the batch engine does not return.
+        :param session: The session to calculate, it is not modified.
+        :return: The results of the session, -1 if its input is not valid, or None if an item is missing.
+    """
+    try:
+        results = CalculateResultsSession(copy.deepcopy(session)).calculate_results_session()
+    except KeyError:
+        return None
+    if isinstance(results, int):
+        return results
+    return {key: value for key, value in results.items() if key not in ('new_labels_input_text', 'strategies')}
+
+def test_batch_matches_scalar_engine():
+    sessions = make_session_cases(600)
+    batch_results = calculate_batch_results(sessions)
+
+    compared = 0
+    for session, batch_result in zip(sessions, batch_results):
+        expected = scalar_results(session)
+        if expected is None: # The scalar engine raises, the batch engine returns -1
+            assert batch_result == -1
+            continue
+        assert batch_result == expected, session.name_spot
+        compared += 1
+    assert compared > 500
+
+@pytest.mark.parametrize("optimize", [True, False])
+@pytest.mark.parametrize("auto_calculate_best_profit", [True, False])
+def test_batch_routes_overflowing_sessions_to_scalar_engine(optimize: bool, auto_calculate_best_profit: bool):
+    sessions = [session for session in make_session_cases(40, seed=7) if scalar_results(session) is not None][:4]
+    huge = replace(
+        sessions[0],
+        auto_calculate_best_profit=auto_calculate_best_profit,
+        data_input={name: (("", amount) if name == 'Hours' else ("999,999,999,999", "9" * 12)) for name, (_, amount) in sessions[0].data_input.items()}
+    )
+    huge.data_input['Hours'] = ("", "3")
+    inputs = [huge, *(replace(session, auto_calculate_best_profit=auto_calculate_best_profit) for session in sessions[1:])]
+    data_inputs = [dict(session.data_input) for session in inputs]
+
+    batch = build_session_batch([huge])
+    assert batch.overflow[0] and not batch.valid[0]
+    assert 999_999_999_999 * 10 ** 12 > int64_limit
+
+    results = calculate_batch_results(inputs, optimize=optimize)
+    expected = scalar_results(huge)
+    assert isinstance(expected, dict) and expected['total'] > 2 ** 63 # Would wrap in int64
+    assert results[0] == expected
+    assert [session.data_input for session in inputs] == data_inputs # The scalar engine works on a copy
+    if optimize:
+        for session, result in zip(inputs[1:], results[1:]):
+            assert result == scalar_results(session)
+
+def test_with_prices_marks_overflowing_price_vectors():
+    session = next(session for session in make_session_cases(40, seed=7) if isinstance(scalar_results(session), dict) and not session.auto_calculate_best_profit)
+    batch = build_session_batch([session])
+    assert batch.valid[0] and not batch.overflow[0]
+
+    prices = batch.prices[0]
+    repriced = batch.with_prices(np.array([prices, prices * 10 ** 7, prices * 1e30 + 1e30]))
+    assert list(repriced.valid) == [True, False, False]
+    assert list(repriced.overflow) == [False, True, True]
+    assert not repriced.prices[1:].any() # The prices of the overflowing rows are not stored
+
+    results = BatchCalculator(repriced, optimize=False).calculate()
+    expected = calculate_batch_results([session], optimize=False)[0]
+    assert isinstance(expected, dict)
+    assert (int(results.total_h[0]), int(results.taxed_h[0])) == (expected['total_h'], expected['taxed_h'])
+    assert not results.valid[1:].any()
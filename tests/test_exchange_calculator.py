@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from logic.exchange_calculator import exchange_results
+from logic.session_results.batch_results import exchange_results_array
+
+grid_values = np.arange(-400, 3000, dtype=np.int64)
+
+def exchange_loop(green: np.ndarray, blue: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The exchange loop replaced by the closed form, run on arrays: exchange 30 blue resources to 60 green ones while (green + 60) / (blue - 30) is in [0, 1.2).
+    The ratio is a float division as in the loop, a blue amount of 30 stops it (division by zero) and the exchanges done are not counted.
+        :param green: The initial amounts of green resources.
+        :param blue: The initial amounts of blue resources.
+        :return: The number of blue resources exchanged and the final amounts of green and blue resources.
+    """
+    green, blue = green.copy(), blue.copy()
+    n_exchanges = np.zeros(green.shape, dtype=np.int64)
+    zero_division = np.zeros(green.shape, dtype=bool)
+    active = np.arange(green.size) # Positions still exchanging
+    while active.size:
+        denominator = blue[active] - 30
+        zero_division[active[denominator == 0]] = True
+        ratio = (green[active] + 60) / np.where(denominator == 0, 1, denominator)
+        active = active[(denominator != 0) & (ratio < 1.2) & (ratio >= 0)]
+        green[active] += 60
+        blue[active] -= 30
+        n_exchanges[active] += 1
+    return (np.where(zero_division, 0, n_exchanges * 30), green, blue)
+
+@pytest.fixture(scope="module")
+def grid() -> tuple[np.ndarray, np.ndarray, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Every green and blue amount in [-400, 3000) and the results of the exchange loop.
+    """
+    green, blue = (values.ravel() for values in np.meshgrid(grid_values, grid_values, indexing='ij'))
+    return (green, blue, exchange_loop(green, blue))
+
+def test_closed_form_matches_loop(grid: tuple[np.ndarray, np.ndarray, tuple[np.ndarray, np.ndarray, np.ndarray]]):
+    green, blue, (expected_exchanged, expected_green, expected_blue) = grid
+
+    expected = zip(expected_exchanged.tolist(), expected_green.tolist(), expected_blue.tolist())
+    mismatches = [(g, b) for g, b, result in zip(green.tolist(), blue.tolist(), expected) if exchange_results(g, b) != result]
+    assert not mismatches, mismatches[:10]
+
+def test_array_closed_form_matches_loop(grid: tuple[np.ndarray, np.ndarray, tuple[np.ndarray, np.ndarray, np.ndarray]]):
+    green, blue, (_, expected_green, expected_blue) = grid
+
+    result_green, result_blue = exchange_results_array(green, blue)
+    np.testing.assert_array_equal(result_green, expected_green)
+    np.testing.assert_array_equal(result_blue, expected_blue)
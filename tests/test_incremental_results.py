@@ -0,0 +1,22 @@
+import copy, random
+
+from logic.session_results.calculate_results_session import CalculateResultsSession
+from logic.session_results.incremental_results import SessionGroupCache
+from session_cases import make_session_cases
+
+def test_incremental_matches_full_engine_on_edits():
+    generator = random.Random(3)
+    cache = SessionGroupCache() # Shared by every calculation, as the calculations of a new session
+    compared = 0
+    for session in make_session_cases(150, seed=42):
+        if session.name_spot == 'Verdure Doe': # The spot has no green head, the heads calculations raise KeyError
+            continue
+        for _ in range(4): # Edit the amount of an item, as the user typing in an input
+            name = generator.choice([name for name in session.data_input if name != 'Hours'])
+            session.data_input[name] = (session.data_input[name][0], str(generator.randint(0, 3_000)))
+
+            full, incremental = copy.deepcopy(session), copy.deepcopy(session)
+            assert CalculateResultsSession(incremental, cache).calculate_results_session() == CalculateResultsSession(full).calculate_results_session()
+            assert incremental.data_input == full.data_input # Same amounts written back by the exchanges
+            compared += 1
+    assert compared > 400